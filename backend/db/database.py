@@ -1,9 +1,13 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 import os
 from dotenv import load_dotenv
 from sqlalchemy.orm import Session
-from typing import Generator
+from typing import AsyncGenerator, Generator
+
+from db.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine
 
 load_dotenv()
 
@@ -11,11 +15,36 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL is not set in environment")
 
-engine = create_engine(
-    DATABASE_URL,
+# Worker threads for sync routes and dependencies (Starlette's threadpool, set in main.py).
+# Each one holds at most one connection, so pool_size + max_overflow defaults to this.
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "40"))
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", str(max(THREADPOOL_SIZE - DB_POOL_SIZE, 0))))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Recycle below MySQL's wait_timeout so idle connections are never used after the server drops them
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# The async routers run on the event loop, not the threadpool, so their pool is sized on its own
+ASYNC_DB_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", "10"))
+ASYNC_DB_MAX_OVERFLOW = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "10"))
+
+# Most connections one process opens to each database (the primary and every replica);
+# multiply by the number of worker processes to size the server's max_connections
+MAX_CONNECTIONS_PER_DATABASE = DB_POOL_SIZE + DB_MAX_OVERFLOW + ASYNC_DB_POOL_SIZE + ASYNC_DB_MAX_OVERFLOW
+
+_POOL_OPTIONS = dict(
     pool_pre_ping=True,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
     echo=(os.getenv("SQLALCHEMY_ECHO", "false").lower() == "true"),
 )
+_ASYNC_POOL_OPTIONS = dict(_POOL_OPTIONS, pool_size=ASYNC_DB_POOL_SIZE, max_overflow=ASYNC_DB_MAX_OVERFLOW)
+
+engine = create_engine(DATABASE_URL, poolclass=InstrumentedQueuePool, **_POOL_OPTIONS)
+instrument_engine(engine, "sync")
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
@@ -24,4 +53,34 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# -------------------------------------------------
+# Async engine (used by the async routers)
+# -------------------------------------------------
+# Sync driver -> asyncio driver for the same database
+_ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql+mysqldb": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def _async_database_url(url: str):
+    parsed = make_url(url)
+    return parsed.set(drivername=_ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername))
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_database_url(DATABASE_URL)
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, poolclass=InstrumentedAsyncQueuePool, **_ASYNC_POOL_OPTIONS)
+instrument_engine(async_engine, "async")
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
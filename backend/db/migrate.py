@@ -0,0 +1,95 @@
+# db/migrate.py
+"""
+Minimal schema migrations. Each db/migrations/NNNN_name.py defines
+`upgrade(conn)`; applied versions are recorded in `schema_migrations`.
+Run them with `python -m scripts.migrate` -- the API itself never runs DDL.
+"""
+import importlib
+import logging
+import pkgutil
+
+from sqlalchemy import Column, DateTime, MetaData, String, Table, func, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn
+
+import db.migrations
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", String(64), primary_key=True),
+    Column("applied_at", DateTime, server_default=func.now()),
+)
+
+
+def discover() -> list[str]:
+    """Migration module names in version order (the NNNN prefix)."""
+    names = [m.name for m in pkgutil.iter_modules(db.migrations.__path__) if m.name[:4].isdigit()]
+    return sorted(names)
+
+
+def applied_versions(conn: Connection) -> set[str]:
+    if not inspect(conn).has_table("schema_migrations"):
+        return set()
+    return {row.version for row in conn.execute(schema_migrations.select())}
+
+
+def pending(engine: Engine) -> list[str]:
+    with engine.connect() as conn:
+        done = applied_versions(conn)
+    return [name for name in discover() if name not in done]
+
+
+def migrate(engine: Engine) -> list[str]:
+    """Apply every pending migration in order; returns the versions applied."""
+    _metadata.create_all(engine)
+    applied = []
+    for name in pending(engine):
+        module = importlib.import_module(f"db.migrations.{name}")
+        logger.info("Applying migration %s", name)
+        # MySQL commits DDL implicitly, so each migration must be safe to re-run if it fails half way
+        with engine.begin() as conn:
+            module.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(version=name))
+        applied.append(name)
+    return applied
+
+
+# -------------------------------------------------
+# Operations for migrations (all idempotent)
+# -------------------------------------------------
+def has_index(conn: Connection, table: str, name: str) -> bool:
+    return any(ix["name"] == name for ix in inspect(conn).get_indexes(table))
+
+
+def add_index(conn: Connection, table: str, name: str, columns: list[str]) -> None:
+    """
+    Create an index unless it exists. On MySQL it is built online
+    (ALGORITHM=INPLACE, LOCK=NONE), so reads and writes continue meanwhile.
+    """
+    if has_index(conn, table, name):
+        return
+    cols = ", ".join(columns)
+    if conn.dialect.name == "mysql":
+        conn.execute(text(f"ALTER TABLE {table} ADD INDEX {name} ({cols}), ALGORITHM=INPLACE, LOCK=NONE"))
+    else:
+        conn.execute(text(f"CREATE INDEX {name} ON {table} ({cols})"))
+
+
+def load_models() -> None:
+    """Import every models/model_*.py so Base.metadata knows all tables."""
+    import models
+    for module in pkgutil.iter_modules(models.__path__):
+        importlib.import_module(f"models.{module.name}")
+
+
+def add_missing_columns(conn: Connection, table) -> None:
+    """Add columns declared on a model's Table that the database table lacks."""
+    existing = {c["name"] for c in inspect(conn).get_columns(table.name)}
+    for column in table.columns:
+        if column.name not in existing:
+            ddl = CreateColumn(column).compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
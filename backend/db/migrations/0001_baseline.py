@@ -0,0 +1,250 @@
+# The schema as of the first migration, frozen here so later model changes never
+# alter what this step does. Creates the tables a database lacks, and adds columns
+# that earlier db/schema.sql ALTERs introduced to tables that exist without them.
+# Later changes (new tables, columns, indexes) go in their own migrations.
+from sqlalchemy import (
+    JSON, Boolean, Column, DateTime, Enum, Float, ForeignKey, Index, Integer, MetaData, String, Table, Text,
+    UniqueConstraint, func, inspect,
+)
+
+from db.migrate import add_missing_columns
+
+metadata = MetaData()
+
+
+def _created_at():
+    return Column("created_at", DateTime(timezone=True), server_default=func.now())
+
+
+def _fk(target: str, ondelete: str = "CASCADE"):
+    return ForeignKey(target, ondelete=ondelete)
+
+
+NOTIFICATION_TYPES = ("like", "like_post", "like_repost", "comment", "follow", "share")
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("firebase_uid", String(128), nullable=False, unique=True),
+    Column("email", String(255), nullable=False),
+    Column("display_name", String(255)),
+    Column("bio", String),
+    Column("avatar_url", String),
+    Column("role", Enum("creator", "admin", "premium", "regular", name="roleenum"), nullable=False),
+    Column("status", Enum("active", "suspended", "deleted", "banned", name="statusenum"), nullable=False),
+    Column("fanout_on_read", Boolean, nullable=False, server_default="0"),
+    _created_at(),
+    Index("ix_users_id", "id"),
+    Index("ix_users_email", "email", unique=True),
+)
+
+Table(
+    "media_assets", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("sha256", String(64), nullable=False, unique=True),
+    Column("size_bytes", Integer, nullable=False),
+    Column("storage_prefix", String(255), nullable=False),
+    Column("variants", JSON, nullable=False),
+    Column("ref_count", Integer, nullable=False, server_default="0"),
+    _created_at(),
+    Column("released_at", DateTime(timezone=True)),
+)
+
+Table(
+    "follows", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("follower_id", Integer, _fk("users.id"), nullable=False),
+    Column("following_id", Integer, _fk("users.id"), nullable=False),
+    _created_at(),
+    UniqueConstraint("follower_id", "following_id", name="unique_follow"),
+    Index("ix_follows_id", "id"),
+    Index("idx_follows_follower_created", "follower_id", "created_at", "id"),
+    Index("idx_follows_following_created", "following_id", "created_at", "id"),
+)
+
+Table(
+    "posts", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("user_id", Integer, _fk("users.id"), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("media_url", String(500)),
+    Column("media_variants", JSON),
+    Column("media_asset_id", Integer, _fk("media_assets.id", "SET NULL")),
+    Column("visibility", Enum("public", "private", "followers"), nullable=False),
+    _created_at(),
+    Column("likes_count", Integer, nullable=False, server_default="0"),
+    Column("comments_count", Integer, nullable=False, server_default="0"),
+    Column("reposts_count", Integer, nullable=False, server_default="0"),
+    Index("ix_posts_id", "id"),
+    Index("idx_posts_created", "created_at", "id"),
+    Index("idx_posts_user_created", "user_id", "created_at", "id"),
+    Index("idx_posts_visibility_created", "visibility", "created_at", "id"),
+    Index("idx_posts_media_asset", "media_asset_id"),
+)
+
+Table(
+    "user_recommendations", metadata,
+    Column("user_id", Integer, _fk("users.id"), primary_key=True),
+    Column("candidate_id", Integer, _fk("users.id"), primary_key=True),
+    Column("score", Float, nullable=False),
+    Column("reason", String(16), nullable=False),
+    Column("updated_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+    Index("idx_user_recommendations_score", "user_id", "score"),
+)
+
+Table(
+    "user_stats", metadata,
+    Column("user_id", Integer, _fk("users.id"), primary_key=True),
+    Column("posts_count", Integer, nullable=False, server_default="0"),
+    Column("followers_count", Integer, nullable=False, server_default="0"),
+    Column("following_count", Integer, nullable=False, server_default="0"),
+    Column("likes_received", Integer, nullable=False, server_default="0"),
+)
+
+Table(
+    "post_flags", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("post_id", Integer, _fk("posts.id"), nullable=False),
+    Column("reported_by", Integer, _fk("users.id"), nullable=False),
+    Column("reason", Text),
+    Column("reviewed", Boolean),
+    _created_at(),
+    Index("ix_post_flags_id", "id"),
+    Index("idx_post_flags_reviewed_created", "reviewed", "created_at"),
+)
+
+Table(
+    "reposts", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("user_id", Integer, _fk("users.id"), nullable=False),
+    Column("original_post_id", Integer, _fk("posts.id"), nullable=False),
+    Column("quote", Text),
+    Column("is_quote", Boolean),
+    _created_at(),
+    Column("likes_count", Integer, nullable=False, server_default="0"),
+    Column("comments_count", Integer, nullable=False, server_default="0"),
+    Index("ix_reposts_id", "id"),
+    Index("idx_reposts_user_quote_created", "user_id", "is_quote", "created_at", "id"),
+    Index("idx_reposts_created", "created_at"),
+    Index("idx_reposts_original", "original_post_id"),
+)
+
+Table(
+    "trending_snapshot", metadata,
+    Column("window", String(8), primary_key=True),
+    Column("rank", Integer, primary_key=True),
+    Column("post_id", Integer, _fk("posts.id"), nullable=False),
+    Column("score", Float, nullable=False),
+    Column("likes", Integer, nullable=False),
+    Column("comments", Integer, nullable=False),
+    Column("reposts", Integer, nullable=False),
+    Column("generated_at", DateTime(timezone=True), nullable=False),
+)
+
+Table(
+    "comments", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("user_id", Integer, _fk("users.id"), nullable=False),
+    Column("post_id", Integer, _fk("posts.id"), nullable=False),
+    Column("repost_id", Integer, _fk("reposts.id")),
+    Column("content", Text, nullable=False),
+    _created_at(),
+    Column("likes_count", Integer, nullable=False, server_default="0"),
+    Index("ix_comments_id", "id"),
+    Index("idx_comments_post_created", "post_id", "created_at", "id"),
+    Index("idx_comments_repost_created", "repost_id", "created_at", "id"),
+    Index("idx_comments_created", "created_at"),
+)
+
+Table(
+    "home_timeline", metadata,
+    Column("user_id", Integer, _fk("users.id"), primary_key=True),
+    Column("created_at", DateTime(timezone=True), primary_key=True),
+    Column("post_id", Integer, _fk("posts.id"), primary_key=True),
+    Column("author_id", Integer, _fk("users.id"), nullable=False),
+    Column("repost_id", Integer, _fk("reposts.id")),
+    Index("idx_home_timeline_post", "post_id"),
+    Index("idx_home_timeline_user_author", "user_id", "author_id"),
+)
+
+Table(
+    "likes", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("user_id", Integer, _fk("users.id"), nullable=False),
+    Column("post_id", Integer, _fk("posts.id")),
+    Column("repost_id", Integer, _fk("reposts.id")),
+    _created_at(),
+    UniqueConstraint("user_id", "post_id", name="unique_like"),
+    UniqueConstraint("user_id", "repost_id", name="unique_repost_like"),
+    Index("ix_likes_id", "id"),
+    Index("idx_likes_post", "post_id"),
+    Index("idx_likes_repost", "repost_id"),
+    Index("idx_likes_created", "created_at"),
+)
+
+Table(
+    "activity", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("recipient_id", Integer, _fk("users.id"), nullable=False),
+    Column("actor_id", Integer, _fk("users.id"), nullable=False),
+    Column("type", Enum("like_post", "like_repost", "follow", "comment", "repost"), nullable=False),
+    Column("post_id", Integer, _fk("posts.id")),
+    Column("repost_id", Integer, _fk("reposts.id")),
+    Column("comment_id", Integer, _fk("comments.id")),
+    _created_at(),
+    Index("ix_activity_id", "id"),
+    Index("idx_activity_recipient_created", "recipient_id", "created_at", "id"),
+    Index("idx_activity_actor_recipient", "actor_id", "recipient_id", "type"),
+)
+
+Table(
+    "comment_likes", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("user_id", Integer, _fk("users.id"), nullable=False),
+    Column("comment_id", Integer, _fk("comments.id"), nullable=False),
+    _created_at(),
+    UniqueConstraint("user_id", "comment_id", name="unique_comment_like"),
+    Index("ix_comment_likes_id", "id"),
+    Index("idx_comment_likes_comment", "comment_id"),
+)
+
+Table(
+    "notification_outbox", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("recipient_id", Integer, _fk("users.id"), nullable=False),
+    Column("sender_id", Integer, _fk("users.id"), nullable=False),
+    Column("type", Enum(*NOTIFICATION_TYPES), nullable=False),
+    Column("post_id", Integer, _fk("posts.id")),
+    Column("comment_id", Integer, _fk("comments.id")),
+    Column("repost_id", Integer, _fk("reposts.id")),
+    Column("actor_name", String(255)),
+    Column("action", String(100), nullable=False),
+    _created_at(),
+)
+
+Table(
+    "notifications", metadata,
+    Column("id", Integer, primary_key=True, autoincrement=True),
+    Column("recipient_id", Integer, _fk("users.id"), nullable=False),
+    Column("sender_id", Integer, _fk("users.id"), nullable=False),
+    Column("type", Enum(*NOTIFICATION_TYPES), nullable=False),
+    Column("post_id", Integer, _fk("posts.id")),
+    Column("comment_id", Integer, _fk("comments.id")),
+    Column("repost_id", Integer, _fk("reposts.id")),
+    Column("message", Text),
+    Column("is_read", Boolean),
+    Column("action", String(100)),
+    Column("actor_count", Integer, nullable=False, server_default="1"),
+    _created_at(),
+    Index("ix_notifications_id", "id"),
+    Index("idx_notifications_recipient_created", "recipient_id", "created_at", "id"),
+    Index("idx_notifications_recipient_read", "recipient_id", "is_read"),
+)
+
+
+def upgrade(conn):
+    existing = set(inspect(conn).get_table_names())
+    metadata.create_all(conn)  # checkfirst: only the missing tables
+    for table in metadata.sorted_tables:
+        if table.name in existing:
+            add_missing_columns(conn, table)
@@ -0,0 +1,30 @@
+# Indexes behind the paginated lists, counters and moderation queue. Databases
+# created by create_all on existing tables never got the ones declared later.
+from db.migrate import add_index
+
+INDEXES = [
+    ("posts", "idx_posts_created", ["created_at", "id"]),
+    ("posts", "idx_posts_user_created", ["user_id", "created_at", "id"]),
+    ("posts", "idx_posts_visibility_created", ["visibility", "created_at", "id"]),
+    ("posts", "idx_posts_media_asset", ["media_asset_id"]),
+    ("comments", "idx_comments_post_created", ["post_id", "created_at", "id"]),
+    ("comments", "idx_comments_repost_created", ["repost_id", "created_at", "id"]),
+    ("comments", "idx_comments_created", ["created_at"]),
+    ("likes", "idx_likes_post", ["post_id"]),
+    ("likes", "idx_likes_repost", ["repost_id"]),
+    ("likes", "idx_likes_created", ["created_at"]),
+    ("comment_likes", "idx_comment_likes_comment", ["comment_id"]),
+    ("follows", "idx_follows_follower_created", ["follower_id", "created_at", "id"]),
+    ("follows", "idx_follows_following_created", ["following_id", "created_at", "id"]),
+    ("reposts", "idx_reposts_user_quote_created", ["user_id", "is_quote", "created_at", "id"]),
+    ("reposts", "idx_reposts_created", ["created_at"]),
+    ("reposts", "idx_reposts_original", ["original_post_id"]),
+    ("notifications", "idx_notifications_recipient_created", ["recipient_id", "created_at", "id"]),
+    ("notifications", "idx_notifications_recipient_read", ["recipient_id", "is_read"]),
+    ("post_flags", "idx_post_flags_reviewed_created", ["reviewed", "created_at"]),
+]
+
+
+def upgrade(conn):
+    for table, name, columns in INDEXES:
+        add_index(conn, table, name, columns)
@@ -0,0 +1,22 @@
+# Distinct senders per coalesced notification. Unread notifications are backfilled
+# with their latest sender; older actors of already-merged ones are not recoverable.
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, Table, inspect, text
+
+
+def upgrade(conn):
+    if inspect(conn).has_table("notification_actors"):
+        return
+    metadata = MetaData()
+    Table("notifications", metadata, autoload_with=conn)
+    Table("users", metadata, autoload_with=conn)
+    actors = Table(
+        "notification_actors",
+        metadata,
+        Column("notification_id", Integer, ForeignKey("notifications.id", ondelete="CASCADE"), primary_key=True),
+        Column("sender_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    )
+    actors.create(conn)
+    conn.execute(text(
+        "INSERT INTO notification_actors (notification_id, sender_id) "
+        "SELECT id, sender_id FROM notifications WHERE is_read = 0"
+    ))
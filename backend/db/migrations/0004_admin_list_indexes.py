@@ -0,0 +1,12 @@
+# Indexes for the admin listings sorted by created_at (/admin/users, /admin/flagged-posts)
+from db.migrate import add_index
+
+INDEXES = [
+    ("users", "idx_users_created", ["created_at"]),
+    ("post_flags", "idx_post_flags_created", ["created_at"]),
+]
+
+
+def upgrade(conn):
+    for table, name, columns in INDEXES:
+        add_index(conn, table, name, columns)
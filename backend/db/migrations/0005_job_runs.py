@@ -0,0 +1,13 @@
+# Last run of each periodic job, so workers can claim a run instead of all doing it
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect
+
+
+def upgrade(conn):
+    if inspect(conn).has_table("job_runs"):
+        return
+    Table(
+        "job_runs",
+        MetaData(),
+        Column("name", String(64), primary_key=True),
+        Column("last_run_at", DateTime(timezone=True)),
+    ).create(conn)
@@ -0,0 +1,15 @@
+# Single-use tickets for the notification stream (replaces ?token= on GET /notifications/stream)
+from sqlalchemy import Column, DateTime, Index, MetaData, String, Table, inspect
+
+
+def upgrade(conn):
+    if inspect(conn).has_table("stream_tickets"):
+        return
+    Table(
+        "stream_tickets",
+        MetaData(),
+        Column("ticket_hash", String(64), primary_key=True),
+        Column("firebase_uid", String(128), nullable=False),
+        Column("expires_at", DateTime(timezone=True), nullable=False),
+        Index("idx_stream_tickets_expires", "expires_at"),
+    ).create(conn)
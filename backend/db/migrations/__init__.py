@@ -0,0 +1 @@
+# db/migrations: one module per schema change, applied in order by db/migrate.py
@@ -0,0 +1,58 @@
+# db/query_metrics.py
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryStats:
+    """Statements run and time spent in the database during one request."""
+
+    def __init__(self):
+        self._lock = threading.Lock()  # a request's queries can run on several threads
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.endpoint_done: Optional[float] = None  # perf_counter() when the endpoint returned (TimedRoute)
+
+    def record_query(self, seconds: float) -> None:
+        with self._lock:
+            self.queries += 1
+            self.db_seconds += seconds
+
+    def record_serialization(self, seconds: float) -> None:
+        with self._lock:
+            self.serialize_seconds += seconds
+
+
+# Set per request by the metrics middleware; worker threads and the async
+# engine's greenlets inherit it, so every engine's queries land in the same stats
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def start_request() -> QueryStats:
+    stats = QueryStats()
+    _current.set(stats)
+    return stats
+
+
+def current_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+# Engine (the class) covers the primary, the async engine's sync side and every replica
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_query_started", None)
+    if stats is not None and started is not None:
+        stats.record_query(time.perf_counter() - started)
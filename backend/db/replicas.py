@@ -0,0 +1,150 @@
+# db/replicas.py
+import hashlib
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import AsyncGenerator, Generator, Optional
+
+from fastapi import Header, Request
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from db.database import AsyncSessionLocal, SessionLocal, _ASYNC_POOL_OPTIONS, _POOL_OPTIONS, _async_database_url
+from db.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated read replica URLs (same format as DATABASE_URL); empty = all reads go to the primary
+REPLICA_URLS = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+
+# After a write, that caller's reads stay on the primary for this long (covers replication lag)
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+REPLICA_HEALTH_INTERVAL = int(os.getenv("REPLICA_HEALTH_INTERVAL_SECONDS", "10"))
+
+PRIMARY_COOKIE = "artbook_primary_until"
+_SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# Route flag for endpoints that only read and take get_read_db / get_async_read_db.
+# GETs never pin the caller to the primary; a flagged non-GET (e.g. POST with a body
+# of ids) doesn't either:  @router.post("", openapi_extra=READ_ONLY)
+READ_ONLY_FLAG = "x-read-only"
+READ_ONLY = {READ_ONLY_FLAG: True}
+
+
+def is_read_only(route) -> bool:
+    return bool((getattr(route, "openapi_extra", None) or {}).get(READ_ONLY_FLAG))
+
+
+class Replica:
+    """A read replica's sync and async sessionmakers plus its last health check result."""
+
+    def __init__(self, index: int, url: str):
+        self.name = f"replica-{index}"
+        self.engine = create_engine(url, poolclass=InstrumentedQueuePool, **_POOL_OPTIONS)
+        self.async_engine = create_async_engine(
+            _async_database_url(url), poolclass=InstrumentedAsyncQueuePool, **_ASYNC_POOL_OPTIONS
+        )
+        instrument_engine(self.engine, self.name)
+        instrument_engine(self.async_engine, f"{self.name}-async")
+        self.SessionLocal = sessionmaker(bind=self.engine, autoflush=False, expire_on_commit=False)
+        self.AsyncSessionLocal = async_sessionmaker(bind=self.async_engine, autoflush=False, expire_on_commit=False)
+        self.healthy = True
+
+
+replicas = [Replica(i, url) for i, url in enumerate(REPLICA_URLS)]
+_round_robin = itertools.count()
+_round_robin_lock = threading.Lock()
+
+# sha256(Authorization header) -> True while that caller must read from the primary
+_recent_writers = TTLCache(max_entries=100_000)
+
+
+# -------------------------------------------------
+# Health checks
+# -------------------------------------------------
+def check_replicas() -> None:
+    """Mark each replica healthy or not with a SELECT 1; run periodically from main.py."""
+    for replica in replicas:
+        try:
+            with replica.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            healthy = True
+        except Exception:
+            logger.warning("Read replica %s failed its health check", replica.name, exc_info=True)
+            healthy = False
+        if healthy != replica.healthy:
+            logger.info("Read replica %s is now %s", replica.name, "healthy" if healthy else "unhealthy")
+        replica.healthy = healthy
+
+
+def _next_replica() -> Optional[Replica]:
+    """Round-robin over healthy replicas; None if there are none."""
+    healthy = [r for r in replicas if r.healthy]
+    if not healthy:
+        return None
+    with _round_robin_lock:
+        turn = next(_round_robin)
+    return healthy[turn % len(healthy)]
+
+
+# -------------------------------------------------
+# Read-your-writes stickiness
+# -------------------------------------------------
+def _caller_key(authorization: Optional[str]) -> Optional[str]:
+    return hashlib.sha256(authorization.encode()).hexdigest() if authorization else None
+
+
+def _must_read_primary(request: Request, authorization: Optional[str]) -> bool:
+    key = _caller_key(authorization)
+    if key and _recent_writers.get(key):
+        return True
+    until = request.cookies.get(PRIMARY_COOKIE)
+    try:
+        return until is not None and float(until) > time.time()
+    except ValueError:
+        return False
+
+
+async def stick_to_primary_after_write(request: Request, call_next):
+    """
+    HTTP middleware: after a successful write, send that caller's reads to the primary
+    for READ_YOUR_WRITES_SECONDS. Tracked per bearer token in this process, and with
+    a short-lived cookie so clients that keep cookies stay pinned across workers.
+    """
+    response = await call_next(request)
+    writes = request.method not in _SAFE_METHODS and not is_read_only(request.scope.get("route"))
+    if replicas and writes and response.status_code < 400:
+        until = time.time() + READ_YOUR_WRITES_SECONDS
+        key = _caller_key(request.headers.get("authorization"))
+        if key:
+            _recent_writers.put(key, True, until)
+        response.set_cookie(PRIMARY_COOKIE, f"{until:.3f}", max_age=READ_YOUR_WRITES_SECONDS, httponly=True)
+    return response
+
+
+# -------------------------------------------------
+# Dependencies
+# -------------------------------------------------
+def get_read_db(
+    request: Request, authorization: Optional[str] = Header(default=None)
+) -> Generator[Session, None, None]:
+    """Like get_db(), but served by a healthy replica unless the caller just wrote."""
+    replica = None if _must_read_primary(request, authorization) else _next_replica()
+    db = (replica.SessionLocal if replica else SessionLocal)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(
+    request: Request, authorization: Optional[str] = Header(default=None)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Like get_async_db(), but served by a healthy replica unless the caller just wrote."""
+    replica = None if _must_read_primary(request, authorization) else _next_replica()
+    async with (replica.AsyncSessionLocal if replica else AsyncSessionLocal)() as db:
+        yield db
@@ -148,3 +148,182 @@ ALTER TABLE comments
 
 ALTER TABLE likes 
   ADD FOREIGN KEY (repost_id) REFERENCES reposts(id) ON DELETE CASCADE;
+
+-- ===========================
+-- Keyset pagination indexes
+-- ===========================
+-- Every list endpoint pages by (created_at, id), newest first.
+CREATE INDEX idx_posts_created ON posts (created_at, id);
+CREATE INDEX idx_posts_user_created ON posts (user_id, created_at, id);
+CREATE INDEX idx_posts_visibility_created ON posts (visibility, created_at, id);
+CREATE INDEX idx_comments_post_created ON comments (post_id, created_at, id);
+CREATE INDEX idx_comments_repost_created ON comments (repost_id, created_at, id);
+CREATE INDEX idx_notifications_recipient_created ON notifications (recipient_id, created_at, id);
+CREATE INDEX idx_follows_follower_created ON follows (follower_id, created_at, id);
+CREATE INDEX idx_follows_following_created ON follows (following_id, created_at, id);
+CREATE INDEX idx_reposts_user_quote_created ON reposts (user_id, is_quote, created_at, id);
+
+-- ===========================
+-- HOME TIMELINE (fan-out-on-write feed)
+-- ===========================
+ALTER TABLE users ADD COLUMN fanout_on_read BOOLEAN NOT NULL DEFAULT FALSE;
+
+CREATE TABLE home_timeline (
+    user_id INT NOT NULL,             -- whose feed
+    created_at DATETIME NOT NULL,     -- post / repost time
+    post_id INT NOT NULL,
+    author_id INT NOT NULL,           -- who delivered it (author or reposter)
+    repost_id INT NULL,
+    PRIMARY KEY (user_id, created_at, post_id),
+    INDEX idx_home_timeline_user_author (user_id, author_id),
+    INDEX idx_home_timeline_post (post_id),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (post_id) REFERENCES posts(id) ON DELETE CASCADE,
+    FOREIGN KEY (author_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (repost_id) REFERENCES reposts(id) ON DELETE CASCADE
+);
+
+-- ===========================
+-- Denormalized engagement counters
+-- ===========================
+-- Run `python -m scripts.reconcile_counters` once after adding these to backfill them.
+ALTER TABLE posts
+  ADD COLUMN likes_count INT NOT NULL DEFAULT 0,
+  ADD COLUMN comments_count INT NOT NULL DEFAULT 0,
+  ADD COLUMN reposts_count INT NOT NULL DEFAULT 0;
+ALTER TABLE reposts
+  ADD COLUMN likes_count INT NOT NULL DEFAULT 0,
+  ADD COLUMN comments_count INT NOT NULL DEFAULT 0;
+ALTER TABLE comments ADD COLUMN likes_count INT NOT NULL DEFAULT 0;
+
+-- ===========================
+-- TRENDING SNAPSHOT (rewritten by the trending job)
+-- ===========================
+CREATE TABLE trending_snapshot (
+    `window` VARCHAR(8) NOT NULL,     -- '1h', '24h', '7d'
+    `rank` INT NOT NULL,
+    post_id INT NOT NULL,
+    score DOUBLE NOT NULL,
+    likes INT NOT NULL DEFAULT 0,     -- engagement inside the window
+    comments INT NOT NULL DEFAULT 0,
+    reposts INT NOT NULL DEFAULT 0,
+    generated_at DATETIME NOT NULL,
+    PRIMARY KEY (`window`, `rank`),
+    FOREIGN KEY (post_id) REFERENCES posts(id) ON DELETE CASCADE
+);
+
+CREATE INDEX idx_likes_created ON likes (created_at);
+CREATE INDEX idx_comments_created ON comments (created_at);
+CREATE INDEX idx_reposts_created ON reposts (created_at);
+
+-- ===========================
+-- USER RECOMMENDATIONS ("who to follow" candidates)
+-- ===========================
+CREATE TABLE user_recommendations (
+    user_id INT NOT NULL,
+    candidate_id INT NOT NULL,
+    score DOUBLE NOT NULL,
+    reason VARCHAR(16) NOT NULL,      -- 'fof' or 'colike'
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, candidate_id),
+    INDEX idx_user_recommendations_score (user_id, score),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (candidate_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- ===========================
+-- USER STATS (counters behind /home/stats)
+-- ===========================
+-- Run `python -m scripts.rebuild_user_stats` once after creating this to backfill it.
+CREATE TABLE user_stats (
+    user_id INT PRIMARY KEY,
+    posts_count INT NOT NULL DEFAULT 0,
+    followers_count INT NOT NULL DEFAULT 0,
+    following_count INT NOT NULL DEFAULT 0,
+    likes_received INT NOT NULL DEFAULT 0,   -- post + repost likes
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- ===========================
+-- ACTIVITY (engagement received, read by /home/activity)
+-- ===========================
+-- Run `python -m scripts.rebuild_activity` once after creating this to backfill it.
+CREATE TABLE activity (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    recipient_id INT NOT NULL,        -- whose content / account was engaged with
+    actor_id INT NOT NULL,            -- who did it
+    type ENUM('like_post', 'like_repost', 'follow', 'comment', 'repost') NOT NULL,
+    post_id INT NULL,
+    repost_id INT NULL,
+    comment_id INT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_activity_recipient_created (recipient_id, created_at, id),
+    INDEX idx_activity_actor_recipient (actor_id, recipient_id, type),
+    FOREIGN KEY (recipient_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (actor_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (post_id) REFERENCES posts(id) ON DELETE CASCADE,
+    FOREIGN KEY (repost_id) REFERENCES reposts(id) ON DELETE CASCADE,
+    FOREIGN KEY (comment_id) REFERENCES comments(id) ON DELETE CASCADE
+);
+
+-- ===========================
+-- NOTIFICATION OUTBOX (queued notifications, drained in batches)
+-- ===========================
+ALTER TABLE notifications
+    ADD COLUMN action VARCHAR(100) NULL,
+    ADD COLUMN actor_count INT NOT NULL DEFAULT 1;
+
+CREATE TABLE notification_outbox (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    recipient_id INT NOT NULL,
+    sender_id INT NOT NULL,
+    type ENUM('like', 'like_post', 'like_repost', 'comment', 'follow', 'share') NOT NULL,
+    post_id INT NULL,
+    comment_id INT NULL,
+    repost_id INT NULL,
+    actor_name VARCHAR(255) NULL,
+    action VARCHAR(100) NOT NULL,      -- text after the actor's name, e.g. "liked your post"
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (recipient_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (sender_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (post_id) REFERENCES posts(id) ON DELETE CASCADE,
+    FOREIGN KEY (comment_id) REFERENCES comments(id) ON DELETE CASCADE,
+    FOREIGN KEY (repost_id) REFERENCES reposts(id) ON DELETE CASCADE
+);
+
+-- Unread badge count (COUNT(*) WHERE recipient_id = ? AND is_read = 0 stays in the index)
+CREATE INDEX idx_notifications_recipient_read ON notifications (recipient_id, is_read);
+
+-- ===========================
+-- POST IMAGE VARIANTS (resized WebP/AVIF renditions, see utils/images.py)
+-- ===========================
+ALTER TABLE posts ADD COLUMN media_variants JSON NULL;
+
+-- ===========================
+-- MEDIA ASSETS (uploaded images deduplicated by SHA-256, reference counted)
+-- ===========================
+CREATE TABLE media_assets (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    sha256 CHAR(64) NOT NULL UNIQUE,
+    size_bytes INT NOT NULL,
+    storage_prefix VARCHAR(255) NOT NULL,
+    variants JSON NOT NULL,
+    ref_count INT NOT NULL DEFAULT 0,  -- posts using this asset
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    released_at DATETIME NULL          -- purged once unreferenced for MEDIA_PURGE_GRACE_SECONDS
+);
+
+ALTER TABLE posts
+    ADD COLUMN media_asset_id INT NULL,
+    ADD FOREIGN KEY (media_asset_id) REFERENCES media_assets(id) ON DELETE SET NULL;
+
+-- ===========================
+-- HOT-PATH INDEXES (applied online by db/migrations/0002_hot_path_indexes.py)
+-- From here on, schema changes ship as migrations: run `python -m scripts.migrate`
+-- ===========================
+CREATE INDEX idx_likes_post ON likes (post_id);
+CREATE INDEX idx_likes_repost ON likes (repost_id);
+CREATE INDEX idx_comment_likes_comment ON comment_likes (comment_id);
+CREATE INDEX idx_reposts_original ON reposts (original_post_id);
+CREATE INDEX idx_posts_media_asset ON posts (media_asset_id);
+CREATE INDEX idx_post_flags_reviewed_created ON post_flags (reviewed, created_at);
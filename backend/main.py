@@ -1,8 +1,28 @@
 # main.py
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import text
 
-from db.database import Base, engine
+from db.database import SessionLocal, THREADPOOL_SIZE, async_engine, engine
+from db.migrate import pending
+from db.replicas import REPLICA_HEALTH_INTERVAL, check_replicas, replicas, stick_to_primary_after_write
+from utils import readiness
+from utils.background import claim_run, start_periodic, stop_periodic
+from utils.counters import reconcile_counters
+from utils.firebase_auth import CERT_REFRESH_INTERVAL, init_firebase, refresh_public_certs
+from utils.image_upload import get_bucket
+from utils.images import shutdown_image_workers
+from utils.media_assets import purge_released_assets
+from utils.metrics import record_request_metrics
+from utils.notifications import drain_notification_outbox
+from utils.profiler import ProfilerMiddleware
+from utils.trending import refresh_trending
 
 from models import (
     model_users,
@@ -14,12 +34,118 @@ from models import (
     model_comment_like,
     model_notifications,
     model_repost,
+    model_home_timeline,
+    model_trending_snapshot,
+    model_user_recommendation,
+    model_user_stats,
+    model_activity,
+    model_notification_outbox,
+    model_notification_actor,
+    model_media_asset,
+    model_job_run,
+    model_stream_ticket,
 )
 
+logger = logging.getLogger(__name__)
+
+# Background jobs (intervals in seconds; 0 disables a job)
+COUNTER_RECONCILE_INTERVAL = int(os.getenv("COUNTER_RECONCILE_INTERVAL_SECONDS", "0"))
+TRENDING_REFRESH_INTERVAL = int(os.getenv("TRENDING_REFRESH_INTERVAL_SECONDS", "300"))
+NOTIFICATION_FLUSH_INTERVAL = float(os.getenv("NOTIFICATION_FLUSH_INTERVAL_SECONDS", "2"))
+MEDIA_PURGE_INTERVAL = int(os.getenv("MEDIA_PURGE_INTERVAL_SECONDS", "3600"))
+
+
+def _with_session(job):
+    def run():
+        db = SessionLocal()
+        try:
+            job(db)
+        finally:
+            db.close()
+    return run
+
+
+def _once_across_workers(name, interval_seconds, job):
+    # Every worker ticks, but only the one that claims the interval does the work
+    def run(db):
+        if claim_run(db, name, interval_seconds):
+            job(db)
+    return run
+
+
+def start_background_jobs():
+    if COUNTER_RECONCILE_INTERVAL > 0:
+        start_periodic("reconcile-counters", COUNTER_RECONCILE_INTERVAL, _with_session(reconcile_counters))
+    if TRENDING_REFRESH_INTERVAL > 0:
+        start_periodic("refresh-trending", TRENDING_REFRESH_INTERVAL, _with_session(
+            _once_across_workers("refresh-trending", TRENDING_REFRESH_INTERVAL, refresh_trending)
+        ))
+    if NOTIFICATION_FLUSH_INTERVAL > 0:
+        start_periodic("drain-notifications", NOTIFICATION_FLUSH_INTERVAL, _with_session(drain_notification_outbox))
+    if MEDIA_PURGE_INTERVAL > 0:
+        start_periodic("purge-media-assets", MEDIA_PURGE_INTERVAL, _with_session(purge_released_assets))
+    if CERT_REFRESH_INTERVAL > 0:
+        start_periodic("refresh-firebase-certs", CERT_REFRESH_INTERVAL, refresh_public_certs)
+    if replicas and REPLICA_HEALTH_INTERVAL > 0:
+        start_periodic("check-replicas", REPLICA_HEALTH_INTERVAL, check_replicas)
+
+
+# -------------------------------------------------
+# Warm-up: nothing connects at import; these run after startup (see /health/ready)
+# -------------------------------------------------
+def _warm_database():
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def _warm_async_database():
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+def _check_migrations():
+    # Schema changes are applied with `python -m scripts.migrate`, never at startup
+    waiting = pending(engine)
+    if waiting:
+        logger.warning("Database has %d pending migration(s): %s", len(waiting), ", ".join(waiting))
+        raise RuntimeError(f"pending migrations: {', '.join(waiting)}")
+
+
+def _warm_firebase():
+    init_firebase()
+    refresh_public_certs()
+
+
+readiness.register("database", _warm_database)
+readiness.register("database_async", _warm_async_database)
+readiness.register("firebase_auth", _warm_firebase)
+readiness.register("migrations", _check_migrations, required=False)
+readiness.register("storage", get_bucket, required=False)  # only image uploads need it
+if replicas:
+    readiness.register("read_replicas", check_replicas, required=False)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync routes run here; the DB pool is sized to match (see db/database.py)
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    start_background_jobs()
+    warm_up = asyncio.create_task(readiness.warm_up())
+    try:
+        yield
+    finally:
+        warm_up.cancel()
+        stop_periodic()
+        shutdown_image_workers()
+        await async_engine.dispose()
+        engine.dispose()
+
+
 app = FastAPI(
     title="ArtBook",
     version="1.0.13",
     description="FastAPI backend for ArtBook with Firebase Auth and MySQL.",
+    lifespan=lifespan,
 )
 
 origins = [
@@ -30,6 +156,9 @@ origins = [
     "https://artbook.app",
 ]
 
+# Innermost, so it samples the task the route handler runs in (X-Profile / PROFILE_SAMPLE_EVERY_N)
+app.add_middleware(ProfilerMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -38,11 +167,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Init Firebase AFTER middleware
-import utils.firebase_auth  
+# Pin a caller's reads to the primary right after they write (read replicas)
+app.middleware("http")(stick_to_primary_after_write)
 
-# Create missing tables
-Base.metadata.create_all(bind=engine)
+# SQL statement count / DB time per request (Server-Timing header and /metrics); outermost, so it times everything
+app.middleware("http")(record_request_metrics)
 
 # Routers
 from routers import (
@@ -56,6 +185,10 @@ from routers import (
     router_comment_likes,
     router_notifications,
     router_repost,
+    router_internal,
+    router_viewer_state,
+    router_health,
+    router_metrics,
 )
 
 app.include_router(router_users.router)
@@ -68,6 +201,10 @@ app.include_router(router_admin.router)
 app.include_router(router_comment_likes.router)
 app.include_router(router_notifications.router)
 app.include_router(router_repost.router)
+app.include_router(router_internal.router)
+app.include_router(router_viewer_state.router)
+app.include_router(router_health.router)
+app.include_router(router_metrics.router)
 
 
 @app.get("/")
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, DateTime, Enum, ForeignKey, Index
+from sqlalchemy.sql import func
+from db.database import Base
+
+
+class Activity(Base):
+    """
+    One row per engagement a user received (likes, follows, comments, reposts),
+    written alongside the action itself so GET /home/activity is a single
+    range scan on (recipient_id, created_at, id).
+    """
+    __tablename__ = "activity"
+
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    recipient_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    actor_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    type = Column(Enum("like_post", "like_repost", "follow", "comment", "repost"), nullable=False)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=True)
+    repost_id = Column(Integer, ForeignKey("reposts.id", ondelete="CASCADE"), nullable=True)
+    comment_id = Column(Integer, ForeignKey("comments.id", ondelete="CASCADE"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("idx_activity_recipient_created", "recipient_id", "created_at", "id"),
+        Index("idx_activity_actor_recipient", "actor_id", "recipient_id", "type"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -14,6 +14,15 @@ class Comment(Base):
     repost_id = Column(Integer, ForeignKey("reposts.id", ondelete="CASCADE"), nullable=True)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Denormalized counter (see utils/counters.py)
+    likes_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("idx_comments_post_created", "post_id", "created_at", "id"),
+        Index("idx_comments_repost_created", "repost_id", "created_at", "id"),
+        Index("idx_comments_created", "created_at"),
+    )
     
     # Relationships
     author = relationship("User", back_populates="comments")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -12,7 +12,10 @@ class CommentLike(Base):
     comment_id = Column(Integer, ForeignKey("comments.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    __table_args__ = (UniqueConstraint("user_id", "comment_id", name="unique_comment_like"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "comment_id", name="unique_comment_like"),
+        Index("idx_comment_likes_comment", "comment_id"),
+    )
 
     # Relationships
     user = relationship("User", back_populates="comment_likes")
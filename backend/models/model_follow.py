@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -13,7 +13,11 @@ class Follow(Base):
     following_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    __table_args__ = (UniqueConstraint("follower_id", "following_id", name="unique_follow"),)
+    __table_args__ = (
+        UniqueConstraint("follower_id", "following_id", name="unique_follow"),
+        Index("idx_follows_follower_created", "follower_id", "created_at", "id"),
+        Index("idx_follows_following_created", "following_id", "created_at", "id"),
+    )
 
     # Relationships
     follower = relationship("User", foreign_keys=[follower_id], back_populates="following")
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
+from db.database import Base
+
+
+class HomeTimeline(Base):
+    """
+    Materialized home feed: one row per post delivered to a user's timeline.
+    Rows are written on post/repost/follow and read with a single range scan
+    on (user_id, created_at, post_id).
+    """
+    __tablename__ = "home_timeline"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    created_at = Column(DateTime(timezone=True), primary_key=True)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    # Whose activity delivered the entry (post author, or the reposting user)
+    author_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    repost_id = Column(Integer, ForeignKey("reposts.id", ondelete="CASCADE"), nullable=True)
+
+    __table_args__ = (
+        Index("idx_home_timeline_user_author", "user_id", "author_id"),
+        Index("idx_home_timeline_post", "post_id"),
+    )
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, DateTime
+from db.database import Base
+
+
+class JobRun(Base):
+    """
+    When a periodic job last ran, shared by every worker so a job that should run
+    once per interval (e.g. the trending refresh) is claimed by one of them.
+    """
+    __tablename__ = "job_runs"
+
+    name = Column(String(64), primary_key=True)
+    last_run_at = Column(DateTime(timezone=True))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -16,6 +16,10 @@ class Like(Base):
     __table_args__ = (
         UniqueConstraint("user_id", "post_id", name="unique_like"),
         UniqueConstraint("user_id", "repost_id", name="unique_repost_like"),
+        Index("idx_likes_created", "created_at"),
+        # The unique keys lead with user_id, so per-post/repost lookups need their own
+        Index("idx_likes_post", "post_id"),
+        Index("idx_likes_repost", "repost_id"),
     )
    
     # Relationships
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from sqlalchemy.sql import func
+from db.database import Base
+
+
+class MediaAsset(Base):
+    """
+    One stored image per distinct upload, keyed by the SHA-256 of its bytes.
+    ref_count is the number of posts using it (see utils/media_assets.py);
+    assets released to zero are purged after a grace period.
+    """
+    __tablename__ = "media_assets"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    sha256 = Column(String(64), nullable=False, unique=True)
+    size_bytes = Column(Integer, nullable=False)
+    storage_prefix = Column(String(255), nullable=False)  # folder holding the variant objects
+    variants = Column(JSON, nullable=False)       # same shape as Post.media_variants
+    ref_count = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    released_at = Column(DateTime(timezone=True), nullable=True)  # last time a reference was dropped
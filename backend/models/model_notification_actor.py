@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from db.database import Base
+
+
+class NotificationActor(Base):
+    """
+    Distinct senders merged into a coalesced notification, so a sender who acts
+    again (e.g. unlikes and likes again) is not counted twice in actor_count.
+    """
+    __tablename__ = "notification_actors"
+
+    notification_id = Column(Integer, ForeignKey("notifications.id", ondelete="CASCADE"), primary_key=True)
+    sender_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
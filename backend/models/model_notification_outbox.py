@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, Enum, String, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from db.database import Base
+
+
+class NotificationOutbox(Base):
+    """
+    Pending notification events, written in the same transaction as the action
+    that triggers them and drained in batches by utils.notifications.
+    """
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    recipient_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    sender_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    type = Column(Enum("like", "like_post", "like_repost", "comment", "follow", "share"), nullable=False)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=True)
+    comment_id = Column(Integer, ForeignKey("comments.id", ondelete="CASCADE"), nullable=True)
+    repost_id = Column(Integer, ForeignKey("reposts.id", ondelete="CASCADE"), nullable=True)
+    actor_name = Column(String(255), nullable=True)
+    action = Column(String(100), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
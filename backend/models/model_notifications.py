@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Enum, Boolean, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Enum, Boolean, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -16,15 +16,20 @@ class Notification(Base):
     repost_id = Column(Integer, ForeignKey("reposts.id", ondelete="CASCADE"), nullable=True)    
     message = Column(Text, nullable=True)
     is_read = Column(Boolean, default=False)
-    sent_notifications = relationship("Notification", back_populates="sender")
-    received_notifications = relationship("Notification", back_populates="recipient")
+    # Coalesced notifications ("X and 41 others liked your post") count every actor in the group
+    action = Column(String(100), nullable=True)
+    actor_count = Column(Integer, nullable=False, server_default="1")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        Index("idx_notifications_recipient_created", "recipient_id", "created_at", "id"),
+        # Covers the unread badge count: COUNT(*) WHERE recipient_id = ? AND is_read = 0
+        Index("idx_notifications_recipient_read", "recipient_id", "is_read"),
+    )
+
     # relationships
     recipient = relationship("User", foreign_keys=[recipient_id], back_populates="received_notifications")
     sender = relationship("User", foreign_keys=[sender_id], back_populates="sent_notifications")
     post = relationship("Post", back_populates="notifications")
     comment = relationship("Comment", back_populates="notifications")
     repost = relationship("Repost", back_populates="notifications")
-    recipient = relationship("User", foreign_keys=[recipient_id]) 
-    sender = relationship("User", foreign_keys=[sender_id])   
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, String, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, Text, String, DateTime, Enum, ForeignKey, Index, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -12,9 +12,25 @@ class Post(Base):
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     content = Column(Text, nullable=False)
     media_url = Column(String(500), nullable=True)
+    # Resized WebP/AVIF renditions from utils/images.py: {"thumb"|"feed"|"full": {"width", "height", "webp", "avif"}}
+    media_variants = Column(JSON, nullable=True)
+    media_asset_id = Column(Integer, ForeignKey("media_assets.id", ondelete="SET NULL"), nullable=True)
     visibility = Column(Enum("public", "private", "followers"), default="public", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Denormalized engagement counters (see utils/counters.py)
+    likes_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comments_count = Column(Integer, nullable=False, default=0, server_default="0")
+    reposts_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Keyset pagination: (created_at, id) ranges, optionally scoped to an author or visibility
+    __table_args__ = (
+        Index("idx_posts_created", "created_at", "id"),
+        Index("idx_posts_user_created", "user_id", "created_at", "id"),
+        Index("idx_posts_visibility_created", "visibility", "created_at", "id"),
+        Index("idx_posts_media_asset", "media_asset_id"),
+    )
+
     # Relationships
     author = relationship("User", back_populates="posts")
     likes = relationship("Like", back_populates="post", cascade="all, delete-orphan")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Text, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -15,6 +15,12 @@ class PostFlag(Base):
     reviewed = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Moderation queue: unreviewed flags, oldest first
+    __table_args__ = (
+        Index("idx_post_flags_reviewed_created", "reviewed", "created_at"),
+        Index("idx_post_flags_created", "created_at"),  # admin flagged-posts list
+    )
+
     # Relationships
     post = relationship("Post", back_populates="reports")
     reporter = relationship("User", back_populates="reports")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Text, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -14,6 +14,16 @@ class Repost(Base):
     is_quote = Column(Boolean, default=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Denormalized engagement counters (see utils/counters.py)
+    likes_count = Column(Integer, nullable=False, default=0, server_default="0")
+    comments_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("idx_reposts_user_quote_created", "user_id", "is_quote", "created_at", "id"),
+        Index("idx_reposts_created", "created_at"),
+        Index("idx_reposts_original", "original_post_id"),
+    )
+
     # Relationships
     user = relationship("User", back_populates="reposts")
     original_post = relationship("Post", back_populates="reposts")
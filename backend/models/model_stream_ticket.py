@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Index, String, DateTime
+from db.database import Base
+
+
+class StreamTicket(Base):
+    """
+    Short-lived, single-use ticket that authenticates one notification stream
+    (GET /notifications/stream?ticket=), so the ID token never goes in a URL.
+    Only the ticket's SHA-256 is stored.
+    """
+    __tablename__ = "stream_tickets"
+
+    ticket_hash = Column(String(64), primary_key=True)
+    firebase_uid = Column(String(128), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (Index("idx_stream_tickets_expires", "expires_at"),)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from db.database import Base
+
+
+class TrendingSnapshot(Base):
+    """
+    Precomputed top-N trending posts per time window, rewritten by the
+    trending job (utils/trending.py) and read as-is by GET /home/trending.
+    """
+    __tablename__ = "trending_snapshot"
+
+    window = Column(String(8), primary_key=True)        # "1h", "24h", "7d"
+    rank = Column(Integer, primary_key=True)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False)
+    score = Column(Float, nullable=False)
+    likes = Column(Integer, nullable=False, default=0)     # engagement inside the window
+    comments = Column(Integer, nullable=False, default=0)
+    reposts = Column(Integer, nullable=False, default=0)
+    generated_at = Column(DateTime(timezone=True), nullable=False)
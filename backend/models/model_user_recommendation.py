@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from db.database import Base
+
+
+class UserRecommendation(Base):
+    """
+    Scored "who to follow" candidates per user, computed by
+    utils/recommendations.py and read by GET /home/recommended.
+    """
+    __tablename__ = "user_recommendations"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    candidate_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False)
+    reason = Column(String(16), nullable=False)  # "fof" (friends-of-friends), "colike" or "random" (fallback)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (Index("idx_user_recommendations_score", "user_id", "score"),)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from db.database import Base
+
+
+class UserStats(Base):
+    """
+    Per-user counters behind GET /home/stats, kept in step by the write
+    paths (see utils/user_stats.py) and rebuildable from source tables.
+    """
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    posts_count = Column(Integer, nullable=False, default=0, server_default="0")
+    followers_count = Column(Integer, nullable=False, default=0, server_default="0")
+    following_count = Column(Integer, nullable=False, default=0, server_default="0")
+    likes_received = Column(Integer, nullable=False, default=0, server_default="0")  # post + repost likes
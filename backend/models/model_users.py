@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Enum
+from sqlalchemy import Column, Integer, String, DateTime, Enum, Boolean, Index
 from datetime import datetime
 from db.database import Base
 import enum
@@ -33,8 +33,13 @@ class User(Base):
 
     role = Column(Enum(RoleEnum), nullable=False, default=RoleEnum.regular)
     status = Column(Enum(StatusEnum), nullable=False, default=StatusEnum.active)
+    # Set for accounts with too many followers to fan out on write; their posts are merged in at read time
+    fanout_on_read = Column(Boolean, nullable=False, default=False, server_default="0")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Admin user list (newest first)
+    __table_args__ = (Index("idx_users_created", "created_at"),)
+
     # Relationships
     posts = relationship("Post", back_populates="author", cascade="all, delete-orphan")
     comments = relationship("Comment", back_populates="author", cascade="all, delete-orphan")
@@ -3,6 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException, Body, status
 from sqlalchemy.orm import Session
 from db.database import get_db
 from models.model_users import User, RoleEnum, StatusEnum
+from models.model_post import Post
 from models.model_post_flag import PostFlag
 from utils.firebase_auth import (
     get_token_payload,
@@ -11,9 +12,15 @@ from utils.firebase_auth import (
     forbid_admin_on_creator_db,
     forbid_admin_on_admin_db,
     set_custom_user_claims,
+    get_cached_identity,
+    invalidate_current_user,
 )
+from utils.timeline import remove_post_from_timelines
+from utils.user_stats import release_post_stats
+from utils.media_assets import release_asset
+from utils.metrics import TimedRoute
 
-router = APIRouter(prefix="/admin", tags=["Admin & Moderation"])
+router = APIRouter(prefix="/admin", tags=["Admin & Moderation"], route_class=TimedRoute)
 
 
 # -----------------------------
@@ -25,10 +32,13 @@ router = APIRouter(prefix="/admin", tags=["Admin & Moderation"])
 def admin_dashboard(payload: dict = Depends(get_token_payload), db: Session = Depends(get_db)):
     require_admin(payload)
     uid = payload.get("uid")
-    current_user = db.query(User).filter(User.firebase_uid == uid).first()
+    current_user = get_cached_identity(db, uid)
     if current_user and current_user.role not in [RoleEnum.admin, RoleEnum.creator]:
-        current_user.role = RoleEnum.admin
+        db.query(User).filter(User.id == current_user.id).update(
+            {User.role: RoleEnum.admin}, synchronize_session=False
+        )
         db.commit()
+        invalidate_current_user(uid)
     return {"message": "Welcome to the admin dashboard."}
 
 # Allows the Admin to find a specific user. 
@@ -89,6 +99,9 @@ def admin_delete_post(
     post = db.query(Post).filter(Post.id == post_id).first()
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
+    remove_post_from_timelines(db, post.id)
+    release_post_stats(db, post)
+    release_asset(db, post.media_asset_id)
     db.delete(post)
     db.commit()
     return {"detail": f"Post {post_id} deleted by admin"}
@@ -106,6 +119,7 @@ def delete_user(firebase_uid: str, payload: dict = Depends(get_token_payload), d
 
     db.delete(user)
     db.commit()
+    invalidate_current_user(firebase_uid)
     return {"detail": f"User {firebase_uid} deleted"}
 
 # Allows creator to promote or demote users to/from admin status
@@ -140,6 +154,7 @@ def promote_or_demote_user(
         set_custom_user_claims(firebase_uid, {"admin": False})
 
     db.commit()
+    invalidate_current_user(firebase_uid)
     db.refresh(user)
     return {"detail": f"User {firebase_uid} {'promoted' if make_admin else 'demoted'} successfully."}
 
@@ -233,6 +248,7 @@ def suspend_user(
         user.status = StatusEnum.suspended
 
     db.commit()
+    invalidate_current_user(user.firebase_uid)
     db.refresh(user)
     return {"detail": f"User {user.display_name or user.email} {action}ed."}
 
@@ -251,4 +267,5 @@ def restore_user(
 
     user.status = StatusEnum.active
     db.commit()
+    invalidate_current_user(user.firebase_uid)
     return {"detail": f"User {user.display_name or user.email} restored to active status."}
@@ -4,58 +4,61 @@ from sqlalchemy.orm import Session
 from db.database import get_db
 from models.model_comment_like import CommentLike
 from models.model_comment import Comment
-from models.model_users import User
 from schemas.schema_comment_likes import CommentLikeCreate, CommentLikeResponse
-from utils.firebase_auth import get_current_user
-from utils.notifications import create_notification
+from utils.firebase_auth import CurrentUser, get_current_user_sync
+from utils.likes import TARGETS, set_like, toggle_like
+from utils.metrics import TimedRoute
 
-router = APIRouter(prefix="/comment-likes", tags=["Comment Likes"])
+router = APIRouter(prefix="/comment-likes", tags=["Comment Likes"], route_class=TimedRoute)
 
 # -----------------------------
 #  Comment Like Endpoints
 # -----------------------------
 
+def _commit_like(db: Session, result) -> dict:
+    if result is None:
+        raise HTTPException(status_code=404, detail="Comment not found")
+    db.commit()
+    return result
+
+
+@router.put("/{comment_id}")
+def like_comment(
+    comment_id: int,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user_sync),
+):
+    """Like a comment. Idempotent: returns {"liked": true, "likes_count"} whether or not it was already liked."""
+    return _commit_like(db, set_like(db, TARGETS["comment"], comment_id, current_user, True))
+
+
+@router.delete("/{comment_id}")
+def unlike_comment(
+    comment_id: int,
+    db: Session = Depends(get_db),
+    current_user: CurrentUser = Depends(get_current_user_sync),
+):
+    """Remove your like from a comment. Idempotent."""
+    return _commit_like(db, set_like(db, TARGETS["comment"], comment_id, current_user, False))
+
+
 @router.post("/", response_model=CommentLikeResponse)
 def toggle_comment_like(
     data: CommentLikeCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user_sync),
 ):
-    """Like or unlike a comment"""
-    comment = db.query(Comment).filter(Comment.id == data.comment_id).first()
-    if not comment:
-        raise HTTPException(status_code=404, detail="Comment not found")
+    """Like or unlike a comment (prefer PUT/DELETE /comment-likes/{comment_id})"""
+    result = _commit_like(db, toggle_like(db, TARGETS["comment"], data.comment_id, current_user))
+    if not result["liked"]:
+        return JSONResponse(content={"detail": "Comment unliked"})
 
-    existing = (
+    return (
         db.query(CommentLike)
-        .filter(
-            CommentLike.comment_id == data.comment_id,
-            CommentLike.user_id == current_user.id,
-        )
+        .filter(CommentLike.comment_id == data.comment_id, CommentLike.user_id == current_user.id)
         .first()
     )
 
-    if existing:
-        db.delete(existing)
-        db.commit()
-        return JSONResponse(content={"detail": "Comment unliked"})
-    
-    new_like = CommentLike(user_id=current_user.id, comment_id=data.comment_id)
-    db.add(new_like)
-    db.commit()
-    db.refresh(new_like)
-
-    create_notification(
-        db,
-        sender_id=current_user.id,
-        recipient_id=comment.user_id,
-        notif_type="like",
-        comment_id=comment.id,
-        message=f"{current_user.display_name or 'Someone'} liked your comment",
-    )
-
-    return new_like
-
 
 # -----------------------------
 #  Get comment like count
@@ -63,5 +66,5 @@ def toggle_comment_like(
 @router.get("/count/{comment_id}")
 def get_comment_like_count(comment_id: int, db: Session = Depends(get_db)):
     """Count likes for a specific comment"""
-    count = db.query(CommentLike).filter(CommentLike.comment_id == comment_id).count()
-    return {"comment_id": comment_id, "likes": count}
+    count = db.query(Comment.likes_count).filter(Comment.id == comment_id).scalar()
+    return {"comment_id": comment_id, "likes": count or 0}
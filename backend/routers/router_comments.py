@@ -1,24 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from db.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from db.database import get_async_db
+from db.replicas import READ_ONLY, get_async_read_db
 from models.model_comment import Comment
 from models.model_post import Post
 from models.model_repost import Repost  # ✅ NEW
-from models.model_users import User, RoleEnum
+from models.model_users import RoleEnum
 from schemas.schema_comment import CommentCreate, CommentResponse
-from utils.firebase_auth import get_current_user
+from schemas.schema_pagination import Page
+from utils.firebase_auth import CurrentUser, get_current_user
 from utils.notifications import create_notification
+from utils.counters import adjust_counter
+from utils.activity import record_activity, remove_activity
+from utils.pagination import paginate_async, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.metrics import TimedRoute
 
-router = APIRouter(prefix="/comments", tags=["Comments"])
+router = APIRouter(prefix="/comments", tags=["Comments"], route_class=TimedRoute)
 
 # -----------------------------
 #  Comments
 # -----------------------------
 @router.post("/", response_model=CommentResponse)
-def create_comment(
+async def create_comment(
     comment: CommentCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Add a comment to a post OR a repost (repost derives original post_id)."""
 
@@ -28,7 +36,7 @@ def create_comment(
 
     # If repost_id is provided, derive post_id from repost.original_post_id
     if repost_id is not None:
-        repost = db.query(Repost).filter(Repost.id == repost_id).first()
+        repost = await db.get(Repost, repost_id)
         if not repost:
             raise HTTPException(status_code=404, detail="Repost not found")
         post_id = repost.original_post_id
@@ -36,7 +44,7 @@ def create_comment(
     if post_id is None:
         raise HTTPException(status_code=422, detail="post_id or repost_id is required")
 
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
@@ -47,68 +55,81 @@ def create_comment(
         content=comment.content,
     )
 
+    db.add(new_comment)
+    await db.flush()
+
     # ✅ Trigger notification
     recipient_id = repost.user_id if repost else post.user_id
-    if recipient_id != current_user.id:
-        create_notification(
-            db,
-            sender_id=current_user.id,
-            recipient_id=recipient_id,
-            notif_type="comment",
-            post_id=post.id,
-            message=(
-                f"{current_user.display_name or 'Someone'} commented on your repost"
-                if repost else
-                f"{current_user.display_name or 'Someone'} commented on your post"
-            ),
-        )
-
-    db.add(new_comment)
-    db.commit()
-    db.refresh(new_comment)
+    create_notification(
+        db,
+        sender_id=current_user.id,
+        recipient_id=recipient_id,
+        notif_type="comment",
+        post_id=post.id,
+        actor_name=current_user.display_name,
+        action="commented on your repost" if repost else "commented on your post",
+    )
+    await db.run_sync(record_activity, recipient_id, current_user.id, "comment", post_id=post_id, repost_id=repost_id, comment_id=new_comment.id)
+    await db.run_sync(adjust_counter, Post, post_id, "comments_count", 1)
+    if repost_id is not None:
+        await db.run_sync(adjust_counter, Repost, repost_id, "comments_count", 1)
+    await db.commit()
+    await db.refresh(new_comment)
     return new_comment
 
 # -----------------------------
 #  Show comments
 # -----------------------------
-@router.get("/post/{post_id}", response_model=list[CommentResponse])
-def list_comments(post_id: int, db: Session = Depends(get_db)):
+@router.get("/post/{post_id}", response_model=Page[CommentResponse], openapi_extra=READ_ONLY)
+async def list_comments(
+    post_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db),
+):
     """List comments for a post"""
-    return (
-        db.query(Comment)
-        .filter(Comment.post_id == post_id)
-        .order_by(Comment.created_at.desc())
-        .all()
-    )
+    stmt = select(Comment).where(Comment.post_id == post_id)
+    comments, next_cursor = await paginate_async(db, stmt, Comment.created_at, Comment.id, cursor, limit)
+    return {"items": comments, "next_cursor": next_cursor}
 
 # ------------------------------
 #  Show Comments on Reposts
 # ------------------------------
-@router.get("/repost/{repost_id}", response_model=list[CommentResponse])  # ✅ NEW
-def list_repost_comments(repost_id: int, db: Session = Depends(get_db)):
+@router.get("/repost/{repost_id}", response_model=Page[CommentResponse], openapi_extra=READ_ONLY)  # ✅ NEW
+async def list_repost_comments(
+    repost_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db),
+):
     """List comments specifically attached to a repost"""
-    return (
-        db.query(Comment)
-        .filter(Comment.repost_id == repost_id)
-        .order_by(Comment.created_at.desc())
-        .all()
-    )
+    stmt = select(Comment).where(Comment.repost_id == repost_id)
+    comments, next_cursor = await paginate_async(db, stmt, Comment.created_at, Comment.id, cursor, limit)
+    return {"items": comments, "next_cursor": next_cursor}
 
 # -----------------------------
 #  Delete Comment 
 # -----------------------------
 @router.delete("/{comment_id}")
-def delete_comment(
+async def delete_comment(
     comment_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Delete a comment (own or admin/creator)"""
-    comment = db.query(Comment).filter(Comment.id == comment_id).first()
+    comment = await db.get(Comment, comment_id)
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
     if comment.user_id != current_user.id and current_user.role not in [RoleEnum.creator, RoleEnum.admin]:
         raise HTTPException(status_code=403, detail="Not authorized")
-    db.delete(comment)
-    db.commit()
+    if comment.repost_id is not None:
+        recipient_id = await db.scalar(select(Repost.user_id).where(Repost.id == comment.repost_id))
+    else:
+        recipient_id = await db.scalar(select(Post.user_id).where(Post.id == comment.post_id))
+    await db.run_sync(remove_activity, recipient_id, comment.user_id, "comment", comment_id=comment.id)
+    await db.delete(comment)
+    await db.run_sync(adjust_counter, Post, comment.post_id, "comments_count", -1)
+    if comment.repost_id is not None:
+        await db.run_sync(adjust_counter, Repost, comment.repost_id, "comments_count", -1)
+    await db.commit()
     return {"detail": "Comment deleted"}
\ No newline at end of file
@@ -1,15 +1,23 @@
 # routers/follow.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
 from db.database import get_db
+from db.replicas import READ_ONLY, get_read_db
 from models.model_follow import Follow
 from models.model_users import User
 from schemas.schema_follow import FollowCreate, FollowResponse, FollowerFollowingResponse
-from utils.firebase_auth import get_current_user
+from schemas.schema_pagination import Page
+from utils.firebase_auth import CurrentUser, get_current_user_sync
 from utils.notifications import create_notification
+from utils.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.timeline import backfill_follow, remove_author_from_timeline
+from utils.recommendations import drop_recommendation, refresh_after_follow, refresh_recommendations
+from utils.user_stats import adjust_user_stat
+from utils.activity import record_activity, remove_activity
+from utils.metrics import TimedRoute
 
-router = APIRouter(prefix="/follow", tags=["Follow"])
+router = APIRouter(prefix="/follow", tags=["Follow"], route_class=TimedRoute)
 
 # -------------------------------------------------
 # Follow a user
@@ -17,8 +25,9 @@ router = APIRouter(prefix="/follow", tags=["Follow"])
 @router.post("/", response_model=FollowResponse)
 def follow_user(
     follow: FollowCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user_sync),
 ):
     if follow.following_id == current_user.id:
         raise HTTPException(status_code=400, detail="You cannot follow yourself")
@@ -37,17 +46,26 @@ def follow_user(
 
     db_follow = Follow(follower_id=current_user.id, following_id=follow.following_id)
     db.add(db_follow)
-    db.commit()
-    db.refresh(db_follow)
-
+    drop_recommendation(db, current_user.id, follow.following_id)
+    adjust_user_stat(db, current_user.id, "following_count", 1)
+    adjust_user_stat(db, follow.following_id, "followers_count", 1)
+    record_activity(db, follow.following_id, current_user.id, "follow")
     #Trigger notification
     create_notification(
         db,
         sender_id=current_user.id,
         recipient_id=follow.following_id,
         notif_type="follow",
-        message=f"{current_user.display_name or 'Someone'} started following you",
+        actor_name=current_user.display_name,
+        action="started following you",
     )
+    db.commit()
+    db.refresh(db_follow)
+
+    # Pull the followed user's recent posts into our timeline
+    background_tasks.add_task(backfill_follow, current_user.id, follow.following_id)
+    # The accounts they follow become friends-of-friends candidates
+    background_tasks.add_task(refresh_after_follow, current_user.id, follow.following_id)
 
     return db_follow
 
@@ -58,45 +76,73 @@ def follow_user(
 @router.delete("/{following_id}", status_code=204)
 def unfollow_user(
     following_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user_sync),
 ):
     follow = (
         db.query(Follow)
-        .filter(Follow.follower_id == current_user.id, Follow.following_id == follow.following_id)
+        .filter(Follow.follower_id == current_user.id, Follow.following_id == following_id)
         .first()
     )
     if not follow:
         raise HTTPException(status_code=404, detail="Follow relationship not found")
 
+    remove_author_from_timeline(db, current_user.id, following_id)
+    adjust_user_stat(db, current_user.id, "following_count", -1)
+    adjust_user_stat(db, following_id, "followers_count", -1)
+    remove_activity(db, following_id, current_user.id, "follow")
     db.delete(follow)
     db.commit()
+    background_tasks.add_task(refresh_recommendations, current_user.id)
 
 # -------------------------------------------------
 # Get followers of a user
 # -------------------------------------------------
-@router.get("/followers/{user_id}", response_model=List[FollowerFollowingResponse])
-def get_followers(user_id: int, db: Session = Depends(get_db)):
-    followers = (
-        db.query(User.id, User.firebase_uid, User.display_name, User.avatar_url)
+@router.get("/followers/{user_id}", response_model=Page[FollowerFollowingResponse], openapi_extra=READ_ONLY)
+def get_followers(
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db),
+):
+    query = (
+        db.query(
+            User.id, User.firebase_uid, User.display_name, User.avatar_url,
+            Follow.id.label("follow_id"), Follow.created_at.label("followed_at"),
+        )
         .join(Follow, Follow.follower_id == User.id)
         .filter(Follow.following_id == user_id)
-        .all()
     )
-    return followers
+    followers, next_cursor = paginate(
+        query, Follow.created_at, Follow.id, cursor, limit,
+        key=lambda row: (row.followed_at, row.follow_id),
+    )
+    return {"items": followers, "next_cursor": next_cursor}
 
 # -------------------------------------------------
 # Get following of a user
 # -------------------------------------------------
-@router.get("/following/{user_id}", response_model=List[FollowerFollowingResponse])
-def get_following(user_id: int, db: Session = Depends(get_db)):
-    following = (
-        db.query(User.id, User.firebase_uid, User.display_name, User.avatar_url)
+@router.get("/following/{user_id}", response_model=Page[FollowerFollowingResponse], openapi_extra=READ_ONLY)
+def get_following(
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db),
+):
+    query = (
+        db.query(
+            User.id, User.firebase_uid, User.display_name, User.avatar_url,
+            Follow.id.label("follow_id"), Follow.created_at.label("followed_at"),
+        )
         .join(Follow, Follow.following_id == User.id)
         .filter(Follow.follower_id == user_id)
-        .all()
     )
-    return following
+    following, next_cursor = paginate(
+        query, Follow.created_at, Follow.id, cursor, limit,
+        key=lambda row: (row.followed_at, row.follow_id),
+    )
+    return {"items": following, "next_cursor": next_cursor}
 
 
 
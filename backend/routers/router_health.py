@@ -0,0 +1,26 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from utils.readiness import readiness
+from utils.metrics import TimedRoute
+
+router = APIRouter(prefix="/health", tags=["Health"], route_class=TimedRoute)
+
+
+# -----------------------------
+#  Liveness / readiness probes
+# -----------------------------
+@router.get("/live")
+def live():
+    """The process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+def ready():
+    """200 once every required dependency is warm, 503 until then; reports each one either way."""
+    is_ready, report = readiness()
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"status": "ready" if is_ready else "starting", "dependencies": report},
+    )
@@ -1,170 +1,128 @@
 # routers/home.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from db.database import get_db
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional
+from db.replicas import READ_ONLY, get_async_read_db
 from models.model_users import User
+from models.model_activity import Activity
 from models.model_post import Post
-from models.model_follow import Follow
-from models.model_like import Like
 from models.model_comment import Comment
-from models.model_repost import Repost
-from utils.firebase_auth import get_current_user
-from schemas.schema_post import FeedPostResponse, FeedComment, FeedUser
-
-router = APIRouter(prefix="/home", tags=["Home / Feed"])
+from models.model_trending_snapshot import TrendingSnapshot
+from models.model_user_recommendation import UserRecommendation
+from models.model_user_stats import UserStats
+from utils.firebase_auth import CurrentUser, get_current_user
+from schemas.schema_post import FeedPostResponse
+from schemas.schema_pagination import Page
+from schemas.schema_activity import ActivityResponse
+from utils.feed import build_feed
+from utils.images import DEFAULT_VARIANT, ImageSize, pick_variant
+from utils.pagination import paginate_async, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.timeline import read_home_timeline
+from utils.trending import DEFAULT_WINDOW, TRENDING_TOP_N
+from utils.recommendations import RECOMMENDATIONS_SHOWN, random_users, refresh_recommendations
+from utils.metrics import TimedRoute
+
+router = APIRouter(prefix="/home", tags=["Home / Feed"], route_class=TimedRoute)
 
 
 # -------------------------------------------------
 # Main Feed
 # -------------------------------------------------
-@router.get("/feed", response_model=list[FeedPostResponse])
-def get_feed(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@router.get("/feed", response_model=Page[FeedPostResponse], openapi_extra=READ_ONLY)
+async def get_feed(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    image_size: ImageSize = DEFAULT_VARIANT,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """
     Show a feed of recent public and followed-user posts.
+    Each post's `image` is the `image_size` variant (thumb / feed / full).
     """
-    # Get IDs of people the current user follows
-    followed_ids = (
-        db.query(Follow.following_id)
-        .filter(Follow.follower_id == current_user.id)
-        .subquery()
-    )
-
-    # Query posts (either public or by followed users)
-    posts = (
-        db.query(Post)
-        .filter(
-            (Post.visibility == "public")
-            | (Post.user_id.in_(followed_ids))
-        )
-        .order_by(Post.created_at.desc())
-        .limit(25)
-        .all()
-    )
-
-    feed = []
-    for post in posts:
-        # Count likes and comments
-        likes_count = db.query(func.count(Like.id)).filter(Like.post_id == post.id).scalar()
-        comments_count = db.query(func.count(Comment.id)).filter(Comment.post_id == post.id).scalar()
-
-        # Has current user liked this?
-        liked_by_user = (
-            db.query(Like)
-            .filter(Like.post_id == post.id, Like.user_id == current_user.id)
-            .first()
-            is not None
-        )
-
-        # Most recent 3 comments
-        recent_comments_raw = (
-            db.query(Comment)
-            .filter(Comment.post_id == post.id)
-            .order_by(Comment.created_at.desc())
-            .limit(3)
-            .all()
-        )
-
-        recent_comments = []
-        for c in recent_comments_raw:
-            comment_user = db.query(User).filter(User.id == c.user_id).first()
-            if comment_user:
-                recent_comments.append(
-                    FeedComment(
-                        id=c.id,
-                        content=c.content,
-                        created_at=c.created_at,
-                        user=FeedUser(
-                            id=comment_user.id,
-                            firebase_uid=comment_user.firebase_uid,
-                            display_name=comment_user.display_name,
-                            avatar_url=comment_user.avatar_url,
-                        ),
-                    )
-                )
-
-        # Post author
-        author = db.query(User).filter(User.id == post.user_id).first()
-        if not author:
-            continue
-
-        feed.append(
-            FeedPostResponse(
-                id=post.id,
-                content=post.content,
-                media_url=post.media_url,
-                visibility=post.visibility,
-                created_at=post.created_at,
-                author=FeedUser(
-                    id=author.id,
-                    firebase_uid=author.firebase_uid,
-                    display_name=author.display_name,
-                    avatar_url=author.avatar_url,
-                ),
-                likes_count=likes_count,
-                comments_count=comments_count,
-                liked_by_current_user=liked_by_user,
-                recent_comments=recent_comments,
-            )
-        )
-
-    return feed
+    posts, next_cursor = await db.run_sync(read_home_timeline, current_user.id, cursor, limit)
+    items = await db.run_sync(build_feed, posts, current_user.id, image_size)
+    return {"items": items, "next_cursor": next_cursor}
 
 
 # -------------------------------------------------
 # Trending Posts
 # -------------------------------------------------
-@router.get("/trending")
-def get_trending(db: Session = Depends(get_db)):
+@router.get("/trending", openapi_extra=READ_ONLY)
+async def get_trending(
+    window: Literal["1h", "24h", "7d"] = DEFAULT_WINDOW,
+    limit: int = Query(20, ge=1, le=TRENDING_TOP_N),
+    image_size: ImageSize = DEFAULT_VARIANT,
+    db: AsyncSession = Depends(get_async_read_db),
+):
     """
-    Show trending posts ranked by total likes.
+    Show trending posts from the latest precomputed snapshot for a time window.
     """
-    trending = (
-        db.query(Post, func.count(Like.id).label("likes"))
-        .join(Like, Like.post_id == Post.id, isouter=True)
-        .group_by(Post.id)
-        .order_by(func.count(Like.id).desc())
-        .limit(20)
-        .all()
+    result = await db.execute(
+        select(TrendingSnapshot, Post)
+        .join(Post, Post.id == TrendingSnapshot.post_id)
+        .where(TrendingSnapshot.window == window)
+        .order_by(TrendingSnapshot.rank)
+        .limit(limit)
     )
+    trending = result.all()
 
-    return [
-        {
-            "post_id": post.id,
-            "user_id": post.user_id,
-            "content": post.content,
-            "media_url": post.media_url,
-            "visibility": post.visibility,
-            "likes": likes,
-            "created_at": post.created_at,
-        }
-        for post, likes in trending
-    ]
+    return {
+        "window": window,
+        "generated_at": trending[0][0].generated_at if trending else None,
+        "posts": [
+            {
+                "post_id": post.id,
+                "user_id": post.user_id,
+                "content": post.content,
+                "media_url": post.media_url,
+                "image": pick_variant(post.media_variants, image_size),
+                "visibility": post.visibility,
+                "likes": post.likes_count,
+                "score": snap.score,
+                "window_likes": snap.likes,
+                "window_comments": snap.comments,
+                "window_reposts": snap.reposts,
+                "created_at": post.created_at,
+            }
+            for snap, post in trending
+        ],
+    }
 
 
 # -------------------------------------------------
 # Recommended Users
 # -------------------------------------------------
-@router.get("/recommended")
-def get_recommended(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+@router.get("/recommended", openapi_extra=READ_ONLY)
+async def get_recommended(
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
-    Recommend random users not yet followed by current user.
+    Recommend users not yet followed by current user: precomputed
+    friends-of-friends / co-liker candidates, topped up with random users.
     """
-    followed_subq = db.query(Follow.following_id).filter(Follow.follower_id == current_user.id)
-    recommendations = (
-        db.query(User)
-        .filter(User.id.notin_(followed_subq))
-        .filter(User.id != current_user.id)
-        .order_by(func.rand())
-        .limit(10)
-        .all()
+    result = await db.scalars(
+        select(User)
+        .join(UserRecommendation, UserRecommendation.candidate_id == User.id)
+        .where(UserRecommendation.user_id == current_user.id)
+        .order_by(UserRecommendation.score.desc())
+        .limit(RECOMMENDATIONS_SHOWN)
     )
+    recommendations = list(result.all())
+
+    # Nothing stored yet (new account or never computed): build it for next time.
+    # The stored list includes a random fallback, and refreshes are rate-limited per user.
+    if not recommendations:
+        background_tasks.add_task(refresh_recommendations, current_user.id)
+
+    if len(recommendations) < RECOMMENDATIONS_SHOWN:
+        recommendations += await db.run_sync(
+            random_users, current_user.id, RECOMMENDATIONS_SHOWN - len(recommendations),
+            exclude={u.id for u in recommendations},
+        )
 
     return [
         {
@@ -178,87 +136,39 @@ def get_recommended(
 
 
 # -------------------------------------------------
-# Activity (likes + followers)
+# Activity (likes, follows, comments, reposts)
 # -------------------------------------------------
-@router.get("/activity")
-def get_activity(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+@router.get("/activity", response_model=Page[ActivityResponse], openapi_extra=READ_ONLY)
+async def get_activity(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
-    Get recent activity for the current user (likes & followers).
+    Get recent activity for the current user (likes, follows, comments and reposts), newest first.
     """
-    post_likes = (
-        db.query(Like)
-        .join(Post, Like.post_id == Post.id)
-        .filter(Post.user_id == current_user.id)
-        .all()
-    )
-
-    repost_likes = (
-        db.query(Like)
-        .join(Repost, Like.repost_id == Repost.id)
-        .filter(Repost.user_id == current_user.id)
-        .order_by(Like.created_at.desc())
-        .limit(15)
-        .all()
-    )
-
-    all_likes = sorted(post_likes + repost_likes, key=lambda l: l.created_at, reverse=True)[:15]
-    
-    recent_followers = (
-        db.query(Follow)
-        .filter(Follow.following_id == current_user.id)
-        .order_by(Follow.created_at.desc())
-        .limit(15)
-        .all()
-    )
-
-    return {
-        "likes": [
-            {"user_id": l.user_id, "post_id": l.post_id, "repost_id": l.repost_id, "created_at": l.created_at}
-            for l in all_likes
-        ],
-        "followers": [
-            {"follower_id": f.follower_id, "created_at": f.created_at}
-            for f in recent_followers
-        ],
-    }
+    stmt = select(Activity).where(Activity.recipient_id == current_user.id)
+    activity, next_cursor = await paginate_async(db, stmt, Activity.created_at, Activity.id, cursor, limit)
+    return {"items": activity, "next_cursor": next_cursor}
 
 
 # -------------------------------------------------
 # Personal Stats
 # -------------------------------------------------
-@router.get("/stats")
-def get_user_stats(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+@router.get("/stats", openapi_extra=READ_ONLY)
+async def get_user_stats(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """
     Get current user's counts of posts, followers, following, and likes.
     """
-    post_count = db.query(func.count(Post.id)).filter(Post.user_id == current_user.id).scalar()
-    follower_count = db.query(func.count(Follow.id)).filter(Follow.following_id == current_user.id).scalar()
-    following_count = db.query(func.count(Follow.id)).filter(Follow.follower_id == current_user.id).scalar()
-    post_like_count = (
-        db.query(func.count(Like.id))
-        .join(Post, Like.post_id == Post.id)
-        .filter(Post.user_id == current_user.id)
-        .scalar()
-    )
+    stats = await db.get(UserStats, current_user.id)
 
-    repost_like_count = (
-        db.query(func.count(Like.id))
-        .join(Repost, Like.repost_id == Repost.id)
-        .filter(Repost.user_id == current_user.id)
-        .scalar()
-    )
-        
-    like_count = post_like_count + repost_like_count
-    
     return {
-        "posts": post_count,
-        "followers": follower_count,
-        "following": following_count,
-        "likes": like_count,
+        "posts": stats.posts_count if stats else 0,
+        "followers": stats.followers_count if stats else 0,
+        "following": stats.following_count if stats else 0,
+        "likes": stats.likes_received if stats else 0,
     }
@@ -0,0 +1,44 @@
+# routers/router_internal.py
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from db.pool_metrics import pool_metrics
+from utils.firebase_auth import get_token_payload, identity_cache, require_admin, token_cache
+from utils.profiler import find_profile, profiles
+from utils.metrics import TimedRoute
+
+router = APIRouter(prefix="/internal", tags=["Internal"], route_class=TimedRoute)
+
+
+# -----------------------------
+#  Runtime metrics (admin only)
+# -----------------------------
+@router.get("/metrics")
+def get_metrics(payload: dict = Depends(get_token_payload)):
+    """Connection pool gauges/counters and auth cache stats for this process."""
+    require_admin(payload)
+    return {
+        "db_pools": pool_metrics(),
+        "token_cache": token_cache.stats(),
+        "identity_cache": identity_cache.stats(),
+    }
+
+
+# -----------------------------
+#  Request profiles (admin only)
+# -----------------------------
+@router.get("/profiles")
+def list_profiles(payload: dict = Depends(get_token_payload)):
+    """Profiles in this process's ring buffer, newest first (X-Profile requests and 1-in-N samples)."""
+    require_admin(payload)
+    return [p.summary() for p in reversed(list(profiles))]
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile(profile_id: str, payload: dict = Depends(get_token_payload)):
+    """One profile as collapsed stacks; feed it to flamegraph.pl or speedscope."""
+    require_admin(payload)
+    profile = find_profile(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found (it may have been evicted)")
+    return PlainTextResponse(profile.collapsed())
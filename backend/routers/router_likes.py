@@ -1,118 +1,87 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from db.database import get_db
-from models.model_like import Like
-from models.model_post import Post
-from models.model_repost import Repost
-from models.model_users import User
+from db.database import get_async_db
 
-from utils.firebase_auth import get_current_user
-from utils.notifications import create_notification
+from utils.firebase_auth import CurrentUser, get_current_user
+from utils.likes import TARGETS, set_like, toggle_like
+from utils.metrics import TimedRoute
 
 router = APIRouter(
     prefix="/likes",
-    tags=["Likes"]
+    tags=["Likes"],
+    route_class=TimedRoute,
 )
 
+
+async def _commit_like(db: AsyncSession, apply, *args, not_found: str) -> dict:
+    """Run a utils.likes helper and commit, or 404 (and roll back) if the target is missing."""
+    result = await db.run_sync(apply, *args)
+    if result is None:
+        raise HTTPException(status_code=404, detail=not_found)
+    await db.commit()
+    return result
+
 # -------------------------------------------------
 # Like and unliking posts
 # -------------------------------------------------
-@router.post("/post/{post_id}")
-def toggle_like(
+@router.put("/post/{post_id}")
+async def like_post(
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    """Toggle like/unlike on a post"""
-
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
-        raise HTTPException(status_code=404, detail="Post not found")
-
-    # Check if already liked (POST ONLY)
-    existing = db.query(Like).filter(
-        Like.post_id == post_id,
-        Like.user_id == current_user.id
-    ).first()
+    """Like a post. Idempotent: returns {"liked": true, "likes_count"} whether or not it was already liked."""
+    return await _commit_like(db, set_like, TARGETS["post"], post_id, current_user, True, not_found="Post not found")
 
-    # Unlike
-    if existing:
-        db.delete(existing)
-        db.commit()
-        return {"liked": False}
 
-    # Like post
-    new_like = Like(
-        user_id=current_user.id,
-        post_id=post_id,
-        repost_id=None 
-    )
-
-    db.add(new_like)
-    db.commit()
-    db.refresh(new_like)
+@router.delete("/post/{post_id}")
+async def unlike_post(
+    post_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Remove your like from a post. Idempotent."""
+    return await _commit_like(db, set_like, TARGETS["post"], post_id, current_user, False, not_found="Post not found")
 
-    # Notify post owner
-    if post.user_id != current_user.id:
-        create_notification(
-            db,
-            sender_id=current_user.id,
-            recipient_id=post.user_id,
-            notif_type="like_post",
-            post_id=post.id,
-            message=f"{current_user.display_name or 'Someone'} liked your post",
-        )
 
-    return {"liked": True}
+@router.post("/post/{post_id}")
+async def toggle_post_like(
+    post_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Toggle like/unlike on a post (prefer PUT/DELETE, which are safe to retry)"""
+    return await _commit_like(db, toggle_like, TARGETS["post"], post_id, current_user, not_found="Post not found")
 
 # -------------------------------------------------
 # Like and unliking reposts 
 # -------------------------------------------------
-@router.post("/repost/{repost_id}")
-def toggle_repost_like(
+@router.put("/repost/{repost_id}")
+async def like_repost(
     repost_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    """Toggle like/unlike on a repost (independent from post likes)"""
-
-    repost = db.query(Repost).filter(Repost.id == repost_id).first()
-    if not repost:
-        raise HTTPException(status_code=404, detail="Repost not found")
-
-    # Check if already liked (REPOST ONLY)
-    existing = db.query(Like).filter(
-        Like.repost_id == repost_id,
-        Like.user_id == current_user.id
-    ).first()
-
-    # Unlike
-    if existing:
-        db.delete(existing)
-        db.commit()
-        return {"liked": False}
+    """Like a repost (independent from post likes). Idempotent."""
+    return await _commit_like(db, set_like, TARGETS["repost"], repost_id, current_user, True, not_found="Repost not found")
 
-    # Like repost (NO post_id involved)
-    new_like = Like(
-        user_id=current_user.id,
-        repost_id=repost_id,
-        post_id=None  # explicitly NOT a post like
-    )
 
-    db.add(new_like)
-    db.commit()
-    db.refresh(new_like)
+@router.delete("/repost/{repost_id}")
+async def unlike_repost(
+    repost_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Remove your like from a repost. Idempotent."""
+    return await _commit_like(db, set_like, TARGETS["repost"], repost_id, current_user, False, not_found="Repost not found")
 
-    # Notify repost owner ONLY
-    if repost.user_id != current_user.id:
-        create_notification(
-            db,
-            sender_id=current_user.id,
-            recipient_id=repost.user_id,
-            notif_type="like_repost",
-            repost_id=repost.id,
-            message=f"{current_user.display_name or 'Someone'} liked your repost",
-        )
 
-    return {"liked": True}
\ No newline at end of file
+@router.post("/repost/{repost_id}")
+async def toggle_repost_like(
+    repost_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Toggle like/unlike on a repost (prefer PUT/DELETE, which are safe to retry)"""
+    return await _commit_like(db, toggle_like, TARGETS["repost"], repost_id, current_user, not_found="Repost not found")
@@ -0,0 +1,24 @@
+import hmac
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from utils.metrics import TimedRoute, render_metrics
+
+router = APIRouter(tags=["Internal"], route_class=TimedRoute)
+
+# Scrapers send `Authorization: Bearer <METRICS_TOKEN>`; unset = open (keep /metrics off the public network)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+
+# -----------------------------
+#  Prometheus scrape endpoint
+# -----------------------------
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_prometheus_metrics(authorization: Optional[str] = Header(default=None)):
+    """Request latency, DB time, query count and serialization histograms per route, for this process."""
+    if METRICS_TOKEN and not hmac.compare_digest(authorization or "", f"Bearer {METRICS_TOKEN}"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
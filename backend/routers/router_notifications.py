@@ -1,47 +1,214 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from db.database import get_db
+import json
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from db.database import AsyncSessionLocal, get_async_db
 from models.model_notifications import Notification
 from schemas.schema_notifications import NotificationResponse
-from utils.firebase_auth import get_current_user
-from models.model_users import User
+from schemas.schema_pagination import Page
+from utils.firebase_auth import CurrentUser, get_current_user, get_token_payload
+from utils.notifications import notification_channel
+from utils.pubsub import pubsub
+from utils.stream_tickets import STREAM_TICKET_TTL_SECONDS, issue_stream_ticket, redeem_stream_ticket
+from utils.pagination import decode_cursor, paginate_async, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.metrics import TimedRoute
 
-router = APIRouter(prefix="/notifications", tags=["Notifications"])
+router = APIRouter(prefix="/notifications", tags=["Notifications"], route_class=TimedRoute)
 
 # -------------------------------------------------
 # Get and manage notifications
 # -------------------------------------------------
-@router.get("/", response_model=list[NotificationResponse])
-def get_my_notifications(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@router.get("/", response_model=Page[NotificationResponse])
+async def get_my_notifications(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """Get recent notifications for the logged-in user."""
-    return (
-        db.query(Notification)
-        .filter(Notification.recipient_id == current_user.id)
-        .order_by(Notification.created_at.desc())
-        .limit(50)
-        .all()
+    stmt = select(Notification).where(Notification.recipient_id == current_user.id)
+    notifications, next_cursor = await paginate_async(
+        db, stmt, Notification.created_at, Notification.id, cursor, limit
+    )
+    return {"items": notifications, "next_cursor": next_cursor}
+
+
+@router.get("/unread-count")
+async def get_unread_count(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Number of unread notifications, for the badge (index-only count)."""
+    count = await db.scalar(
+        select(func.count())
+        .select_from(Notification)
+        .where(Notification.recipient_id == current_user.id, Notification.is_read == False)
     )
+    return {"unread": count}
 
 # -------------------------------------------------
 # Mark notifications as read
 # -------------------------------------------------
 @router.patch("/{notification_id}/read")
-def mark_as_read(
+async def mark_as_read(
     notification_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Mark a single notification as read."""
-    notif = (
-        db.query(Notification)
-        .filter(Notification.id == notification_id, Notification.recipient_id == current_user.id)
-        .first()
+    notif = await db.scalar(
+        select(Notification).where(
+            Notification.id == notification_id, Notification.recipient_id == current_user.id
+        )
     )
     if not notif:
         raise HTTPException(status_code=404, detail="Notification not found")
     notif.is_read = True
-    db.commit()
+    await db.commit()
     return {"detail": "Notification marked as read"}
+
+
+# -------------------------------------------------
+# Bulk read state (one UPDATE each)
+# -------------------------------------------------
+@router.patch("/read-all")
+async def mark_all_as_read(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """Mark every unread notification as read."""
+    result = await db.execute(
+        update(Notification)
+        .where(Notification.recipient_id == current_user.id, Notification.is_read == False)
+        .values(is_read=True)
+    )
+    await db.commit()
+    return {"updated": result.rowcount}
+
+
+@router.patch("/read-up-to")
+async def mark_read_up_to(
+    cursor: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Mark read every notification at or before a position, e.g. the `cursor` of
+    the newest notification the client has shown. Newer ones stay unread.
+    """
+    created_at, notification_id = decode_cursor(cursor)
+    result = await db.execute(
+        update(Notification)
+        .where(
+            Notification.recipient_id == current_user.id,
+            Notification.is_read == False,
+            or_(
+                Notification.created_at < created_at,
+                and_(Notification.created_at == created_at, Notification.id <= notification_id),
+            ),
+        )
+        .values(is_read=True)
+    )
+    await db.commit()
+    return {"updated": result.rowcount}
+
+
+# -------------------------------------------------
+# Live stream (Server-Sent Events)
+# -------------------------------------------------
+STREAM_KEEPALIVE_SECONDS = 15
+STREAM_REPLAY_LIMIT = 100
+
+
+def _sse(payload: dict) -> str:
+    return f"id: {payload['cursor']}\nevent: notification\ndata: {json.dumps(payload)}\n\n"
+
+
+def _after(cursor: str):
+    """Notifications strictly newer than a cursor position."""
+    created_at, notification_id = decode_cursor(cursor)
+    return or_(
+        Notification.created_at > created_at,
+        and_(Notification.created_at == created_at, Notification.id > notification_id),
+    )
+
+
+@router.post("/stream-ticket")
+async def create_stream_ticket(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Single-use ticket for GET /notifications/stream?ticket=, for EventSource clients
+    that can't set headers. The ID token itself never goes in a URL (and so into logs).
+    """
+    ticket = await issue_stream_ticket(db, current_user.firebase_uid)
+    return {"ticket": ticket, "expires_in": STREAM_TICKET_TTL_SECONDS}
+
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    ticket: Optional[str] = Query(default=None, description="From POST /notifications/stream-ticket; single use"),
+    last_event_id: Optional[str] = Header(default=None),
+    authorization: Optional[str] = Header(default=None),
+):
+    """
+    Push new and updated notifications as Server-Sent Events. Authenticate with the
+    Authorization header or a ?ticket=; a ticket is used up by the connection, so
+    EventSource clients fetch a new one before reconnecting.
+    Each event's id is the notification's cursor; on reconnect, the browser's
+    Last-Event-ID header (or ?last_event_id=) replays everything newer than it.
+    """
+    last_seen = last_event_id or request.query_params.get("last_event_id")
+
+    # Short-lived session: the stream itself holds no database connection
+    async with AsyncSessionLocal() as db:
+        if ticket:
+            firebase_uid = await redeem_stream_ticket(db, ticket)
+            if firebase_uid is None:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired stream ticket")
+            payload = {"uid": firebase_uid}
+        else:
+            payload = await get_token_payload(authorization)
+        current_user = await get_current_user(payload, db)
+
+        # Subscribe before replaying so nothing published in between is lost
+        channel = notification_channel(current_user.id)
+        subscription = pubsub.subscribe(channel)
+        try:
+            missed = []
+            if last_seen:
+                result = await db.scalars(
+                    select(Notification)
+                    .where(Notification.recipient_id == current_user.id, _after(last_seen))
+                    .order_by(Notification.created_at, Notification.id)
+                    .limit(STREAM_REPLAY_LIMIT)
+                )
+                missed = [NotificationResponse.model_validate(n).model_dump(mode="json") for n in result]
+        except Exception:
+            pubsub.unsubscribe(channel, subscription)
+            raise
+
+    async def events():
+        replayed = {payload["cursor"] for payload in missed}
+        try:
+            for payload in missed:
+                yield _sse(payload)
+            while not await request.is_disconnected():
+                payload = await subscription.get(timeout=STREAM_KEEPALIVE_SECONDS)
+                if payload is None:
+                    yield ": keepalive\n\n"
+                elif payload["cursor"] not in replayed:
+                    yield _sse(payload)
+        finally:
+            pubsub.unsubscribe(channel, subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
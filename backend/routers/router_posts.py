@@ -1,23 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
-from sqlalchemy.orm import Session
-from db.database import get_db
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Body, Query, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.database import get_async_db
+from db.replicas import READ_ONLY, get_async_read_db
 from models.model_post import Post
 from models.model_post_flag import PostFlag
-from models.model_users import User
 from schemas.schema_post import PostCreate, PostResponse
-from utils.firebase_auth import get_current_user
+from schemas.schema_pagination import Page
+from utils.firebase_auth import CurrentUser, get_current_user
+from utils.image_upload import delete_images
+from utils.images import process_image, read_image_body
+from utils.media_assets import new_asset_prefix, reference_asset, register_asset, release_asset
+from utils.pagination import paginate_async, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.timeline import add_timeline_entry, fan_out, remove_post_from_timelines
+from utils.user_stats import adjust_user_stat, release_post_stats
 from typing import Optional
+from utils.metrics import TimedRoute
 
-router = APIRouter(prefix="/posts", tags=["Posts"])
+router = APIRouter(prefix="/posts", tags=["Posts"], route_class=TimedRoute)
 
 #-------------------------------------------------
 # Create, read, delete, and flag posts
 #-------------------------------------------------
 @router.post("/", response_model=PostResponse)
-def create_post(
+async def create_post(
     post_data: PostCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Create a new post"""
     post = Post(
@@ -27,68 +37,131 @@ def create_post(
         visibility=post_data.visibility,
     )
     db.add(post)
-    db.commit()
-    db.refresh(post)
+    await db.flush()
+    await db.refresh(post)
+
+    # Author sees their post right away; followers get it via background fan-out
+    await db.run_sync(add_timeline_entry, current_user.id, post.id, current_user.id, post.created_at)
+    await db.run_sync(adjust_user_stat, current_user.id, "posts_count", 1)
+    await db.commit()
+    background_tasks.add_task(fan_out, post.id, current_user.id, post.created_at)
+    return post
+
+#-------------------------------------------------
+# Post image (resized WebP/AVIF variants)
+#-------------------------------------------------
+@router.put("/{post_id}/image", response_model=PostResponse)
+async def upload_post_image(
+    post_id: int,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    Upload the image for your post as the raw request body (any Content-Type).
+    Stores thumb / feed / full variants and points media_url at the full one.
+    Bytes that were uploaded before reuse the stored variants without re-uploading.
+    """
+    post = await db.get(Post, post_id)
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    if post.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    # Release the connection while the image is read, resized and uploaded
+    await db.commit()
+
+    data, sha256 = await read_image_body(request)
+    asset = await db.run_sync(reference_asset, sha256)
+    if asset is None:
+        await db.commit()
+        prefix = new_asset_prefix(sha256)
+        variants = await process_image(data, prefix)
+        asset = await db.run_sync(register_asset, sha256, len(data), prefix, variants)
+        if asset.storage_prefix != prefix:
+            # The same bytes were registered by a concurrent upload; drop our copy
+            background_tasks.add_task(delete_images, prefix)
+
+    await db.run_sync(release_asset, post.media_asset_id)
+    post.media_asset_id = asset.id
+    post.media_variants = asset.variants
+    post.media_url = asset.variants["full"].get("webp") or asset.variants["full"].get("avif")
+    db.add(post)
+    await db.commit()
     return post
 
 #-------------------------------------------------
 # Get recent posts and manage them
 #-------------------------------------------------
-@router.get("/", response_model=list[PostResponse])
-def get_recent_posts(db: Session = Depends(get_db)):
+@router.get("/", response_model=Page[PostResponse], openapi_extra=READ_ONLY)
+async def get_recent_posts(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db),
+):
     """Get latest public posts"""
-    return db.query(Post).order_by(Post.created_at.desc()).limit(20).all()
+    posts, next_cursor = await paginate_async(db, select(Post), Post.created_at, Post.id, cursor, limit)
+    return {"items": posts, "next_cursor": next_cursor}
 
 #-------------------------------------------------
 # Get posts by user and delete
 #-------------------------------------------------
-@router.get("/user/{user_id}", response_model=list[PostResponse])
-def get_user_posts(user_id: int, db: Session = Depends(get_db)):
+@router.get("/user/{user_id}", response_model=Page[PostResponse], openapi_extra=READ_ONLY)
+async def get_user_posts(
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db),
+):
     """List posts by a user"""
-    return db.query(Post).filter(Post.user_id == user_id).order_by(Post.created_at.desc()).all()
+    stmt = select(Post).where(Post.user_id == user_id)
+    posts, next_cursor = await paginate_async(db, stmt, Post.created_at, Post.id, cursor, limit)
+    return {"items": posts, "next_cursor": next_cursor}
 
 #-------------------------------------------------
 # Delete posts
 #-------------------------------------------------
 @router.delete("/{post_id}")
-def delete_post(
+async def delete_post(
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """Delete your own post"""
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     if post.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this post")
-    db.delete(post)
-    db.commit()
+    await db.run_sync(remove_post_from_timelines, post.id)
+    await db.run_sync(release_post_stats, post)
+    await db.run_sync(release_asset, post.media_asset_id)
+    await db.delete(post)
+    await db.commit()
     return {"detail": "Post deleted"}
 
 #-------------------------------------------------
 # Flag posts for moderation
 #-------------------------------------------------
 @router.post("/{post_id}/flag")
-def flag_post(
+async def flag_post(
     post_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: CurrentUser = Depends(get_current_user),
     reason: Optional[str] = Body(default=None),
 ):
     """Flag a post for moderation"""
-    post = db.query(Post).filter(Post.id == post_id).first()
+    post = await db.get(Post, post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
 
-    existing_flag = db.query(PostFlag).filter(
-        PostFlag.post_id == post_id, PostFlag.reported_by == current_user.id
-    ).first()
+    existing_flag = await db.scalar(
+        select(PostFlag).where(PostFlag.post_id == post_id, PostFlag.reported_by == current_user.id)
+    )
     if existing_flag:
         raise HTTPException(status_code=400, detail="You already reported this post")
 
     flag = PostFlag(post_id=post_id, reported_by=current_user.id, reason=reason)
     db.add(flag)
-    db.commit()
-    db.refresh(flag)
+    await db.commit()
     return {"detail": "Post flagged successfully"}
@@ -1,14 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from typing import Optional
 from db.database import get_db
+from db.replicas import READ_ONLY, get_read_db
 from models.model_repost import Repost
 from models.model_post import Post
-from models.model_users import User
 from schemas.schema_repost import RepostCreate, RepostResponse
-from utils.firebase_auth import get_current_user
+from schemas.schema_pagination import Page
+from utils.firebase_auth import CurrentUser, get_current_user_sync
 from utils.notifications import create_notification
+from utils.counters import adjust_counter
+from utils.activity import record_activity
+from utils.pagination import paginate, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from utils.timeline import add_timeline_entry, fan_out
+from utils.metrics import TimedRoute
 
-router = APIRouter(prefix="/reposts", tags=["Reposts"])
+router = APIRouter(prefix="/reposts", tags=["Reposts"], route_class=TimedRoute)
 
 # ----------------------------------------
 # Create and manage reposts
@@ -17,8 +24,9 @@ router = APIRouter(prefix="/reposts", tags=["Reposts"])
 @router.post("/", response_model=RepostResponse)
 def create_repost(
     data: RepostCreate,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user_sync)
 ):
     original = db.query(Post).filter(Post.id == data.original_post_id).first()
     if not original:
@@ -42,9 +50,13 @@ def create_repost(
         is_quote=is_quote
     )
     db.add(repost)
-    db.commit()
+    adjust_counter(db, Post, original.id, "reposts_count", 1)
+    db.flush()
     db.refresh(repost)
 
+    # The reposted post lands on the reposter's and their followers' timelines
+    add_timeline_entry(db, current_user.id, original.id, current_user.id, repost.created_at, repost.id)
+    record_activity(db, original.user_id, current_user.id, "repost", post_id=original.id, repost_id=repost.id)
     # Trigger notification
     create_notification(
         db,
@@ -52,37 +64,40 @@ def create_repost(
         recipient_id=original.user_id,
         notif_type="share",
         post_id=original.id,
-        message=(
-            f"{current_user.display_name or 'Someone'} quoted your post"
-            if is_quote else
-            f"{current_user.display_name or 'Someone'} reposted your post"
-        ),
+        actor_name=current_user.display_name,
+        action="quoted your post" if is_quote else "reposted your post",
     )
+    db.commit()
+    background_tasks.add_task(fan_out, original.id, current_user.id, repost.created_at, repost.id)
 
     return repost
 
 # ----------------------------------------
 # Get user reposts
 # ----------------------------------------
-@router.get("/user/{user_id}", response_model=list[RepostResponse])
-def get_user_reposts(user_id: int, db: Session = Depends(get_db)):
-    """Show all simple reposts for a given user (no quotes)."""
-    return (
-        db.query(Repost)
-        .filter(Repost.user_id == user_id, Repost.is_quote == False)
-        .order_by(Repost.created_at.desc())
-        .all()
-    )
+@router.get("/user/{user_id}", response_model=Page[RepostResponse], openapi_extra=READ_ONLY)
+def get_user_reposts(
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db),
+):
+    """Show simple reposts for a given user (no quotes)."""
+    query = db.query(Repost).filter(Repost.user_id == user_id, Repost.is_quote == False)
+    reposts, next_cursor = paginate(query, Repost.created_at, Repost.id, cursor, limit)
+    return {"items": reposts, "next_cursor": next_cursor}
 
 # ----------------------------------------
 # Get user quote reposts
 # 
-@router.get("/quotes/{user_id}", response_model=list[RepostResponse])
-def get_user_quote_reposts(user_id: int, db: Session = Depends(get_db)):
-    """Show all quote reposts for a given user."""
-    return (
-        db.query(Repost)
-        .filter(Repost.user_id == user_id, Repost.is_quote == True)
-        .order_by(Repost.created_at.desc())
-        .all()
-    )
+@router.get("/quotes/{user_id}", response_model=Page[RepostResponse], openapi_extra=READ_ONLY)
+def get_user_quote_reposts(
+    user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db),
+):
+    """Show quote reposts for a given user."""
+    query = db.query(Repost).filter(Repost.user_id == user_id, Repost.is_quote == True)
+    reposts, next_cursor = paginate(query, Repost.created_at, Repost.id, cursor, limit)
+    return {"items": reposts, "next_cursor": next_cursor}
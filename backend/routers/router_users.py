@@ -5,13 +5,16 @@ from models.model_users import User, StatusEnum
 from schemas.schema_user import UserCreate, UserUpdate, UserResponse
 from utils.firebase_auth import (
     get_token_payload,
-    get_current_user,
+    get_current_user_sync,
+    invalidate_current_user,
+    CurrentUser,
     require_self_or_admin,
     forbid_admin_on_creator_db,
     forbid_admin_on_admin_db,
 )
+from utils.metrics import TimedRoute
 
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], route_class=TimedRoute)
 
 # ----------------------------------------
 # User management
@@ -42,9 +45,9 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
 # Get current user
 # ----------------------------------------
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+def get_me(current_user: CurrentUser = Depends(get_current_user_sync), db: Session = Depends(get_db)):
     """Get the currently authenticated user"""
-    return current_user
+    return db.query(User).filter(User.id == current_user.id).first()
 
 # ----------------------------------------
 # Update user (self or admin)
@@ -70,5 +73,6 @@ def update_user(
         setattr(user, field, value)
 
     db.commit()
+    invalidate_current_user(firebase_uid)
     db.refresh(user)
     return user
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.replicas import READ_ONLY, get_async_read_db
+from schemas.schema_viewer_state import ViewerStateRequest, ViewerStateResponse
+from utils.firebase_auth import CurrentUser, get_current_user
+from utils.viewer_state import build_viewer_state
+from utils.metrics import TimedRoute
+
+router = APIRouter(prefix="/viewer-state", tags=["Viewer State"], route_class=TimedRoute)
+
+
+# -------------------------------------------------
+# Batch viewer state
+# -------------------------------------------------
+# POST only to carry the id lists; it doesn't write, so it mustn't pin the caller to the primary
+@router.post("", response_model=ViewerStateResponse, openapi_extra=READ_ONLY)
+async def get_viewer_state(
+    data: ViewerStateRequest,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    """
+    The caller's like / repost / follow flags plus counts for up to 300 each of
+    post, repost and comment ids, so a whole grid renders from one call.
+    """
+    return await db.run_sync(
+        build_viewer_state, current_user.id, data.post_ids, data.repost_ids, data.comment_ids
+    )
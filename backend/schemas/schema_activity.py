@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+# ---------- Response ----------
+class ActivityResponse(BaseModel):
+    id: int
+    type: str
+    actor_id: int
+    post_id: Optional[int] = None
+    repost_id: Optional[int] = None
+    comment_id: Optional[int] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
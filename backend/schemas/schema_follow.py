@@ -1,5 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 
 # ---------- Create ----------
@@ -23,7 +24,7 @@ class FollowerFollowingResponse(BaseModel):
     id: int
     firebase_uid: str
     display_name: str
-    avatar_url: str
+    avatar_url: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -1,8 +1,10 @@
 # schemas/notification.py
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 from datetime import datetime
 from typing import Optional
 
+from utils.pagination import encode_cursor
+
 
 class NotificationCreate(BaseModel):
     recipient_id: int
@@ -24,7 +26,14 @@ class NotificationResponse(BaseModel):
     comment_id: Optional[int]
     repost_id: Optional[int]
     is_read: bool
+    actor_count: int = 1
     created_at: datetime
 
+    # Position of this notification; pass to PATCH /notifications/read-up-to
+    @computed_field
+    @property
+    def cursor(self) -> str:
+        return encode_cursor(self.created_at, self.id)
+
     class Config:
         from_attributes = True
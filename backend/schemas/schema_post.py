@@ -26,11 +26,20 @@ class FeedComment(BaseModel):
         from_attributes = True
 
 
+# ---------- Resized image variant ----------
+class FeedImage(BaseModel):
+    url: Optional[str] = None        # WebP
+    avif_url: Optional[str] = None   # smaller, when the client supports AVIF
+    width: int
+    height: int
+
+
 # ---------- Full post entry used in home feed ----------
 class FeedPostResponse(BaseModel):
     id: int
     content: str
     media_url: Optional[str]
+    image: Optional[FeedImage] = None  # the variant requested with ?image_size=
     visibility: str
     created_at: datetime
     author: FeedUser             
@@ -66,6 +75,7 @@ class PostResponse(BaseModel):
     user_id: int
     content: str
     media_url: Optional[str]
+    media_variants: Optional[dict] = None
     visibility: str
     created_at: datetime
 
@@ -0,0 +1,41 @@
+from pydantic import BaseModel, Field
+
+# Upper bound per id list, so one call covers a full grid or profile page
+MAX_VIEWER_STATE_IDS = 300
+
+
+# ---------- Request ----------
+class ViewerStateRequest(BaseModel):
+    post_ids: list[int] = Field(default_factory=list, max_length=MAX_VIEWER_STATE_IDS)
+    repost_ids: list[int] = Field(default_factory=list, max_length=MAX_VIEWER_STATE_IDS)
+    comment_ids: list[int] = Field(default_factory=list, max_length=MAX_VIEWER_STATE_IDS)
+
+
+# ---------- Response ----------
+class PostViewerState(BaseModel):
+    liked: bool
+    reposted: bool
+    following_author: bool
+    likes_count: int
+    comments_count: int
+    reposts_count: int
+
+
+class RepostViewerState(BaseModel):
+    liked: bool
+    following_author: bool
+    likes_count: int
+    comments_count: int
+
+
+class CommentViewerState(BaseModel):
+    liked: bool
+    following_author: bool
+    likes_count: int
+
+
+class ViewerStateResponse(BaseModel):
+    """Keyed by id; ids that don't exist are left out."""
+    posts: dict[int, PostViewerState] = {}
+    reposts: dict[int, RepostViewerState] = {}
+    comments: dict[int, CommentViewerState] = {}
@@ -0,0 +1,120 @@
+# Measure throughput and tail latency of a running API at increasing concurrency.
+# Run from the backend folder against a server started separately, e.g.:
+#   python -m scripts.benchmark --base-url http://localhost:8000 --token <ID_TOKEN> --out async.json
+#
+# Compare two runs (e.g. before and after a change) at the same p99 budget:
+#   python -m scripts.benchmark --compare sync.json async.json --p99-ms 250
+
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+DEFAULT_PATHS = ["/home/feed", "/posts/", "/notifications/", "/home/activity", "/home/stats"]
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_level(base_url: str, token: str, paths: list[str], concurrency: int, duration: float) -> dict:
+    """Hit `paths` round-robin from `concurrency` threads for `duration` seconds."""
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    deadline = time.perf_counter() + duration
+    latencies: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(offset: int):
+        nonlocal errors
+        local, failed, i = [], 0, offset
+        while time.perf_counter() < deadline:
+            request = urllib.request.Request(base_url + paths[i % len(paths)], headers=headers)
+            i += 1
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+                local.append((time.perf_counter() - started) * 1000)
+            except (urllib.error.URLError, OSError):
+                failed += 1
+        with lock:
+            latencies.extend(local)
+            errors += failed
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+    }
+
+
+def best_under_budget(levels: list[dict], p99_ms: float):
+    """Highest throughput among error-free levels whose p99 stays within the budget."""
+    eligible = [lvl for lvl in levels if lvl["p99_ms"] <= p99_ms and not lvl["errors"]]
+    return max(eligible, key=lambda lvl: lvl["rps"]) if eligible else None
+
+
+def print_levels(levels: list[dict]) -> None:
+    print(f"{'conc':>6} {'rps':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for lvl in levels:
+        print(f"{lvl['concurrency']:>6} {lvl['rps']:>9} {lvl['p50_ms']:>9} {lvl['p99_ms']:>9} {lvl['errors']:>7}")
+
+
+def compare(before_path: str, after_path: str, p99_ms: float) -> None:
+    for label, path in (("before", before_path), ("after", after_path)):
+        with open(path) as f:
+            levels = json.load(f)["levels"]
+        best = best_under_budget(levels, p99_ms)
+        if best:
+            print(f"{label}: {best['rps']} req/s at concurrency {best['concurrency']} (p99 {best['p99_ms']} ms)")
+        else:
+            print(f"{label}: no level stayed within p99 {p99_ms} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Requests/sec at a fixed p99 latency budget")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", default="", help="Firebase ID token sent as a Bearer token")
+    parser.add_argument("--paths", default=",".join(DEFAULT_PATHS))
+    parser.add_argument("--concurrency", default="1,8,32,64,128", help="Comma-separated levels")
+    parser.add_argument("--duration", type=float, default=15, help="Seconds per level")
+    parser.add_argument("--p99-ms", type=float, default=250)
+    parser.add_argument("--out", help="Write the results as JSON for --compare")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare, args.p99_ms)
+    else:
+        paths = [p.strip() for p in args.paths.split(",") if p.strip()]
+        levels = [
+            run_level(args.base_url.rstrip("/"), args.token, paths, int(c), args.duration)
+            for c in args.concurrency.split(",")
+        ]
+        print_levels(levels)
+
+        best = best_under_budget(levels, args.p99_ms)
+        if best:
+            print(f"\nBest within p99 {args.p99_ms} ms: {best['rps']} req/s at concurrency {best['concurrency']}")
+
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump({"base_url": args.base_url, "paths": paths, "levels": levels}, f, indent=2)
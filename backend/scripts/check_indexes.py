@@ -0,0 +1,153 @@
+# Check that the queries behind the read endpoints use indexes, via EXPLAIN.
+# Run from the backend folder against a migrated database that has some data
+# (a staging copy, or local data from the seed script):
+#   python -m scripts.check_indexes --user-id 1
+#   python -m scripts.check_indexes --user-id 1 --allow trending_snapshot --allow users
+#
+# Every GET route (plus POSTs flagged READ_ONLY) is called in-process as --user-id,
+# with admin rights. Each distinct SELECT it runs is EXPLAINed; a full table scan
+# with no usable index fails the check. GET routes that write (e.g. the admin
+# dashboard role upgrade) do so as usual, so don't point this at production.
+
+import argparse
+import re
+import sys
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+import main
+from db.database import SessionLocal, async_engine, engine
+from db.replicas import READ_ONLY_FLAG, replicas
+from models.model_comment import Comment
+from models.model_post import Post
+from models.model_post_flag import PostFlag
+from models.model_repost import Repost
+from models.model_users import User
+from utils.firebase_auth import CurrentUser, get_current_user, get_current_user_sync, get_token_payload
+
+SKIP_PATHS = {"/notifications/stream"}  # never returns
+
+# Path parameter -> column a sample value is taken from
+PATH_PARAMS = {
+    "post_id": Post.id,
+    "repost_id": Repost.id,
+    "comment_id": Comment.id,
+    "user_id": User.id,
+    "firebase_uid": User.firebase_uid,
+    "flag_id": PostFlag.id,
+}
+
+
+def sample_values() -> dict:
+    db = SessionLocal()
+    try:
+        return {name: db.query(column).order_by(column).limit(1).scalar() for name, column in PATH_PARAMS.items()}
+    finally:
+        db.close()
+
+
+def requests_to_make(samples: dict) -> list[tuple[str, str, dict]]:
+    """(method, path, json body) for every read endpoint that can be filled in."""
+    calls = []
+    ids = {"post_ids": [samples["post_id"]], "repost_ids": [samples["repost_id"]], "comment_ids": [samples["comment_id"]]}
+    for path, operations in main.app.openapi()["paths"].items():
+        if "post" in operations and operations["post"].get(READ_ONLY_FLAG):
+            calls.append(("POST", path, {k: [i for i in v if i is not None] for k, v in ids.items()}))
+        if "get" not in operations or path in SKIP_PATHS:
+            continue
+        params = re.findall(r"{(\w+)}", path)
+        if any(samples.get(p) is None for p in params):
+            print(f"skip   GET {path} (no sample value for {params})")
+            continue
+        calls.append(("GET", path.format(**{p: samples[p] for p in params}), None))
+    return calls
+
+
+def capture_selects(calls: list, client: TestClient) -> dict[str, tuple]:
+    """Run the calls and collect {statement: (parameters, endpoint)} for each distinct SELECT."""
+    statements: dict[str, tuple] = {}
+    current = {"endpoint": None}
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            statements.setdefault(statement, (parameters, current["endpoint"]))
+
+    engines = [engine, async_engine.sync_engine]
+    for replica in replicas:
+        engines += [replica.engine, replica.async_engine.sync_engine]
+    for e in engines:
+        event.listen(e, "before_cursor_execute", on_execute)
+
+    try:
+        for method, path, body in calls:
+            current["endpoint"] = f"{method} {path}"
+            response = client.request(method, path, json=body)
+            print(f"{response.status_code:<6} {method} {path}")
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", on_execute)
+    return statements
+
+
+def full_scans(statement: str, parameters) -> list[str]:
+    """Tables the statement reads with a full scan and no usable index."""
+    with engine.connect() as conn:
+        if conn.dialect.name == "mysql":
+            rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).mappings().all()
+            return [
+                row["table"] for row in rows
+                if row["type"] == "ALL" and not row["possible_keys"]
+                and row["table"] and not row["table"].startswith("<")
+            ]
+        if conn.dialect.name == "sqlite":
+            tables = set(conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'table'").scalars())
+            scans = []
+            for row in conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters):
+                match = re.match(r"SCAN (\w+)(?: AS \w+)?$", row[-1])
+                if match and match.group(1) in tables:
+                    scans.append(match.group(1))
+            return scans
+        raise SystemExit(f"EXPLAIN check not implemented for {conn.dialect.name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN every read endpoint's queries and flag full table scans")
+    parser.add_argument("--user-id", type=int, required=True, help="User the requests are made as")
+    parser.add_argument("--allow", action="append", default=[], help="Table where full scans are fine (repeatable)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    user = db.get(User, args.user_id)
+    db.close()
+    if user is None:
+        raise SystemExit(f"No user with id {args.user_id}")
+
+    viewer = CurrentUser(
+        id=user.id, firebase_uid=user.firebase_uid, role=user.role, status=user.status,
+        display_name=user.display_name, avatar_url=user.avatar_url,
+    )
+
+    def as_viewer():
+        return viewer
+
+    async def as_admin_payload():
+        return {"uid": user.firebase_uid, "admin": True}
+
+    main.app.dependency_overrides[get_current_user] = as_viewer
+    main.app.dependency_overrides[get_current_user_sync] = as_viewer
+    main.app.dependency_overrides[get_token_payload] = as_admin_payload
+
+    # Not entered as a context manager, so startup handlers (background jobs) don't run
+    client = TestClient(main.app)
+    statements = capture_selects(requests_to_make(sample_values()), client)
+
+    failures = 0
+    for statement, (parameters, endpoint) in statements.items():
+        scanned = [t for t in full_scans(statement, parameters) if t not in args.allow]
+        if scanned:
+            failures += 1
+            print(f"\nFULL SCAN of {', '.join(scanned)} in {endpoint}:\n  {' '.join(statement.split())[:300]}")
+
+    print(f"\n{len(statements)} distinct queries checked, {failures} with full table scans.")
+    sys.exit(1 if failures else 0)
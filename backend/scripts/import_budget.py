@@ -0,0 +1,68 @@
+# Check that importing the app stays cheap: no DB connections, no Firebase or
+# Storage clients, no Pillow. Run from the backend folder (CI or locally):
+#   python -m scripts.import_budget                  # fail over the default budget
+#   python -m scripts.import_budget --budget-ms 1500 --top 25
+#
+# `import main` runs in a fresh interpreter under `python -X importtime`, with an
+# in-memory SQLite DATABASE_URL unless one is set, so nothing can connect anyway.
+
+import argparse
+import os
+import subprocess
+import sys
+
+# Importing these at module level is what made startup slow; they belong behind the lifespan
+FORBIDDEN_AT_IMPORT = ["PIL", "google.cloud.storage", "firebase_admin"]
+BUDGET_MS = 2000  # cumulative `import main`
+
+PROBE = (
+    "import sys, main; "
+    "print(','.join(m for m in sys.argv[1:] if m in sys.modules))"
+)
+
+
+def run_import(forbidden: list[str]) -> tuple[dict[str, int], list[str]]:
+    """({module: cumulative import µs}, forbidden modules that were imported)."""
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE, *forbidden],
+        capture_output=True, text=True, env=env,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import main failed:\n{result.stderr[-3000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        timings[name.strip()] = int(cumulative)
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return timings, loaded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail if importing the app is too slow or loads heavy clients")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="Max cumulative time for `import main`")
+    parser.add_argument("--top", type=int, default=15, help="How many of the slowest imports to list")
+    args = parser.parse_args()
+
+    timings, loaded = run_import(FORBIDDEN_AT_IMPORT)
+    total_ms = timings.get("main", 0) / 1000
+
+    # Top-level packages only, so nested imports aren't counted twice
+    top_level = {name: us for name, us in timings.items() if "." not in name and name != "main"}
+    for name, us in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{us / 1000:8.1f} ms  {name}")
+    print(f"\nimport main: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: imported at module level: {', '.join(loaded)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("FAIL: over budget")
+        failed = True
+    sys.exit(1 if failed else 0)
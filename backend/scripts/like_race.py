@@ -0,0 +1,99 @@
+# Hammer one post's like endpoints with concurrent double-taps and check nothing breaks.
+# Run from the backend folder against a server started separately, using the same database:
+#   python -m scripts.like_race --post-id 42 --tokens TOKEN_A,TOKEN_B,TOKEN_C
+#
+# Each token fires --burst simultaneous requests per round (PUT/DELETE, or POST toggles
+# with --toggle). Afterwards it checks that no request failed with a 5xx, that
+# posts.likes_count equals the number of like rows, and that every user's final
+# idempotent PUT or DELETE left exactly the state it asked for.
+
+import argparse
+import random
+import sys
+import threading
+import urllib.error
+import urllib.request
+from collections import Counter
+
+from sqlalchemy import func
+
+from db.database import SessionLocal
+from models.model_like import Like
+from models.model_post import Post
+
+
+def call(base_url: str, method: str, path: str, token: str) -> int:
+    request = urllib.request.Request(
+        base_url + path, method=method, headers={"Authorization": f"Bearer {token}"}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=30) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except (urllib.error.URLError, OSError):
+        return 0
+
+
+def run_round(base_url: str, path: str, tokens: list[str], burst: int, toggle: bool, statuses: Counter) -> None:
+    """All tokens fire `burst` requests at once, released together by a barrier."""
+    barrier = threading.Barrier(len(tokens) * burst)
+    lock = threading.Lock()
+
+    def worker(token: str):
+        method = "POST" if toggle else random.choice(["PUT", "DELETE"])
+        barrier.wait()
+        status = call(base_url, method, path, token)
+        with lock:
+            statuses[status] += 1
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in tokens for _ in range(burst)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def check_database(post_id: int) -> tuple[int, int]:
+    """(posts.likes_count, actual like rows) for the post."""
+    db = SessionLocal()
+    try:
+        stored = db.query(Post.likes_count).filter(Post.id == post_id).scalar()
+        actual = db.query(func.count(Like.id)).filter(Like.post_id == post_id).scalar()
+        return stored, actual
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent like/unlike correctness check")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--post-id", type=int, required=True)
+    parser.add_argument("--tokens", required=True, help="Comma-separated ID tokens, one per user")
+    parser.add_argument("--burst", type=int, default=8, help="Simultaneous requests per user per round")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--toggle", action="store_true", help="Use the POST toggle instead of PUT/DELETE")
+    args = parser.parse_args()
+
+    base_url = args.base_url.rstrip("/")
+    path = f"/likes/post/{args.post_id}"
+    tokens = [t.strip() for t in args.tokens.split(",") if t.strip()]
+    statuses: Counter = Counter()
+
+    for _ in range(args.rounds):
+        run_round(base_url, path, tokens, args.burst, args.toggle, statuses)
+
+    # Settle every user into a known state with one idempotent call each
+    expected = {token: random.choice([True, False]) for token in tokens}
+    for token, liked in expected.items():
+        statuses[call(base_url, "PUT" if liked else "DELETE", path, token)] += 1
+
+    stored, actual = check_database(args.post_id)
+    failures = sum(n for status, n in statuses.items() if status == 0 or status >= 500)
+    print("Responses:", dict(sorted(statuses.items())))
+    print(f"likes_count={stored} like rows={actual} expected={sum(expected.values())}")
+
+    ok = failures == 0 and stored == actual == sum(expected.values())
+    print("OK" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,235 @@
+# Drive the real app with a realistic mix of requests and report latency and
+# throughput per endpoint. Run from the backend folder against a seeded
+# database (see scripts/seed.py):
+#   python -m scripts.loadtest --concurrency 32 --duration 60 --out before.json
+#   python -m scripts.loadtest --compare before.json after.json
+#
+# The app is served in-process by uvicorn on --port, with the full lifespan
+# (background jobs included). Firebase token verification is stubbed: the
+# bearer token is taken as the firebase_uid, and requests are made as random
+# seeded users ("seed-<id>"). Use scripts/benchmark.py for a deployed server.
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import threading
+import time
+from datetime import datetime, timezone
+
+from scripts.benchmark import percentile
+
+# (name, method, path template, weight). Path parameters are filled with random seeded rows.
+WORKLOAD = [
+    ("GET /home/feed", "GET", "/home/feed", 25),
+    ("GET /home/trending", "GET", "/home/trending", 8),
+    ("GET /posts/", "GET", "/posts/", 5),
+    ("GET /posts/user/{user_id}", "GET", "/posts/user/{user_id}", 10),
+    ("GET /comments/post/{post_id}", "GET", "/comments/post/{post_id}", 10),
+    ("GET /follow/followers/{user_id}", "GET", "/follow/followers/{user_id}", 4),
+    ("GET /notifications/", "GET", "/notifications/", 8),
+    ("GET /notifications/unread-count", "GET", "/notifications/unread-count", 8),
+    ("GET /home/activity", "GET", "/home/activity", 4),
+    ("GET /home/stats", "GET", "/home/stats", 4),
+    ("GET /home/recommended", "GET", "/home/recommended", 3),
+    ("GET /users/me", "GET", "/users/me", 5),
+    ("POST /viewer-state", "POST", "/viewer-state", 5),
+    ("PUT /likes/post/{post_id}", "PUT", "/likes/post/{post_id}", 3),
+    ("DELETE /likes/post/{post_id}", "DELETE", "/likes/post/{post_id}", 3),
+]
+WRITE_METHODS = {"PUT", "DELETE"}
+
+
+# -------------------------------------------------
+# App under test
+# -------------------------------------------------
+def start_app(port: int):
+    """Serve main.app on localhost:port from a background thread; returns the uvicorn server."""
+    # Firebase Admin initializes against the emulator settings but is never called
+    os.environ.setdefault("FIREBASE_AUTH_EMULATOR_HOST", "localhost:9099")
+    import uvicorn
+
+    import main
+    import utils.firebase_auth as firebase_auth
+
+    firebase_auth._verify_id_token = lambda token: {"uid": token, "exp": time.time() + 3600}
+
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    deadline = time.time() + 30
+    while not server.started:
+        if time.time() > deadline:
+            raise SystemExit("App did not start within 30s")
+        time.sleep(0.05)
+    return server
+
+
+def dataset() -> dict:
+    """Id ranges the request parameters are drawn from."""
+    from sqlalchemy import func
+
+    from db.database import SessionLocal
+    from models.model_post import Post
+    from models.model_users import User
+
+    db = SessionLocal()
+    try:
+        users = db.query(func.min(User.id), func.max(User.id), func.count(User.id)).filter(
+            User.firebase_uid.like("seed-%")
+        ).one()
+        posts = db.query(func.min(Post.id), func.max(Post.id), func.count(Post.id)).one()
+    finally:
+        db.close()
+    if not users[2] or not posts[2]:
+        raise SystemExit("No seeded users or posts; run `python -m scripts.seed` first")
+    return {"user_ids": [users[0], users[1]], "users": users[2], "post_ids": [posts[0], posts[1]], "posts": posts[2]}
+
+
+# -------------------------------------------------
+# Load
+# -------------------------------------------------
+def make_request(rng: random.Random, data: dict, workload: list):
+    name, method, template, _ = rng.choices(workload, weights=[w[3] for w in workload])[0]
+    path = template.format(user_id=rng.randint(*data["user_ids"]), post_id=rng.randint(*data["post_ids"]))
+    body = None
+    if name == "POST /viewer-state":
+        body = json.dumps({"post_ids": [rng.randint(*data["post_ids"]) for _ in range(25)]})
+    viewer = f"seed-{rng.randint(*data['user_ids'])}"
+    return name, method, path, body, viewer
+
+
+def run(port: int, data: dict, workload: list, concurrency: int, duration: float, warmup: float, seed: int) -> dict:
+    """Closed loop: `concurrency` threads, each on one keep-alive connection, for warmup + duration seconds."""
+    measure_from = time.perf_counter() + warmup
+    deadline = measure_from + duration
+    samples: dict[str, list[float]] = {name: [] for name, *_ in workload}
+    errors: dict[str, int] = {name: 0 for name, *_ in workload}
+    lock = threading.Lock()
+
+    def worker(n: int):
+        rng = random.Random(seed * 1000 + n)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local = {name: [] for name in samples}
+        failed = dict.fromkeys(samples, 0)
+        while True:
+            name, method, path, body, viewer = make_request(rng, data, workload)
+            headers = {"Authorization": f"Bearer {viewer}"}
+            if body:
+                headers["Content-Type"] = "application/json"
+            started = time.perf_counter()
+            if started >= deadline:
+                break
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                ok = response.status < 400 or response.status == 404  # random ids may miss
+            except (http.client.HTTPException, OSError):
+                ok = False
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            if started < measure_from:
+                continue
+            if ok:
+                local[name].append((time.perf_counter() - started) * 1000)
+            else:
+                failed[name] += 1
+        conn.close()
+        with lock:
+            for name in samples:
+                samples[name].extend(local[name])
+                errors[name] += failed[name]
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    endpoints = {name: summarize(samples[name], errors[name], duration) for name in samples if samples[name] or errors[name]}
+    overall = summarize([ms for values in samples.values() for ms in values], sum(errors.values()), duration)
+    return {"overall": overall, "endpoints": endpoints}
+
+
+def summarize(latencies: list[float], errors: int, duration: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / duration, 1),
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+    }
+
+
+# -------------------------------------------------
+# Reporting
+# -------------------------------------------------
+def print_report(result: dict) -> None:
+    print(f"{'endpoint':<36} {'req':>7} {'err':>5} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+    rows = sorted(result["endpoints"].items()) + [("overall", result["overall"])]
+    for name, s in rows:
+        print(f"{name:<36} {s['requests']:>7} {s['errors']:>5} {s['rps']:>8} {s['p50_ms']:>8} {s['p95_ms']:>8} {s['p99_ms']:>8}")
+
+
+def change(before: float, after: float) -> str:
+    return f"{(after - before) / before * 100:+.0f}%" if before else "n/a"
+
+
+def compare(before_path: str, after_path: str) -> None:
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"{'endpoint':<36} {'p50':>14} {'p95':>14} {'p99':>14} {'rps':>14}")
+    names = sorted(set(before["endpoints"]) & set(after["endpoints"])) + ["overall"]
+    for name in names:
+        b = before["overall"] if name == "overall" else before["endpoints"][name]
+        a = after["overall"] if name == "overall" else after["endpoints"][name]
+        cells = [
+            f"{a[key]} ({change(b[key], a[key])})"
+            for key in ("p50_ms", "p95_ms", "p99_ms", "rps")
+        ]
+        print(f"{name:<36} " + " ".join(f"{c:>14}" for c in cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-endpoint p50/p95/p99 latency and throughput of the app")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before that")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--read-only", action="store_true", help="Leave out the like/unlike requests")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="Write the results as JSON (for --compare)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        raise SystemExit(0)
+
+    workload = [w for w in WORKLOAD if not (args.read_only and w[1] in WRITE_METHODS)]
+    server = start_app(args.port)
+    data = dataset()
+    result = run(args.port, data, workload, args.concurrency, args.duration, args.warmup, args.seed)
+    server.should_exit = True
+    print_report(result)
+
+    if args.out:
+        result = {
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "config": {
+                "concurrency": args.concurrency, "duration": args.duration, "warmup": args.warmup,
+                "read_only": args.read_only, "seed": args.seed, "python": platform.python_version(),
+                "database": data,
+            },
+            **result,
+        }
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
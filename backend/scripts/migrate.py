@@ -0,0 +1,24 @@
+# Apply pending schema migrations (db/migrations/). Run from the backend folder
+# before starting the API, and after pulling changes:
+#   python -m scripts.migrate          # apply everything pending
+#   python -m scripts.migrate --list   # show what would run
+
+import argparse
+import logging
+
+from db.database import engine
+from db.migrate import discover, migrate, pending
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply database migrations")
+    parser.add_argument("--list", action="store_true", help="List migrations and whether they are applied")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.list:
+        waiting = set(pending(engine))
+        for name in discover():
+            print(f"{'pending' if name in waiting else 'applied'}  {name}")
+    else:
+        applied = migrate(engine)
+        print(f"Applied {len(applied)} migration(s)." if applied else "Database is up to date.")
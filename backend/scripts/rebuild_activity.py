@@ -0,0 +1,14 @@
+# Regenerate the activity table from existing likes, follows, comments and reposts.
+# Run from the backend folder:  python -m scripts.rebuild_activity
+
+from db.database import SessionLocal
+from utils.activity import rebuild_activity
+
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        rebuild_activity(db)
+        print("Activity rebuilt.")
+    finally:
+        db.close()
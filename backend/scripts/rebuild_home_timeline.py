@@ -0,0 +1,65 @@
+# Backfill home_timeline from existing posts and follows.
+# Run from the backend folder:  python -m scripts.rebuild_home_timeline
+
+from sqlalchemy import Integer, func, literal, select
+
+from db.database import SessionLocal
+from models.model_follow import Follow
+from models.model_post import Post
+from models.model_users import User
+from utils.timeline import _insert_ignore, _TIMELINE_COLUMNS, BACKFILL_LIMIT
+
+# Followed authors handled per statement
+CHUNK_SIZE = 1000
+
+
+def rebuild_home_timeline():
+    """
+    Put every post on its author's timeline, then give each follower the followed
+    author's BACKFILL_LIMIT most recent posts (as backfill_follow() does), one
+    INSERT ... SELECT per range of author ids.
+    """
+    db = SessionLocal()
+    try:
+        own_posts = select(
+            Post.user_id, Post.created_at, Post.id, Post.user_id, literal(None, Integer)
+        )
+        db.execute(_insert_ignore().from_select(_TIMELINE_COLUMNS, own_posts))
+        db.commit()
+
+        max_author = db.query(func.max(Follow.following_id)).scalar() or 0
+        for low in range(0, max_author + 1, CHUNK_SIZE):
+            high = low + CHUNK_SIZE
+            recent = (
+                select(
+                    Post.id,
+                    Post.user_id,
+                    Post.created_at,
+                    func.row_number()
+                    .over(partition_by=Post.user_id, order_by=(Post.created_at.desc(), Post.id.desc()))
+                    .label("rank"),
+                )
+                .where(Post.user_id >= low, Post.user_id < high)
+                .subquery()
+            )
+            delivered = (
+                select(Follow.follower_id, recent.c.created_at, recent.c.id, recent.c.user_id, literal(None, Integer))
+                .join(recent, recent.c.user_id == Follow.following_id)
+                .join(User, User.id == Follow.following_id)
+                .where(
+                    Follow.following_id >= low,
+                    Follow.following_id < high,
+                    recent.c.rank <= BACKFILL_LIMIT,
+                    User.fanout_on_read == False,
+                )
+            )
+            db.execute(_insert_ignore().from_select(_TIMELINE_COLUMNS, delivered))
+            db.commit()
+            print(f"Backfilled followers of authors up to id {min(high, max_author + 1) - 1}...")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_home_timeline()
+    print("Home timeline rebuilt.")
@@ -0,0 +1,14 @@
+# Backfill or repair the user_stats table from posts, follows and likes.
+# Run from the backend folder:  python -m scripts.rebuild_user_stats
+
+from db.database import SessionLocal
+from utils.user_stats import rebuild_user_stats
+
+
+if __name__ == "__main__":
+    db = SessionLocal()
+    try:
+        done = rebuild_user_stats(db)
+        print(f"Rebuilt stats for {done} user(s).")
+    finally:
+        db.close()
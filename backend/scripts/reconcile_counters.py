@@ -0,0 +1,32 @@
+# Recount denormalized like/comment/repost counters and fix any drift.
+# Run from the backend folder:
+#   python -m scripts.reconcile_counters               # one pass
+#   python -m scripts.reconcile_counters --interval 3600   # keep running every hour
+
+import argparse
+import time
+
+from db.database import SessionLocal
+from utils.counters import reconcile_counters
+
+
+def run_once(chunk_size: int) -> None:
+    db = SessionLocal()
+    try:
+        fixed = reconcile_counters(db, chunk_size=chunk_size)
+        print(f"Reconciled counters: {fixed} row(s) fixed.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile denormalized engagement counters")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--interval", type=int, default=0, help="Seconds between passes (0 = run once)")
+    args = parser.parse_args()
+
+    while True:
+        run_once(args.chunk_size)
+        if not args.interval:
+            break
+        time.sleep(args.interval)
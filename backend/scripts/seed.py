@@ -0,0 +1,275 @@
+# Fill a database with synthetic, production-shaped data: a few very popular
+# users, a long tail of quiet ones, and engagement that follows popularity.
+# Run from the backend folder against a migrated database (SQLite or a local
+# MySQL; never production):
+#   python -m scripts.seed --preset small
+#   python -m scripts.seed --users 200000 --posts-per-user 8 --seed 7
+#
+# Seeded users have firebase_uid "seed-<id>"; scripts/loadtest.py logs in as
+# them. Counter columns are filled in as rows are generated, and user_stats,
+# activity, home_timeline and trending are rebuilt at the end (--no-derived
+# skips that). Running it again adds another batch of users after the last id.
+
+import argparse
+import random
+import time
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from db.migrate import load_models
+from models.model_comment import Comment
+from models.model_follow import Follow
+from models.model_like import Like
+from models.model_notification_actor import NotificationActor
+from models.model_notifications import Notification
+from models.model_post import Post
+from models.model_repost import Repost
+from models.model_users import User
+from utils.timeline import FANOUT_MAX_FOLLOWERS
+
+# Per-user averages; the actual counts are heavy-tailed around them.
+# Order of magnitude, before derived tables: tiny ≈ 100k rows, small ≈ 2M, medium ≈ 20M, large ≈ 200M.
+PRESETS = {
+    "tiny": dict(users=1_000, follows_per_user=20, posts_per_user=5, likes_per_post=8, comments_per_post=2, reposts_per_post=0.3),
+    "small": dict(users=10_000, follows_per_user=30, posts_per_user=8, likes_per_post=10, comments_per_post=2, reposts_per_post=0.3),
+    "medium": dict(users=100_000, follows_per_user=30, posts_per_user=8, likes_per_post=10, comments_per_post=2, reposts_per_post=0.3),
+    "large": dict(users=1_000_000, follows_per_user=30, posts_per_user=8, likes_per_post=10, comments_per_post=2, reposts_per_post=0.3),
+}
+
+CHUNK_SIZE = 5000
+PARETO_ALPHA = 1.6    # tail of per-user / per-post counts; lower = more extreme outliers
+POPULARITY_ZIPF = 1.1  # exponent of the rank -> popularity weights used to pick who gets followed/liked
+
+WORDS = (
+    "sketch ink study color light shadow portrait landscape figure gesture palette "
+    "canvas draft line texture brush charcoal watercolor digital concept character "
+    "wip final commission daily practice anatomy perspective composition value"
+).split()
+
+
+# -------------------------------------------------
+# Distributions
+# -------------------------------------------------
+def heavy_tail(rng: random.Random, mean: float, cap: int) -> int:
+    """Pareto-distributed count with roughly the given mean, at most `cap`."""
+    if mean <= 0 or cap <= 0:
+        return 0
+    scale = mean * (PARETO_ALPHA - 1) / PARETO_ALPHA
+    value = scale * rng.paretovariate(PARETO_ALPHA)
+    # Stochastic rounding keeps small means (e.g. 0.3 reposts per post) unbiased
+    count = int(value) + (rng.random() < value - int(value))
+    return min(count, cap)
+
+
+class Popularity:
+    """Zipf-weighted sampling over user ids, with rank assigned at random (not by id)."""
+
+    def __init__(self, rng: random.Random, ids: list[int]):
+        self.rng = rng
+        self.ids = list(ids)
+        rng.shuffle(self.ids)
+        self.cumulative = list(accumulate(1 / rank ** POPULARITY_ZIPF for rank in range(1, len(self.ids) + 1)))
+
+    def pick(self) -> int:
+        return self.ids[bisect_left(self.cumulative, self.rng.random() * self.cumulative[-1])]
+
+    def pick_distinct(self, k: int, exclude: int) -> set[int]:
+        k = min(k, len(self.ids) - 1)
+        chosen: set[int] = set()
+        attempts = 0
+        while len(chosen) < k and attempts < k * 4:
+            attempts += 1
+            uid = self.pick()
+            if uid != exclude:
+                chosen.add(uid)
+        return chosen
+
+
+def sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize()
+
+
+def between(rng: random.Random, start: datetime, end: datetime) -> datetime:
+    """Random time in [start, end], skewed towards `start` (engagement comes early)."""
+    span = max((end - start).total_seconds(), 0)
+    return start + timedelta(seconds=span * rng.random() ** 3)
+
+
+# -------------------------------------------------
+# Writing
+# -------------------------------------------------
+# Parents before children, so foreign keys always point at rows already written
+INSERT_ORDER = [User, Follow, Post, Repost, Comment, Like, Notification, NotificationActor]
+
+
+class Writer:
+    """Buffers rows per table and bulk-inserts them, all tables at once, every CHUNK_SIZE rows."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.buffers: dict = {model: [] for model in INSERT_ORDER}
+        self.counts: dict = {}
+        self.notification_id = next_id(db, Notification)
+
+    def add(self, model, row: dict) -> None:
+        buffer = self.buffers[model]
+        buffer.append(row)
+        if len(buffer) >= CHUNK_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        for model, rows in self.buffers.items():
+            if rows:
+                self.db.execute(insert(model.__table__), rows)
+                self.counts[model.__tablename__] = self.counts.get(model.__tablename__, 0) + len(rows)
+                rows.clear()
+        self.db.commit()
+
+
+def next_id(db: Session, model) -> int:
+    return (db.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def seed(db: Session, args, rng: random.Random) -> dict:
+    now = db.query(func.now()).scalar().replace(tzinfo=None)
+    start = now - timedelta(days=args.days)
+    out = Writer(db)
+
+    # Users (created across the first half of the window, so they have time to post)
+    first_user = next_id(db, User)
+    user_ids = list(range(first_user, first_user + args.users))
+    joined = {}
+    for uid in user_ids:
+        joined[uid] = between(rng, start, start + (now - start) / 2)
+        out.add(User, dict(
+            id=uid, firebase_uid=f"seed-{uid}", email=f"seed-{uid}@example.com",
+            display_name=f"Seed Artist {uid}", bio=sentence(rng, 3, 12), created_at=joined[uid],
+        ))
+    out.flush()
+    popularity = Popularity(rng, user_ids)
+    print(f"users: {args.users}")
+
+    # Follows: how many each user follows is heavy-tailed; who they follow is popularity-weighted
+    followers = dict.fromkeys(user_ids, 0)
+    for uid in user_ids:
+        for target in popularity.pick_distinct(heavy_tail(rng, args.follows_per_user, args.users - 1), uid):
+            followers[target] += 1
+            at = between(rng, max(joined[uid], joined[target]), now)
+            out.add(Follow, dict(follower_id=uid, following_id=target, created_at=at))
+            notify(out, rng, args, target, uid, "follow", "started following you", at, now)
+    out.flush()
+    mean_followers = max(sum(followers.values()) / len(user_ids), 1)
+    large = [uid for uid, n in followers.items() if n > FANOUT_MAX_FOLLOWERS]
+    if large:
+        db.query(User).filter(User.id.in_(large)).update({User.fanout_on_read: True}, synchronize_session=False)
+        db.commit()
+    print(f"follows: {out.counts.get('follows', 0)} (max followers {max(followers.values())})")
+
+    # Posts, then their likes, comments and reposts; reach scales with the author's followers
+    post_id, comment_id, repost_id = next_id(db, Post), next_id(db, Comment), next_id(db, Repost)
+    for author in user_ids:
+        reach = ((followers[author] + 1) / mean_followers) ** 0.5
+        for _ in range(heavy_tail(rng, args.posts_per_user, 10_000)):
+            created = joined[author] + (now - joined[author]) * rng.random()
+            likers = popularity.pick_distinct(heavy_tail(rng, args.likes_per_post * reach, args.users - 1), author)
+            n_comments = heavy_tail(rng, args.comments_per_post * reach, 5_000)
+            n_reposts = heavy_tail(rng, args.reposts_per_post * reach, 5_000)
+
+            out.add(Post, dict(
+                id=post_id, user_id=author, content=sentence(rng, 4, 30), visibility="public", created_at=created,
+                likes_count=len(likers), comments_count=n_comments, reposts_count=n_reposts,
+            ))
+            for liker in likers:
+                at = between(rng, created, now)
+                out.add(Like, dict(user_id=liker, post_id=post_id, created_at=at))
+                notify(out, rng, args, author, liker, "like_post", "liked your post", at, now, post_id=post_id)
+            for _ in range(n_comments):
+                commenter, at = popularity.pick(), between(rng, created, now)
+                out.add(Comment, dict(id=comment_id, user_id=commenter, post_id=post_id, content=sentence(rng, 2, 20), created_at=at))
+                if commenter != author:
+                    notify(out, rng, args, author, commenter, "comment", "commented on your post", at, now,
+                           post_id=post_id, comment_id=comment_id)
+                comment_id += 1
+            for _ in range(n_reposts):
+                reposter, at = popularity.pick(), between(rng, created, now)
+                is_quote = rng.random() < 0.2
+                out.add(Repost, dict(
+                    id=repost_id, user_id=reposter, original_post_id=post_id, created_at=at,
+                    quote=sentence(rng, 2, 15) if is_quote else None, is_quote=is_quote,
+                ))
+                if reposter != author:
+                    notify(out, rng, args, author, reposter, "share", "quoted your post" if is_quote else "reposted your post",
+                           at, now, post_id=post_id, repost_id=repost_id)
+                repost_id += 1
+            post_id += 1
+        if author % 10_000 == 0:
+            print(f"  ...posts written for {author - first_user + 1} users")
+    out.flush()
+    return out.counts
+
+
+def notify(out: Writer, rng: random.Random, args, recipient: int, sender: int, notif_type: str, action: str,
+           at: datetime, now: datetime, **targets) -> None:
+    if recipient == sender or rng.random() >= args.notification_rate:
+        return
+    out.add(Notification, dict(
+        id=out.notification_id, recipient_id=recipient, sender_id=sender, type=notif_type, action=action, actor_count=1,
+        message=f"Seed Artist {sender} {action}", is_read=(now - at) > timedelta(days=2) or rng.random() < 0.3,
+        created_at=at, **targets,
+    ))
+    out.add(NotificationActor, dict(notification_id=out.notification_id, sender_id=sender))
+    out.notification_id += 1
+
+
+def rebuild_derived(db: Session) -> None:
+    from scripts.rebuild_home_timeline import rebuild_home_timeline
+    from utils.activity import rebuild_activity
+    from utils.trending import refresh_trending
+    from utils.user_stats import rebuild_user_stats
+
+    for name, step in [
+        ("user_stats", lambda: rebuild_user_stats(db)),
+        ("activity", lambda: rebuild_activity(db)),
+        ("home_timeline", rebuild_home_timeline),
+        ("trending", lambda: refresh_trending(db)),
+    ]:
+        started = time.perf_counter()
+        step()
+        print(f"rebuilt {name} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic users, follows, posts and engagement")
+    parser.add_argument("--preset", choices=PRESETS, default="tiny")
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--follows-per-user", type=float)
+    parser.add_argument("--posts-per-user", type=float)
+    parser.add_argument("--likes-per-post", type=float)
+    parser.add_argument("--comments-per-post", type=float)
+    parser.add_argument("--reposts-per-post", type=float)
+    parser.add_argument("--notification-rate", type=float, default=0.5, help="Share of engagement that leaves a notification")
+    parser.add_argument("--days", type=int, default=90, help="How far back the generated activity goes")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed; the same seed and scale give the same data")
+    parser.add_argument("--no-derived", action="store_true", help="Skip rebuilding user_stats, activity, timelines and trending")
+    args = parser.parse_args()
+    for key, value in PRESETS[args.preset].items():
+        if getattr(args, key) is None:
+            setattr(args, key, value)
+
+    load_models()  # the ORM relationships need every model mapped
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        counts = seed(db, args, random.Random(args.seed))
+        for table, n in counts.items():
+            print(f"{table:>15}: {n}")
+        if not args.no_derived:
+            rebuild_derived(db)
+    finally:
+        db.close()
+    print(f"Seeded in {time.perf_counter() - started:.1f}s.")
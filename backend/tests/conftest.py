@@ -0,0 +1,91 @@
+# tests/conftest.py
+# The suite runs against a throwaway SQLite database with Firebase token
+# verification stubbed: the bearer token is the firebase_uid, and tokens
+# starting with "admin" carry the admin claim. Run from the backend folder:
+#   python -m pytest -q
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+_tmp = tempfile.mkdtemp(prefix="artbook-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("DATABASE_REPLICA_URLS", None)
+os.environ["FIREBASE_AUTH_EMULATOR_HOST"] = "localhost:9099"
+
+
+def _verify_id_token(token: str) -> dict:
+    return {"uid": token, "email": f"{token}@example.com", "admin": token.startswith("admin"), "exp": 9999999999}
+
+
+@pytest.fixture(scope="session")
+def app():
+    import main
+    import utils.firebase_auth as firebase_auth
+    from db.database import engine
+    from db.migrate import migrate
+
+    firebase_auth._verify_id_token = _verify_id_token
+    migrate(engine)
+    return main.app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    from fastapi.testclient import TestClient
+
+    # Not used as a context manager: the lifespan's background jobs stay off, tests drive them
+    return TestClient(app)
+
+
+@pytest.fixture
+def db(app):
+    from db.database import SessionLocal
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def auth(uid: str) -> dict:
+    return {"Authorization": f"Bearer {uid}"}
+
+
+@contextmanager
+def count_queries(engine):
+    """Collect the SQL statements `engine` runs inside the block."""
+    from sqlalchemy import event
+
+    statements: list[str] = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def make_user(client):
+    """Create a user through the API (once per uid for the session) and return its id."""
+    def make(uid: str) -> int:
+        if uid not in _users:
+            response = client.post("/users/", json={"firebase_uid": uid, "email": f"{uid}@example.com", "display_name": uid.title()})
+            assert response.status_code == 200, response.text
+            _users[uid] = response.json()["id"]
+        return _users[uid]
+    return make
+
+
+_users: dict[str, int] = {}
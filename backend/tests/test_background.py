@@ -0,0 +1,9 @@
+# tests/test_background.py
+from utils.background import claim_run
+
+
+def test_one_claim_per_interval(db):
+    assert claim_run(db, "test-job", 3600) is True
+    assert claim_run(db, "test-job", 3600) is False  # another worker's tick in the same interval
+    assert claim_run(db, "other-job", 3600) is True
+    assert claim_run(db, "test-job", 0) is True
@@ -0,0 +1,35 @@
+# tests/test_feed.py
+from conftest import count_queries
+from db.database import engine
+from models.model_comment import Comment
+from models.model_like import Like
+from models.model_post import Post
+from utils.feed import RECENT_COMMENTS_PER_POST, build_feed
+
+
+def test_build_feed_query_count_does_not_grow_with_page_size(db, make_user):
+    author, viewer = make_user("f-author"), make_user("f-viewer")
+    commenters = [make_user(f"f-commenter{i}") for i in range(4)]
+
+    posts = [Post(user_id=author, content=f"post {i}", visibility="public") for i in range(30)]
+    db.add_all(posts)
+    db.flush()
+    for i, post in enumerate(posts):
+        db.add_all(Comment(user_id=uid, post_id=post.id, content="nice") for uid in commenters[: i % 5])
+        if i % 2:
+            db.add(Like(user_id=viewer, post_id=post.id))
+    db.commit()
+
+    counts = {}
+    for page_size in (1, 5, 30):
+        page = db.query(Post).filter(Post.id.in_([p.id for p in posts[:page_size]])).all()
+        with count_queries(engine) as statements:
+            feed = build_feed(db, page, viewer)
+        assert len(feed) == page_size
+        counts[page_size] = len(statements)
+
+    assert counts[1] == counts[5] == counts[30] == 3  # liked flags, recent comments, authors
+    by_id = {item.id: item for item in feed}
+    assert by_id[posts[4].id].liked_by_current_user is False
+    assert len(by_id[posts[4].id].recent_comments) == RECENT_COMMENTS_PER_POST
+    assert by_id[posts[3].id].liked_by_current_user is True
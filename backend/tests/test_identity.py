@@ -0,0 +1,33 @@
+# tests/test_identity.py
+from conftest import auth, count_queries
+from db.database import async_engine
+from utils.firebase_auth import IDENTITY_INVALIDATION_CHANNEL, identity_cache
+from utils.pubsub import pubsub
+
+
+def test_suspension_applies_on_the_next_request(client, make_user):
+    user_id = make_user("i-suspended")
+    make_user("admin-i")
+    assert client.get("/users/me", headers=auth("i-suspended")).status_code == 200
+
+    response = client.patch(f"/admin/users/{user_id}/suspend", json={"action": "suspend"}, headers=auth("admin-i"))
+    assert response.status_code == 200, response.text
+    assert client.get("/users/me", headers=auth("i-suspended")).status_code == 403
+
+
+def test_invalidation_from_another_worker_clears_the_cache(client, make_user):
+    make_user("i-remote")
+    assert client.get("/users/me", headers=auth("i-remote")).status_code == 200
+    assert identity_cache.get("i-remote") is not None
+
+    # What a broker-backed PubSub does when another worker publishes
+    pubsub.deliver(IDENTITY_INVALIDATION_CHANNEL, {"firebase_uid": "i-remote"})
+    assert identity_cache.get("i-remote") is None
+
+
+def test_sync_routes_resolve_the_user_without_the_async_engine(client, make_user):
+    make_user("i-sync")
+    identity_cache.invalidate("i-sync")
+    with count_queries(async_engine.sync_engine) as statements:
+        assert client.get("/users/me", headers=auth("i-sync")).status_code == 200
+    assert statements == []
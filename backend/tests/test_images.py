@@ -0,0 +1,31 @@
+# tests/test_images.py
+import io
+import subprocess
+import sys
+
+from conftest import BACKEND
+from utils.image_render import VARIANT_SIZES, render_variants
+
+APP_MODULES = ["db.database", "firebase_admin", "sqlalchemy", "fastapi", "utils.image_upload"]
+
+
+def test_render_module_imports_none_of_the_app():
+    # What a spawned image worker loads to unpickle a render_variants() task
+    probe = (
+        "import sys, utils.image_render; "
+        f"print(','.join(m for m in {APP_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], cwd=BACKEND, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_render_variants_never_upscales():
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 480), "white").save(buffer, "PNG")
+    variants = render_variants(buffer.getvalue())
+
+    assert set(variants) == set(VARIANT_SIZES)
+    assert (variants["full"]["width"], variants["feed"]["height"]) == (640, 480)
+    assert variants["thumb"]["width"] == 320 and "webp" in variants["thumb"]["files"]
@@ -0,0 +1,11 @@
+# tests/test_import_budget.py
+from conftest import BACKEND
+from scripts.import_budget import BUDGET_MS, FORBIDDEN_AT_IMPORT, run_import
+
+
+def test_import_main_stays_within_budget(monkeypatch):
+    monkeypatch.chdir(BACKEND)  # the probe runs `import main` from the working directory
+    timings, loaded = run_import(FORBIDDEN_AT_IMPORT)
+
+    assert loaded == [], f"imported at module level: {loaded}"
+    assert timings["main"] / 1000 <= BUDGET_MS
@@ -0,0 +1,22 @@
+# tests/test_metrics.py
+import re
+
+from fastapi import routing
+
+from conftest import auth
+from utils import metrics
+
+
+def test_serialization_is_timed_without_patching_fastapi(client, make_user):
+    assert routing.serialize_response.__module__ == "fastapi.routing"
+    labels = ("GET", "/posts/", "2xx")
+    *_, total, count = metrics.serialize_seconds._series.get(labels, [0, 0])
+
+    make_user("t-timer")
+    client.post("/posts/", json={"content": "timed"}, headers=auth("t-timer"))
+    response = client.get("/posts/", headers=auth("t-timer"))
+
+    assert response.status_code == 200
+    assert re.search(r"serialize;dur=[\d.]+", response.headers["Server-Timing"])
+    series = metrics.serialize_seconds._series[labels]
+    assert series[-1] == count + 1 and series[-2] > total  # one observation, of a measured duration
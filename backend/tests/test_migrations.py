@@ -0,0 +1,21 @@
+# tests/test_migrations.py
+from sqlalchemy import create_engine, inspect
+
+from db.database import Base
+from db.migrate import load_models, migrate, pending
+
+
+def test_migrations_build_the_model_schema(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    migrate(engine)
+    assert pending(engine) == []
+
+    load_models()
+    schema = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        assert schema.has_table(table.name), table.name
+        columns = {c["name"] for c in schema.get_columns(table.name)}
+        assert {c.name for c in table.columns} <= columns, table.name
+        indexes = {ix["name"] for ix in schema.get_indexes(table.name)}
+        assert {ix.name for ix in table.indexes} <= indexes, table.name
+    engine.dispose()
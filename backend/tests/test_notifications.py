@@ -0,0 +1,60 @@
+# tests/test_notifications.py
+import asyncio
+
+from conftest import auth
+from db.database import AsyncSessionLocal
+from models.model_notifications import Notification
+from utils.notifications import drain_notification_outbox
+from utils.stream_tickets import redeem_stream_ticket
+
+
+def like_notification(db, post_id: int) -> Notification:
+    db.expire_all()
+    return db.query(Notification).filter(Notification.post_id == post_id, Notification.type == "like_post").one()
+
+
+def test_relike_across_drains_counts_the_sender_once(client, db, make_user):
+    make_user("n-author")
+    make_user("n-fan")
+    post_id = client.post("/posts/", json={"content": "study"}, headers=auth("n-author")).json()["id"]
+
+    for method in ("put", "delete", "put"):
+        assert client.request(method.upper(), f"/likes/post/{post_id}", headers=auth("n-fan")).status_code == 200
+        drain_notification_outbox(db)
+    drain_notification_outbox(db)
+
+    notification = like_notification(db, post_id)
+    assert notification.actor_count == 1
+    assert notification.message == "N-Fan liked your post"
+
+
+def test_distinct_senders_are_merged(client, db, make_user):
+    make_user("m-author")
+    post_id = client.post("/posts/", json={"content": "ink"}, headers=auth("m-author")).json()["id"]
+    for uid in ("m-fan1", "m-fan2", "m-fan3"):
+        make_user(uid)
+        client.put(f"/likes/post/{post_id}", headers=auth(uid))
+        drain_notification_outbox(db)
+    client.delete(f"/likes/post/{post_id}", headers=auth("m-fan1"))
+    client.put(f"/likes/post/{post_id}", headers=auth("m-fan1"))
+    drain_notification_outbox(db)
+
+    notification = like_notification(db, post_id)
+    assert notification.actor_count == 3
+    assert notification.message == "M-Fan1 and 2 others liked your post"
+
+
+def test_stream_ticket_is_single_use(client, make_user):
+    make_user("s-viewer")
+    assert client.get("/notifications/stream", params={"token": "s-viewer"}).status_code == 401  # ID tokens stay out of URLs
+
+    response = client.post("/notifications/stream-ticket", headers=auth("s-viewer"))
+    assert response.status_code == 200, response.text
+    ticket = response.json()["ticket"]
+
+    async def redeem_twice():
+        async with AsyncSessionLocal() as db:
+            return await redeem_stream_ticket(db, ticket), await redeem_stream_ticket(db, ticket)
+
+    assert asyncio.run(redeem_twice()) == ("s-viewer", None)
+    assert client.get("/notifications/stream", params={"ticket": ticket}).status_code == 401
@@ -0,0 +1,123 @@
+# tests/test_profiler.py
+import asyncio
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.util import await_only
+
+from conftest import auth
+from db.database import AsyncSessionLocal
+from utils.profiler import Profile, _label, check_internals
+
+
+@pytest.mark.parametrize("request_kwargs", [
+    {"params": {"profile": "0"}},
+    {"params": {"profile": "1"}},
+    {"headers": {"X-Profile": "1"}},
+])
+def test_profile_flag_from_non_admin_is_ignored(client, make_user, request_kwargs):
+    make_user("p-regular")
+    headers = {**auth("p-regular"), **request_kwargs.pop("headers", {})}
+    response = client.get("/posts/", headers=headers, **request_kwargs)
+    assert response.status_code == 200, response.text
+    assert "x-profile-id" not in response.headers
+
+
+@pytest.mark.parametrize("flag", ["0", "no", "false"])
+def test_only_explicit_flag_profiles(client, make_user, flag):
+    make_user("admin-p1")
+    response = client.get("/posts/", headers={**auth("admin-p1"), "X-Profile": flag})
+    assert response.status_code == 200, response.text
+    assert "x-profile-id" not in response.headers
+
+
+def test_admin_request_is_profiled(client, make_user):
+    make_user("admin-p2")
+    response = client.get("/posts/", headers={**auth("admin-p2"), "X-Profile": "true"})
+    assert response.status_code == 200, response.text
+    profile_id = response.headers["x-profile-id"]
+
+    listed = client.get("/internal/profiles", headers=auth("admin-p2")).json()
+    summary = next(p for p in listed if p["id"] == profile_id)
+    assert summary["source"] == "admin:admin-p2"
+    assert summary["route"] == "/posts/"
+    assert client.get(f"/internal/profiles/{profile_id}", headers=auth("admin-p2")).status_code == 200
+
+
+def test_library_internals_still_hold():
+    assert check_internals() == []
+
+
+def test_label_without_qualname():
+    code = SimpleNamespace(co_name="handler", co_filename=__file__, co_firstlineno=7)
+    assert _label(code) == "handler (tests/test_profiler.py:7)"
+
+
+@contextmanager
+def request_task(coroutine_fn):
+    """Run coroutine_fn() as a task on an event loop in another thread, like a request."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    task = asyncio.run_coroutine_threadsafe(_as_task(coroutine_fn), loop).result()
+    try:
+        yield loop, thread.ident, task
+    finally:
+        asyncio.run_coroutine_threadsafe(asyncio.wait_for(asyncio.shield(task), 5), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+async def _as_task(coroutine_fn):
+    return asyncio.ensure_future(coroutine_fn())
+
+
+def sample(task, loop_thread) -> list[str]:
+    profile = Profile(task, loop_thread, {})
+    profile.take_sample(sys._current_frames())
+    return list(profile.stacks)
+
+
+def test_sample_follows_the_request_into_a_worker_thread():
+    entered, release = threading.Event(), threading.Event()
+
+    def blocking_work():
+        entered.set()
+        release.wait(5)
+
+    async def request():
+        await run_in_threadpool(blocking_work)
+
+    with request_task(request) as (loop, loop_thread, task):
+        assert entered.wait(5)
+        stacks = sample(task, loop_thread)
+        release.set()
+    assert any("blocking_work" in stack for stack in stacks), stacks
+
+
+def test_sample_follows_the_request_into_a_run_sync_greenlet():
+    entered = threading.Event()
+    gates = {}
+
+    def orm_work(session):
+        entered.set()
+        await_only(gates["release"].wait())  # suspends the greenlet, as a driver call would
+
+    async def request():
+        gates["release"] = asyncio.Event()
+        async with AsyncSessionLocal() as session:
+            await session.run_sync(orm_work)
+
+    with request_task(request) as (loop, loop_thread, task):
+        assert entered.wait(5)
+        while asyncio.current_task(loop) is task:  # until the greenlet has switched out
+            time.sleep(0.001)
+        stacks = sample(task, loop_thread)
+        loop.call_soon_threadsafe(gates["release"].set)
+    assert any("orm_work" in stack for stack in stacks), stacks
@@ -0,0 +1,46 @@
+# tests/test_recommendations.py
+from conftest import auth
+from models.model_user_recommendation import UserRecommendation
+from utils import recommendations
+from utils.recommendations import refresh_recommendations
+
+
+def stored(db, user_id: int) -> dict[int, tuple[float, str]]:
+    db.expire_all()
+    rows = db.query(UserRecommendation).filter(UserRecommendation.user_id == user_id)
+    return {r.candidate_id: (r.score, r.reason) for r in rows}
+
+
+def test_follow_adds_the_followed_accounts_follows(client, db, make_user):
+    a, b, c, d = (make_user(f"r-{name}") for name in "abcd")
+    for target in (c, d):
+        client.post("/follow/", json={"following_id": target}, headers=auth("r-b"))
+    db.query(UserRecommendation).filter(UserRecommendation.user_id == a).delete()
+    db.add_all([
+        UserRecommendation(user_id=a, candidate_id=b, score=1.0, reason="fof"),
+        UserRecommendation(user_id=a, candidate_id=c, score=0.5, reason="colike"),
+    ])
+    db.commit()
+
+    assert client.post("/follow/", json={"following_id": b}, headers=auth("r-a")).status_code == 200
+
+    assert stored(db, a) == {c: (1.5, "colike"), d: (1.0, "fof")}
+
+
+def test_fallback_is_stored_and_refreshes_are_rate_limited(client, db, make_user, monkeypatch):
+    for i in range(12):
+        make_user(f"q-user{i}")
+    lonely = make_user("q-lonely")
+
+    refresh_recommendations(lonely)
+    first = stored(db, lonely)
+    assert len(first) == recommendations.RECOMMENDATIONS_SHOWN
+    assert {reason for _, reason in first.values()} == {"random"}
+
+    calls = []
+    monkeypatch.setattr(recommendations, "compute_recommendations", lambda db, user_id: calls.append(user_id))
+    refresh_recommendations(lonely)
+    response = client.get("/home/recommended", headers=auth("q-lonely"))
+    assert response.status_code == 200
+    assert len(response.json()) == recommendations.RECOMMENDATIONS_SHOWN
+    assert calls == []
@@ -0,0 +1,52 @@
+# tests/test_replicas.py
+import importlib
+import pkgutil
+from types import SimpleNamespace
+
+import pytest
+
+import db.replicas
+from conftest import auth
+from db.replicas import PRIMARY_COOKIE, get_async_read_db, get_read_db, is_read_only
+
+
+@pytest.fixture
+def with_replica(monkeypatch):
+    # Unhealthy, so reads still go to the primary, but the read-your-writes pin is active
+    monkeypatch.setattr(db.replicas, "replicas", [SimpleNamespace(healthy=False)])
+
+
+def test_read_only_post_does_not_pin_to_primary(client, make_user, with_replica):
+    make_user("r-reader")
+    response = client.post("/viewer-state", json={"post_ids": [1]}, headers=auth("r-reader"))
+    assert response.status_code == 200, response.text
+    assert PRIMARY_COOKIE not in response.cookies
+
+
+def test_write_pins_to_primary(client, make_user, with_replica):
+    make_user("r-writer")
+    response = client.post("/posts/", json={"content": "wip"}, headers=auth("r-writer"))
+    assert response.status_code == 200, response.text
+    assert PRIMARY_COOKIE in response.cookies
+    client.cookies.clear()
+
+
+def api_routes():
+    """Every APIRoute declared in routers/ (app.routes only lists the included routers)."""
+    import routers
+    for module in pkgutil.iter_modules(routers.__path__):
+        yield from importlib.import_module(f"routers.{module.name}").router.routes
+
+
+def test_replica_routes_are_flagged_read_only(app):
+    def dependencies(dependant):
+        for dep in dependant.dependencies:
+            yield dep.call
+            yield from dependencies(dep)
+
+    checked = 0
+    for route in api_routes():
+        if {get_read_db, get_async_read_db} & set(dependencies(route.dependant)):
+            assert is_read_only(route), route.path
+            checked += 1
+    assert checked >= 14
@@ -0,0 +1,20 @@
+# tests/test_seed.py
+import random
+from argparse import Namespace
+
+from conftest import auth
+from models.model_users import User
+from scripts.seed import seed
+
+
+def test_seeded_users_are_served(client, db):
+    args = Namespace(
+        users=20, follows_per_user=3, posts_per_user=2, likes_per_post=2, comments_per_post=1,
+        reposts_per_post=0.3, notification_rate=0.5, days=30,
+    )
+    assert seed(db, args, random.Random(1))["users"] == 20
+
+    user = db.query(User).filter(User.firebase_uid.like("seed-%")).order_by(User.id.desc()).first()
+    me = client.get("/users/me", headers=auth(user.firebase_uid))
+    assert me.status_code == 200, me.text
+    assert me.json()["email"] == f"{user.firebase_uid}@example.com"
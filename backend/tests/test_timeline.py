@@ -0,0 +1,31 @@
+# tests/test_timeline.py
+from datetime import datetime, timedelta
+
+from models.model_post import Post
+from utils.timeline import add_timeline_entry, read_home_timeline
+
+
+def test_reposted_post_is_not_repeated_on_later_pages(db, make_user):
+    author, reposter, viewer = make_user("t-author"), make_user("t-reposter"), make_user("t-viewer")
+    base = datetime(2100, 1, 1)  # above everything other tests post
+    posts = [
+        Post(user_id=author, content=f"post {i}", visibility="public", created_at=base + timedelta(hours=i))
+        for i in range(5)
+    ]
+    db.add_all(posts)
+    db.flush()
+    reposted = posts[0]
+    # Delivered when posted, and again (newer) when reposted; it is also in the public source
+    add_timeline_entry(db, viewer, reposted.id, author, reposted.created_at)
+    add_timeline_entry(db, viewer, reposted.id, reposter, base + timedelta(hours=6))
+    db.commit()
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = read_home_timeline(db, viewer, cursor, 2)
+        seen += [post.id for post in page]
+        if cursor is None:
+            break
+
+    assert seen[:5] == [reposted.id] + [post.id for post in reversed(posts[1:])]
+    assert len(seen) == len(set(seen))
@@ -0,0 +1,90 @@
+# utils/activity.py
+from typing import Optional
+
+from sqlalchemy import Integer, insert, literal, select
+from sqlalchemy.orm import Session
+
+from models.model_activity import Activity
+from models.model_comment import Comment
+from models.model_follow import Follow
+from models.model_like import Like
+from models.model_post import Post
+from models.model_repost import Repost
+
+
+def record_activity(
+    db: Session,
+    recipient_id: int,
+    actor_id: int,
+    activity_type: str,
+    post_id: Optional[int] = None,
+    repost_id: Optional[int] = None,
+    comment_id: Optional[int] = None,
+) -> None:
+    """Add an entry to recipient_id's activity stream (caller commits). Own actions are skipped."""
+    if recipient_id == actor_id:
+        return
+    db.add(
+        Activity(
+            recipient_id=recipient_id,
+            actor_id=actor_id,
+            type=activity_type,
+            post_id=post_id,
+            repost_id=repost_id,
+            comment_id=comment_id,
+        )
+    )
+
+
+def remove_activity(
+    db: Session,
+    recipient_id: int,
+    actor_id: int,
+    activity_type: str,
+    post_id: Optional[int] = None,
+    repost_id: Optional[int] = None,
+    comment_id: Optional[int] = None,
+) -> None:
+    """Remove the entry for an action that was undone (unlike, unfollow, comment deleted)."""
+    query = db.query(Activity).filter(
+        Activity.actor_id == actor_id,
+        Activity.recipient_id == recipient_id,
+        Activity.type == activity_type,
+    )
+    if post_id is not None:
+        query = query.filter(Activity.post_id == post_id)
+    if repost_id is not None:
+        query = query.filter(Activity.repost_id == repost_id)
+    if comment_id is not None:
+        query = query.filter(Activity.comment_id == comment_id)
+    query.delete(synchronize_session=False)
+
+
+def rebuild_activity(db: Session) -> None:
+    """Regenerate the whole activity table from likes, follows, comments and reposts."""
+    columns = ["recipient_id", "actor_id", "type", "post_id", "repost_id", "comment_id", "created_at"]
+    none = literal(None, Integer)
+
+    streams = [
+        select(Post.user_id, Like.user_id, literal("like_post"), Like.post_id, none, none, Like.created_at)
+        .join(Post, Post.id == Like.post_id)
+        .where(Post.user_id != Like.user_id),
+        select(Repost.user_id, Like.user_id, literal("like_repost"), none, Like.repost_id, none, Like.created_at)
+        .join(Repost, Repost.id == Like.repost_id)
+        .where(Repost.user_id != Like.user_id),
+        select(Follow.following_id, Follow.follower_id, literal("follow"), none, none, none, Follow.created_at),
+        select(Post.user_id, Comment.user_id, literal("comment"), Comment.post_id, none, Comment.id, Comment.created_at)
+        .join(Post, Post.id == Comment.post_id)
+        .where(Comment.repost_id.is_(None), Post.user_id != Comment.user_id),
+        select(Repost.user_id, Comment.user_id, literal("comment"), Comment.post_id, Comment.repost_id, Comment.id, Comment.created_at)
+        .join(Repost, Repost.id == Comment.repost_id)
+        .where(Repost.user_id != Comment.user_id),
+        select(Post.user_id, Repost.user_id, literal("repost"), Repost.original_post_id, Repost.id, none, Repost.created_at)
+        .join(Post, Post.id == Repost.original_post_id)
+        .where(Post.user_id != Repost.user_id),
+    ]
+
+    db.query(Activity).delete(synchronize_session=False)
+    for stream in streams:
+        db.execute(insert(Activity).from_select(columns, stream))
+    db.commit()
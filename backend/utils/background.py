@@ -0,0 +1,65 @@
+# utils/background.py
+import logging
+import threading
+from datetime import timedelta
+from typing import Callable
+
+from sqlalchemy import func, insert, or_, update
+from sqlalchemy.orm import Session
+
+from models.model_job_run import JobRun
+
+logger = logging.getLogger(__name__)
+
+_jobs: list[tuple[threading.Thread, threading.Event]] = []
+
+
+def start_periodic(name: str, interval_seconds: float, fn: Callable[[], None]) -> None:
+    """
+    Run `fn` every `interval_seconds` on a daemon thread until stop_periodic() is called.
+    Exceptions are logged and the job keeps running on the next tick.
+    """
+    stop = threading.Event()
+
+    def _loop():
+        while not stop.is_set():
+            try:
+                fn()
+            except Exception:
+                logger.exception("Background job %s failed", name)
+            stop.wait(interval_seconds)
+
+    thread = threading.Thread(target=_loop, name=name, daemon=True)
+    _jobs.append((thread, stop))
+    thread.start()
+
+
+def stop_periodic() -> None:
+    """Signal every periodic job to stop."""
+    for _, stop in _jobs:
+        stop.set()
+    _jobs.clear()
+
+
+def claim_run(db: Session, name: str, interval_seconds: float) -> bool:
+    """
+    True for the one worker whose tick first finds `name` not run in the last
+    `interval_seconds` (by the database clock); every other worker skips that tick.
+    The claim is a conditional UPDATE, so it is atomic on MySQL and SQLite alike.
+    """
+    now = db.query(func.now()).scalar()
+    db.execute(
+        insert(JobRun).values(name=name)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite")
+    )
+    claimed = db.execute(
+        update(JobRun)
+        .where(
+            JobRun.name == name,
+            or_(JobRun.last_run_at.is_(None), JobRun.last_run_at <= now - timedelta(seconds=interval_seconds)),
+        )
+        .values(last_run_at=now)
+    ).rowcount == 1
+    db.commit()
+    return claimed
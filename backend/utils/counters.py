@@ -0,0 +1,80 @@
+# utils/counters.py
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models.model_comment import Comment
+from models.model_comment_like import CommentLike
+from models.model_like import Like
+from models.model_media_asset import MediaAsset
+from models.model_post import Post
+from models.model_repost import Repost
+
+
+def adjust_counter(db: Session, model, row_id: int, field: str, delta: int = 1) -> None:
+    """
+    Atomically add `delta` to a denormalized counter column (UPDATE ... SET c = c + delta).
+    Runs in the caller's transaction so the counter commits together with the row it counts.
+    """
+    column = getattr(model, field)
+    db.query(model).filter(model.id == row_id).update(
+        {column: column + delta}, synchronize_session=False
+    )
+
+
+# -------------------------------------------------
+# Reconciliation
+# -------------------------------------------------
+# (model, counter field, count query builder) for every denormalized counter.
+# Each builder returns a query of (row_id, actual_count) for the given ids.
+COUNTERS = [
+    (Post, "likes_count", lambda db, ids: db.query(Like.post_id, func.count(Like.id))
+        .filter(Like.post_id.in_(ids)).group_by(Like.post_id)),
+    (Post, "comments_count", lambda db, ids: db.query(Comment.post_id, func.count(Comment.id))
+        .filter(Comment.post_id.in_(ids)).group_by(Comment.post_id)),
+    (Post, "reposts_count", lambda db, ids: db.query(Repost.original_post_id, func.count(Repost.id))
+        .filter(Repost.original_post_id.in_(ids)).group_by(Repost.original_post_id)),
+    (Repost, "likes_count", lambda db, ids: db.query(Like.repost_id, func.count(Like.id))
+        .filter(Like.repost_id.in_(ids)).group_by(Like.repost_id)),
+    (Repost, "comments_count", lambda db, ids: db.query(Comment.repost_id, func.count(Comment.id))
+        .filter(Comment.repost_id.in_(ids)).group_by(Comment.repost_id)),
+    (Comment, "likes_count", lambda db, ids: db.query(CommentLike.comment_id, func.count(CommentLike.id))
+        .filter(CommentLike.comment_id.in_(ids)).group_by(CommentLike.comment_id)),
+    # Posts removed by a cascade (e.g. deleting a user) never release their asset
+    (MediaAsset, "ref_count", lambda db, ids: db.query(Post.media_asset_id, func.count(Post.id))
+        .filter(Post.media_asset_id.in_(ids)).group_by(Post.media_asset_id)),
+]
+
+
+def reconcile_counters(db: Session, chunk_size: int = 1000) -> int:
+    """
+    Recount every denormalized counter in primary-key chunks and fix rows that drifted.
+    Each chunk is committed on its own so locks stay short. Returns the number of rows fixed.
+    """
+    fixed = 0
+    for model, field, count_query in COUNTERS:
+        column = getattr(model, field)
+        last_id = 0
+        while True:
+            rows = (
+                db.query(model.id, column)
+                .filter(model.id > last_id)
+                .order_by(model.id)
+                .limit(chunk_size)
+                .all()
+            )
+            if not rows:
+                break
+
+            ids = [row_id for row_id, _ in rows]
+            actual = dict(count_query(db, ids).all())
+            for row_id, stored in rows:
+                expected = actual.get(row_id, 0)
+                if stored != expected:
+                    # Only overwrite if no write path touched the row since we read it
+                    fixed += db.query(model).filter(model.id == row_id, column == stored).update(
+                        {column: expected}, synchronize_session=False
+                    )
+            db.commit()
+            last_id = ids[-1]
+
+    return fixed
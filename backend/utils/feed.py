@@ -0,0 +1,112 @@
+# utils/feed.py
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models.model_users import User
+from models.model_post import Post
+from models.model_like import Like
+from models.model_comment import Comment
+from schemas.schema_post import FeedPostResponse, FeedComment, FeedUser
+from utils.images import DEFAULT_VARIANT, pick_variant
+
+RECENT_COMMENTS_PER_POST = 3
+
+
+def _feed_user(user: User) -> FeedUser:
+    return FeedUser(
+        id=user.id,
+        firebase_uid=user.firebase_uid,
+        display_name=user.display_name,
+        avatar_url=user.avatar_url,
+    )
+
+
+def build_feed(
+    db: Session, posts: list[Post], current_user_id: int, image_size: str = DEFAULT_VARIANT
+) -> list[FeedPostResponse]:
+    """
+    Turn a page of posts into FeedPostResponse entries.
+
+    Counts come from the posts' counter columns; like flags, recent comments and
+    authors are each fetched for the whole page at once, so the number of
+    queries does not grow with page size. `image` is the post's `image_size` variant.
+    """
+    if not posts:
+        return []
+
+    post_ids = [p.id for p in posts]
+
+    # Posts on this page the current user has liked
+    liked_ids = {
+        row.post_id
+        for row in db.query(Like.post_id)
+        .filter(Like.user_id == current_user_id, Like.post_id.in_(post_ids))
+        .all()
+    }
+
+    # Most recent comments per post (ranked with a window function)
+    ranked = (
+        db.query(
+            Comment.id,
+            Comment.post_id,
+            Comment.user_id,
+            Comment.content,
+            Comment.created_at,
+            func.row_number()
+            .over(
+                partition_by=Comment.post_id,
+                order_by=(Comment.created_at.desc(), Comment.id.desc()),
+            )
+            .label("rn"),
+        )
+        .filter(Comment.post_id.in_(post_ids))
+        .subquery()
+    )
+    recent_rows = (
+        db.query(ranked)
+        .filter(ranked.c.rn <= RECENT_COMMENTS_PER_POST)
+        .order_by(ranked.c.post_id, ranked.c.rn)
+        .all()
+    )
+
+    # Every author referenced by the page (post authors + commenters)
+    user_ids = {p.user_id for p in posts} | {c.user_id for c in recent_rows}
+    users = {u.id: u for u in db.query(User).filter(User.id.in_(user_ids)).all()}
+
+    recent_comments: dict[int, list[FeedComment]] = {}
+    for c in recent_rows:
+        comment_user = users.get(c.user_id)
+        if not comment_user:
+            continue
+        recent_comments.setdefault(c.post_id, []).append(
+            FeedComment(
+                id=c.id,
+                content=c.content,
+                created_at=c.created_at,
+                user=_feed_user(comment_user),
+            )
+        )
+
+    feed = []
+    for post in posts:
+        author = users.get(post.user_id)
+        if not author:
+            continue
+
+        feed.append(
+            FeedPostResponse(
+                id=post.id,
+                content=post.content,
+                media_url=post.media_url,
+                image=pick_variant(post.media_variants, image_size),
+                visibility=post.visibility,
+                created_at=post.created_at,
+                author=_feed_user(author),
+                likes_count=post.likes_count,
+                comments_count=post.comments_count,
+                liked_by_current_user=post.id in liked_ids,
+                recent_comments=recent_comments.get(post.id, []),
+            )
+        )
+
+    return feed
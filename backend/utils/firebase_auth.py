@@ -1,45 +1,121 @@
 # utils/firebase_auth.py
+import hashlib
+import logging
 import os
-import firebase_admin
-from firebase_admin import credentials, auth
+import threading
+import time
+from dataclasses import dataclass
+
 from fastapi import Depends, Header, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from db.database import get_db
+from db.database import get_async_db, get_db
 from models.model_users import User, StatusEnum, RoleEnum
+from utils.cache import TTLCache
+from utils.pubsub import pubsub
+
+logger = logging.getLogger(__name__)
 
 
 # -------------------------------------------------------------------
-# Firebase Admin Initialization (one-time, supports env + emulator)
+# Firebase Admin Initialization (on first use, supports env + emulator)
 # -------------------------------------------------------------------
-def _init_firebase_if_needed() -> None:
+# firebase_admin is imported lazily too: importing this module must stay cheap
+_firebase_lock = threading.Lock()
+
+
+def init_firebase() -> None:
+    """Initialize the Firebase Admin app once; safe to call from any thread, cheap afterwards."""
+    import firebase_admin
+    from firebase_admin import credentials
+
     if firebase_admin._apps:
         return
+    with _firebase_lock:
+        if firebase_admin._apps:
+            return
+
+        # Emulator support (no credentials required)
+        emulator_host = os.getenv("FIREBASE_AUTH_EMULATOR_HOST")
+        if emulator_host:
+            firebase_admin.initialize_app(options={"projectId": os.getenv("FIREBASE_PROJECT_ID", "demo-project")})
+            return
+
+        # Service account path (prefer explicit env)
+        cred_path = (
+            os.getenv("FIREBASE_CREDENTIALS_JSON")
+            or os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+            or os.getenv("FIREBASE_CRED_PATH")
+        )
+        if not cred_path or not os.path.exists(cred_path):
+            raise RuntimeError(
+                "Firebase credentials not found. "
+                "Set FIREBASE_CREDENTIALS_JSON or GOOGLE_APPLICATION_CREDENTIALS to a valid service account JSON."
+            )
 
-    # Emulator support (no credentials required)
-    emulator_host = os.getenv("FIREBASE_AUTH_EMULATOR_HOST")
-    if emulator_host:
-        firebase_admin.initialize_app(options={"projectId": os.getenv("FIREBASE_PROJECT_ID", "demo-project")})
-        return
+        cred = credentials.Certificate(cred_path)
+        firebase_admin.initialize_app(cred)
 
-    # Service account path (prefer explicit env)
-    cred_path = (
-        os.getenv("FIREBASE_CREDENTIALS_JSON")
-        or os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-        or os.getenv("FIREBASE_CRED_PATH")
-    )
-    if not cred_path or not os.path.exists(cred_path):
-        raise RuntimeError(
-            "Firebase credentials not found. "
-            "Set FIREBASE_CREDENTIALS_JSON or GOOGLE_APPLICATION_CREDENTIALS to a valid service account JSON."
-        )
 
-    cred = credentials.Certificate(cred_path)
-    firebase_admin.initialize_app(cred)
+def _verify_id_token(token: str) -> dict:
+    init_firebase()
+    from firebase_admin import auth
+    return auth.verify_id_token(token)
+
+
+# -------------------------------------------------------------------
+# Process-local caches (verified tokens, current-user identities)
+# -------------------------------------------------------------------
+# Verified payloads are kept until the token's `exp` minus this many seconds
+TOKEN_CACHE_SKEW_SECONDS = int(os.getenv("TOKEN_CACHE_SKEW_SECONDS", "30"))
+TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("TOKEN_CACHE_MAX_ENTRIES", "10000"))
+
+# firebase_uid -> CurrentUser; writes invalidate it explicitly in every worker (see invalidate_current_user)
+IDENTITY_CACHE_TTL_SECONDS = int(os.getenv("IDENTITY_CACHE_TTL_SECONDS", "30"))
+IDENTITY_CACHE_MAX_ENTRIES = int(os.getenv("IDENTITY_CACHE_MAX_ENTRIES", "10000"))
 
 
-_init_firebase_if_needed()
+def _token_key(token: str) -> str:
+    # Raw tokens are never kept in memory longer than the request
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+token_cache = TTLCache(TOKEN_CACHE_MAX_ENTRIES)
+identity_cache = TTLCache(IDENTITY_CACHE_MAX_ENTRIES)
+
+
+# -------------------------------------------------------------------
+# Google public certificate prefetch
+# -------------------------------------------------------------------
+# How often the signing certs are re-fetched in the background. Google serves
+# them with a max-age of several hours, so refreshing well inside that keeps
+# verify_id_token() reading them from the HTTP cache instead of the network.
+CERT_REFRESH_INTERVAL = int(os.getenv("FIREBASE_CERT_REFRESH_INTERVAL_SECONDS", "3600"))
+
+
+def refresh_public_certs() -> None:
+    """
+    Re-fetch the ID token signing certs through firebase_admin's own cached transport,
+    so the copy verify_id_token() reads is always fresh. No-op against the emulator.
+    """
+    if os.getenv("FIREBASE_AUTH_EMULATOR_HOST"):
+        return
+
+    init_firebase()
+    from firebase_admin import _token_gen, auth
+
+    verifier = getattr(auth._get_client(None), "_token_verifier", None)
+    if verifier is None:
+        logger.warning("firebase_admin has no token verifier to warm; skipping cert prefetch")
+        return
+
+    # no-cache skips the stored copy but still stores the fresh response
+    response = verifier.request(_token_gen.ID_TOKEN_CERT_URI, headers={"Cache-Control": "no-cache"})
+    if response.status != 200:
+        raise RuntimeError(f"Fetching Firebase public certs failed with HTTP {response.status}")
 
 
 # -------------------------------------------------------------------
@@ -59,38 +135,92 @@ def _extract_bearer_token(authorization: Optional[str]) -> str:
     return authorization.split(" ", 1)[1].strip()
 
 
-def get_token_payload(authorization: Optional[str] = Header(default=None)):
+async def get_token_payload(authorization: Optional[str] = Header(default=None)):
     """
     Verify 'Authorization: Bearer <Firebase_ID_Token>' and return a normalized payload.
-    Custom claims like 'admin' and 'creator' are included if set.
+    Custom claims like 'admin' and 'creator' are included if set. Cache hits stay on
+    the event loop; verification on a miss runs in the threadpool.
     """
     token = _extract_bearer_token(authorization)
+    cache_key = _token_key(token)
+    cached = token_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+
     try:
-        decoded = auth.verify_id_token(token)
+        decoded = await run_in_threadpool(_verify_id_token, token)
     except Exception:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired Firebase token")
 
     # Normalize the shape your routers expect
-    return {
+    payload = {
         "uid": decoded.get("uid"),
         "email": decoded.get("email"),
         "admin": bool(decoded.get("admin", False)),
         "creator": bool(decoded.get("creator", False)),
     }
 
+    exp = decoded.get("exp")
+    if exp:
+        token_cache.put(cache_key, payload, float(exp) - TOKEN_CACHE_SKEW_SECONDS)
 
-def get_current_user(
-    payload: dict = Depends(get_token_payload),
-    db: Session = Depends(get_db),
-) -> User:
+    return dict(payload)
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """The fields of the logged-in user that request handlers need, cached per firebase_uid."""
+    id: int
+    firebase_uid: str
+    role: RoleEnum
+    status: StatusEnum
+    display_name: Optional[str]
+    avatar_url: Optional[str]
+
+
+def get_cached_identity(db: Session, uid: str) -> Optional[CurrentUser]:
     """
-    Resolve the logged-in User model by firebase_uid (unique), then enforce status.
+    Look up the CurrentUser for a firebase_uid, reading the users table only on a cache miss.
+    Returns None if there is no such user (misses are not cached).
     """
+    identity = identity_cache.get(uid)
+    if identity is not None:
+        return identity
+
+    row = (
+        db.query(User.id, User.firebase_uid, User.role, User.status, User.display_name, User.avatar_url)
+        .filter(User.firebase_uid == uid)
+        .first()
+    )
+    if not row:
+        return None
+
+    identity = CurrentUser(**row._asdict())
+    identity_cache.put(uid, identity, time.time() + IDENTITY_CACHE_TTL_SECONDS)
+    return identity
+
+
+# Carries invalidated firebase_uids to every worker's identity_cache. With the default
+# in-process PUBSUB_BACKEND that is this worker only, and the others catch up within
+# IDENTITY_CACHE_TTL_SECONDS; configure a broker-backed backend to apply changes everywhere at once.
+IDENTITY_INVALIDATION_CHANNEL = "identity-invalidations"
+
+
+def invalidate_current_user(firebase_uid: str) -> None:
+    """Drop a user's cached identity in every worker; call after committing changes to role, status or profile."""
+    identity_cache.invalidate(firebase_uid)
+    pubsub.publish(IDENTITY_INVALIDATION_CHANNEL, {"firebase_uid": firebase_uid})
+
+
+pubsub.listen(IDENTITY_INVALIDATION_CHANNEL, lambda message: identity_cache.invalidate(message["firebase_uid"]))
+
+
+def _resolve_current_user(db: Session, payload: dict) -> CurrentUser:
     uid = payload.get("uid")
     if not uid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload (missing uid)")
 
-    user = db.query(User).filter(User.firebase_uid == uid).first()
+    user = get_cached_identity(db, uid)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found in database")
 
@@ -98,10 +228,29 @@ def get_current_user(
     return user
 
 
+async def get_current_user(
+    payload: dict = Depends(get_token_payload),
+    db: AsyncSession = Depends(get_async_db),
+) -> CurrentUser:
+    """
+    Resolve the logged-in user by firebase_uid (unique), then enforce status.
+    Returns a cached CurrentUser, not the ORM model; load User by id when the full row is needed.
+    """
+    return await db.run_sync(_resolve_current_user, payload)
+
+
+def get_current_user_sync(
+    payload: dict = Depends(get_token_payload),
+    db: Session = Depends(get_db),
+) -> CurrentUser:
+    """get_current_user() for sync routes: a cache miss reads through the route's own get_db session."""
+    return _resolve_current_user(db, payload)
+
+
 # -------------------------------------------------------------------
 # Role/Status enforcement and admin/creator gating
 # -------------------------------------------------------------------
-def _enforce_user_status(user: User) -> None:
+def _enforce_user_status(user: CurrentUser) -> None:
     if user.status == StatusEnum.deleted:
         raise HTTPException(status_code=403, detail="User account is deleted")
     if user.status == StatusEnum.suspended:
@@ -155,6 +304,8 @@ def forbid_admin_on_admin_db(target_user: User, acting_payload: dict) -> None:
 # Optional Firebase helpers used elsewhere
 # -------------------------------------------------------------------
 def set_custom_user_claims(uid: str, claims: dict) -> None:
+    init_firebase()
+    from firebase_admin import auth
     try:
         auth.set_custom_user_claims(uid, claims)
     except Exception as e:
@@ -162,6 +313,8 @@ def set_custom_user_claims(uid: str, claims: dict) -> None:
 
 
 def get_user_record(uid: str):
+    init_firebase()
+    from firebase_admin import auth
     try:
         return auth.get_user(uid)
     except Exception as e:
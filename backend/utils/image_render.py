@@ -0,0 +1,70 @@
+# utils/image_render.py
+# Runs in the image worker processes (see utils/images.py), which import this
+# module by name when they unpickle a task. It imports nothing from the app, so
+# a worker never sets up database engines or Firebase; Pillow is imported on
+# the first render.
+import io
+import os
+from functools import lru_cache
+
+# Longest edge of each variant; images are never upscaled
+VARIANT_SIZES = {"full": 2560, "feed": 1080, "thumb": 320}
+
+MAX_PIXELS = int(os.getenv("IMAGE_MAX_PIXELS", "80000000"))  # decompression-bomb guard
+
+ACCEPTED_FORMATS = {"JPEG", "MPO", "PNG", "WEBP", "GIF", "AVIF", "HEIF"}
+
+# (extension, Pillow format, content type, save options)
+ENCODINGS = [
+    ("webp", "WEBP", "image/webp", {"quality": 80, "method": 4}),
+    ("avif", "AVIF", "image/avif", {"quality": 50, "speed": 6}),
+]
+CONTENT_TYPES = {ext: content_type for ext, _, content_type, _ in ENCODINGS}
+
+
+class UnsupportedImage(ValueError):
+    pass
+
+
+@lru_cache(maxsize=1)
+def _available_encodings() -> list:
+    """ENCODINGS this Pillow build can write (AVIF needs Pillow built with libavif)."""
+    from PIL import Image, features
+    Image.MAX_IMAGE_PIXELS = MAX_PIXELS
+    return [e for e in ENCODINGS if features.check(e[0])]
+
+
+def render_variants(data: bytes) -> dict:
+    """
+    Decode an upload and encode every variant in every format.
+    Returns {variant: {"width", "height", "files": {ext: bytes}}}.
+    Raises UnsupportedImage for non-images and ValueError for corrupt or oversized ones.
+    """
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    encodings = _available_encodings()
+    try:
+        with Image.open(io.BytesIO(data)) as source:
+            if source.format not in ACCEPTED_FORMATS:
+                raise UnsupportedImage(f"Unsupported image format: {source.format}")
+            source.load()  # first frame only for animated images
+            image = ImageOps.exif_transpose(source)
+    except UnidentifiedImageError:
+        raise UnsupportedImage("File is not a recognised image")
+    except (Image.DecompressionBombError, OSError, SyntaxError) as e:
+        raise ValueError(f"Image could not be decoded: {e}")
+
+    has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    # Largest first, each resized from the previous one, so the big decode is only resampled once
+    variants = {}
+    for name, edge in sorted(VARIANT_SIZES.items(), key=lambda item: -item[1]):
+        image.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        files = {}
+        for ext, fmt, _, options in encodings:
+            buffer = io.BytesIO()
+            image.save(buffer, fmt, **options)
+            files[ext] = buffer.getvalue()
+        variants[name] = {"width": image.width, "height": image.height, "files": files}
+    return variants
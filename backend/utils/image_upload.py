@@ -1,16 +1,42 @@
-import firebase_admin
-from firebase_admin import storage
+import os
+from functools import lru_cache
 from uuid import uuid4
 
-# Initialize in firebase_auth.py 
-bucket = storage.bucket()
+from utils.firebase_auth import init_firebase
+
+# Immutable objects (every upload gets a new path), so CDNs and browsers can keep them forever
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@lru_cache(maxsize=1)
+def get_bucket():
+    """Storage bucket, created on first use (google-cloud-storage is only imported then)."""
+    init_firebase()
+    from firebase_admin import storage
+    return storage.bucket(os.getenv("FIREBASE_STORAGE_BUCKET") or None)
+
 
 def upload_image_file(file, folder="posts"):
     """
     Uploads a file-like object to Firebase Storage and returns its public URL.
     """
     unique_filename = f"{folder}/{uuid4()}"
-    blob = bucket.blob(unique_filename)
+    blob = get_bucket().blob(unique_filename)
     blob.upload_from_file(file)
     blob.make_public()
     return blob.public_url
+
+
+def upload_image_bytes(data: bytes, path: str, content_type: str) -> str:
+    """Upload encoded image bytes to `path` and return the public URL."""
+    blob = get_bucket().blob(path)
+    blob.cache_control = CACHE_CONTROL
+    blob.upload_from_string(data, content_type=content_type)
+    blob.make_public()
+    return blob.public_url
+
+
+def delete_images(prefix: str) -> None:
+    """Delete every stored object under a folder."""
+    for blob in get_bucket().list_blobs(prefix=f"{prefix}/"):
+        blob.delete()
@@ -0,0 +1,104 @@
+# utils/images.py
+import asyncio
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Literal, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+
+from utils.image_render import CONTENT_TYPES, UnsupportedImage, render_variants
+from utils.image_upload import upload_image_bytes
+
+DEFAULT_VARIANT = "feed"
+ImageSize = Literal["thumb", "feed", "full"]
+
+MAX_UPLOAD_BYTES = int(os.getenv("IMAGE_MAX_UPLOAD_MB", "20")) * 1024 * 1024
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+# -------------------------------------------------
+# Rendering: render_variants() lives in utils/image_render.py, so the worker
+# processes import only that module and Pillow, not the app
+# -------------------------------------------------
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _pool() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn, not fork: the API process runs background threads
+        _executor = ProcessPoolExecutor(IMAGE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+def shutdown_image_workers() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(cancel_futures=True)
+        _executor = None
+
+
+# -------------------------------------------------
+# Request side
+# -------------------------------------------------
+async def read_image_body(request: Request) -> tuple[bytes, str]:
+    """
+    Read a raw image request body, rejecting it as soon as it passes MAX_UPLOAD_BYTES.
+    Returns the bytes and their SHA-256, hashed chunk by chunk as they arrive.
+    """
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Image is too large")
+
+    chunks, size, digest = [], 0, hashlib.sha256()
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="Image is too large")
+        digest.update(chunk)
+        chunks.append(chunk)
+    if not size:
+        raise HTTPException(status_code=400, detail="Empty upload")
+    return b"".join(chunks), digest.hexdigest()
+
+
+async def process_image(data: bytes, prefix: str) -> dict:
+    """
+    Render variants in the process pool and upload them under `prefix`.
+    Returns {variant: {"width", "height", ext: url, ...}} for Post.media_variants.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        variants = await loop.run_in_executor(_pool(), render_variants, data)
+    except UnsupportedImage as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    uploads = [
+        (name, ext, run_in_threadpool(upload_image_bytes, payload, f"{prefix}/{name}.{ext}", CONTENT_TYPES[ext]))
+        for name, variant in variants.items()
+        for ext, payload in variant["files"].items()
+    ]
+    urls = await asyncio.gather(*(upload for _, _, upload in uploads))
+
+    stored = {name: {"width": v["width"], "height": v["height"]} for name, v in variants.items()}
+    for (name, ext, _), url in zip(uploads, urls):
+        stored[name][ext] = url
+    return stored
+
+
+def pick_variant(media_variants: Optional[dict], size: str) -> Optional[dict]:
+    """The stored variant for `size` as {"url", "avif_url", "width", "height"}, or None."""
+    variant = (media_variants or {}).get(size)
+    if not variant:
+        return None
+    return {
+        "url": variant.get("webp"),
+        "avif_url": variant.get("avif"),
+        "width": variant["width"],
+        "height": variant["height"],
+    }
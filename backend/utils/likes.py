@@ -0,0 +1,110 @@
+# utils/likes.py
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from models.model_comment import Comment
+from models.model_comment_like import CommentLike
+from models.model_like import Like
+from models.model_post import Post
+from models.model_repost import Repost
+from utils.activity import record_activity, remove_activity
+from utils.counters import adjust_counter
+from utils.firebase_auth import CurrentUser
+from utils.notifications import create_notification
+from utils.user_stats import adjust_user_stat
+
+
+@dataclass(frozen=True)
+class LikeTarget:
+    """What can be liked, and what else changes when it is."""
+    model: type
+    like_model: type
+    key: str                      # column on like_model (and notification/activity kwarg)
+    notif_type: str
+    action: str
+    activity_type: Optional[str]  # None = not shown in the activity stream
+    counts_for_author: bool       # adds to the author's likes_received
+
+
+TARGETS = {
+    "post": LikeTarget(Post, Like, "post_id", "like_post", "liked your post", "like_post", True),
+    "repost": LikeTarget(Repost, Like, "repost_id", "like_repost", "liked your repost", "like_repost", True),
+    "comment": LikeTarget(Comment, CommentLike, "comment_id", "like", "liked your comment", None, False),
+}
+
+
+def _insert_ignore(db: Session, model, **values) -> bool:
+    """INSERT that silently skips a duplicate key; True if a row was added."""
+    result = db.execute(
+        insert(model)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite")
+        .values(**values)
+    )
+    return result.rowcount == 1
+
+
+def _apply_like(db: Session, target: LikeTarget, target_id: int, user: CurrentUser, liked: bool):
+    like_model = target.like_model
+    owner = {"user_id": user.id, target.key: target_id}
+    if liked:
+        changed = _insert_ignore(db, like_model, **owner)
+    else:
+        changed = db.execute(
+            delete(like_model).where(*(getattr(like_model, k) == v for k, v in owner.items()))
+        ).rowcount == 1
+
+    delta = 1 if liked else -1
+    if changed:
+        adjust_counter(db, target.model, target_id, "likes_count", delta)
+
+    # The counter UPDATE holds the row lock, so this count is the one being committed
+    row = db.execute(
+        select(target.model.user_id, target.model.likes_count).where(target.model.id == target_id)
+    ).first()
+    if row is None:
+        return None, False
+    author_id, likes_count = row
+
+    if changed:
+        if target.counts_for_author:
+            adjust_user_stat(db, author_id, "likes_received", delta)
+        if target.activity_type and liked:
+            record_activity(db, author_id, user.id, target.activity_type, **{target.key: target_id})
+        elif target.activity_type:
+            remove_activity(db, author_id, user.id, target.activity_type, **{target.key: target_id})
+        if liked:
+            create_notification(
+                db,
+                sender_id=user.id,
+                recipient_id=author_id,
+                notif_type=target.notif_type,
+                actor_name=user.display_name,
+                action=target.action,
+                **{target.key: target_id},
+            )
+    return {"liked": liked, "likes_count": likes_count}, changed
+
+
+def set_like(db: Session, target: LikeTarget, target_id: int, user: CurrentUser, liked: bool) -> Optional[dict]:
+    """
+    Make user's like on a post/repost/comment exist (liked=True) or not (liked=False).
+
+    One INSERT IGNORE or DELETE decides whether anything changed, so repeats and
+    concurrent double-taps are no-ops instead of unique-key errors; the counter,
+    stats, activity and notification follow only when it did. Caller commits,
+    and must roll back (just not commit) when the target doesn't exist.
+    Returns {"liked", "likes_count"}, or None if the target doesn't exist.
+    """
+    return _apply_like(db, target, target_id, user, liked)[0]
+
+
+def toggle_like(db: Session, target: LikeTarget, target_id: int, user: CurrentUser) -> Optional[dict]:
+    """Unlike if liked, otherwise like. Never hits the unique key, but concurrent toggles still cancel out."""
+    result, removed = _apply_like(db, target, target_id, user, liked=False)
+    if result is None or removed:
+        return result
+    return set_like(db, target, target_id, user, liked=True)
@@ -0,0 +1,100 @@
+# utils/media_assets.py
+import logging
+import os
+from datetime import timedelta
+from typing import Optional
+from uuid import uuid4
+
+from sqlalchemy import func, insert, or_
+from sqlalchemy.orm import Session
+
+from models.model_media_asset import MediaAsset
+from models.model_post import Post
+from utils.image_upload import delete_images
+
+logger = logging.getLogger(__name__)
+
+# Unreferenced assets are kept this long, so deleting and re-posting an image is free
+PURGE_GRACE = timedelta(seconds=int(os.getenv("MEDIA_PURGE_GRACE_SECONDS", "86400")))
+
+
+def new_asset_prefix(sha256: str) -> str:
+    """
+    Storage folder for a new asset's variants. Unique per upload, so purging an
+    asset can never delete objects that a re-upload of the same bytes just wrote.
+    """
+    return f"media/{sha256[:2]}/{sha256}/{uuid4().hex[:12]}"
+
+
+def reference_asset(db: Session, sha256: str) -> Optional[MediaAsset]:
+    """Take a reference on an existing asset with these bytes (caller commits); None if there isn't one."""
+    updated = db.query(MediaAsset).filter(MediaAsset.sha256 == sha256).update(
+        {MediaAsset.ref_count: MediaAsset.ref_count + 1, MediaAsset.released_at: None},
+        synchronize_session=False,
+    )
+    if not updated:
+        return None
+    return db.query(MediaAsset).filter(MediaAsset.sha256 == sha256).one()
+
+
+def register_asset(db: Session, sha256: str, size_bytes: int, storage_prefix: str, variants: dict) -> MediaAsset:
+    """
+    Record a freshly uploaded asset and take a reference on it (caller commits).
+    If a concurrent upload of the same bytes registered first, that asset is
+    returned instead and the caller should delete what it stored under `storage_prefix`.
+    """
+    db.execute(
+        insert(MediaAsset)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite")
+        .values(sha256=sha256, size_bytes=size_bytes, storage_prefix=storage_prefix, variants=variants, ref_count=0)
+    )
+    return reference_asset(db, sha256)
+
+
+def release_asset(db: Session, asset_id: Optional[int]) -> None:
+    """Drop one reference, e.g. when a post is deleted or its image replaced (caller commits)."""
+    if asset_id is None:
+        return
+    db.query(MediaAsset).filter(MediaAsset.id == asset_id).update(
+        {MediaAsset.ref_count: MediaAsset.ref_count - 1, MediaAsset.released_at: func.now()},
+        synchronize_session=False,
+    )
+
+
+def purge_released_assets(db: Session, batch_size: int = 100) -> int:
+    """
+    Delete assets nothing has referenced for PURGE_GRACE, then their stored objects.
+    Each row is deleted only if still unreferenced, so a concurrent re-upload keeps it.
+    Returns the number of assets purged.
+    """
+    cutoff = db.query(func.now()).scalar().replace(tzinfo=None) - PURGE_GRACE
+    candidates = (
+        db.query(MediaAsset.id, MediaAsset.storage_prefix)
+        .filter(
+            MediaAsset.ref_count <= 0,
+            or_(
+                MediaAsset.released_at < cutoff,
+                MediaAsset.released_at.is_(None) & (MediaAsset.created_at < cutoff),
+            ),
+        )
+        .limit(batch_size)
+        .all()
+    )
+
+    purged = 0
+    for asset_id, storage_prefix in candidates:
+        deleted = db.query(MediaAsset).filter(
+            MediaAsset.id == asset_id,
+            MediaAsset.ref_count <= 0,
+            ~db.query(Post.id).filter(Post.media_asset_id == asset_id).exists(),
+        ).delete(synchronize_session=False)
+        db.commit()
+        if not deleted:
+            continue
+        try:
+            delete_images(storage_prefix)
+        except Exception:
+            logger.exception("Could not delete stored objects under %s", storage_prefix)
+        purged += 1
+    return purged
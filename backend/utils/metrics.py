@@ -0,0 +1,182 @@
+# utils/metrics.py
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+
+from db.query_metrics import current_stats, start_request
+
+logger = logging.getLogger(__name__)
+
+# Requests that run more statements than this are logged (likely N+1); 0 disables
+QUERY_COUNT_WARN_THRESHOLD = int(os.getenv("QUERY_COUNT_WARN_THRESHOLD", "50"))
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+
+# -------------------------------------------------
+# Histograms (Prometheus text format, no client library needed)
+# -------------------------------------------------
+class Histogram:
+    """Cumulative-bucket histogram per label set, rendered in the Prometheus text format."""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple, label_names: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.label_names = label_names
+        self._series: dict[tuple, list] = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 2)
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):  # larger values only count towards +Inf
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: list(values) for labels, values in self._series.items()}
+        for labels, values in sorted(series.items()):
+            label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets, values):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {values[-1]}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {values[-2]}")
+            lines.append(f"{self.name}_count{{{label_text}}} {values[-1]}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+LABELS = ("method", "route", "status")
+
+request_seconds = Histogram(
+    "artbook_request_duration_seconds", "Time from request received to response ready.", SECONDS_BUCKETS, LABELS
+)
+db_seconds = Histogram(
+    "artbook_request_db_seconds", "Time spent executing SQL statements per request.", SECONDS_BUCKETS, LABELS
+)
+query_count = Histogram(
+    "artbook_request_queries", "SQL statements executed per request.", QUERY_BUCKETS, LABELS
+)
+serialize_seconds = Histogram(
+    "artbook_request_serialization_seconds", "Time spent validating and serializing the response model.",
+    SECONDS_BUCKETS, LABELS,
+)
+HISTOGRAMS = [request_seconds, db_seconds, query_count, serialize_seconds]
+
+
+def render_metrics() -> str:
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
+
+
+# -------------------------------------------------
+# Response serialization timing
+# -------------------------------------------------
+class TimedRoute(APIRoute):
+    """
+    APIRoute that records the time from the endpoint returning to the response
+    being ready: response-model validation, serialization and rendering. Set it
+    as each APIRouter's route_class.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _mark_endpoint_done(endpoint), **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request):
+            response = await handler(request)
+            stats = current_stats()
+            if stats is not None and stats.endpoint_done is not None:
+                stats.record_serialization(time.perf_counter() - stats.endpoint_done)
+            return response
+
+        return timed_handler
+
+
+def _mark_endpoint_done(endpoint):
+    # functools.wraps keeps the signature FastAPI reads parameters and dependencies from
+    def mark():
+        stats = current_stats()
+        if stats is not None:
+            stats.endpoint_done = time.perf_counter()
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def timed_endpoint(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                mark()
+    else:
+        @functools.wraps(endpoint)
+        def timed_endpoint(*args, **kwargs):
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                mark()
+    return timed_endpoint
+
+
+# -------------------------------------------------
+# Middleware
+# -------------------------------------------------
+def _route_template(request: Request) -> str:
+    # The matched route's path ("/posts/{post_id}") keeps label cardinality bounded
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+async def record_request_metrics(request: Request, call_next):
+    """
+    HTTP middleware: count SQL statements and DB time for the request, report them with
+    total and serialization time in a Server-Timing header, and feed the /metrics histograms.
+    Work done while a streaming response is being sent is not included.
+    """
+    stats = start_request()
+    started = time.perf_counter()
+    response = await call_next(request)
+    total = time.perf_counter() - started
+
+    response.headers["Server-Timing"] = (
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+        f"serialize;dur={stats.serialize_seconds * 1000:.1f}, "
+        f"total;dur={total * 1000:.1f}"
+    )
+
+    route = _route_template(request)
+    labels = (request.method, route, f"{response.status_code // 100}xx")
+    request_seconds.observe(labels, total)
+    db_seconds.observe(labels, stats.db_seconds)
+    query_count.observe(labels, stats.queries)
+    serialize_seconds.observe(labels, stats.serialize_seconds)
+
+    if QUERY_COUNT_WARN_THRESHOLD and stats.queries > QUERY_COUNT_WARN_THRESHOLD:
+        logger.warning(
+            "%s %s ran %d SQL statements (%.1f ms in the database)",
+            request.method, route, stats.queries, stats.db_seconds * 1000,
+        )
+    return response
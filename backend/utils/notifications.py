@@ -1,34 +1,204 @@
 # utils/notifications.py
+import logging
+import os
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from models.model_notification_actor import NotificationActor
+from models.model_notification_outbox import NotificationOutbox
 from models.model_notifications import Notification
+from schemas.schema_notifications import NotificationResponse
+from utils.pubsub import pubsub
+
+logger = logging.getLogger(__name__)
+
+# Unread notifications of the same kind for the same target are merged within this window
+COALESCE_WINDOW = timedelta(seconds=int(os.getenv("NOTIFICATION_COALESCE_SECONDS", "3600")))
+BATCH_SIZE = int(os.getenv("NOTIFICATION_BATCH_SIZE", "500"))
+
 
 def create_notification(
-    db,
+    db: Session,
     sender_id: int,
     recipient_id: int,
     notif_type: str,
-    message: str,
+    action: str,
+    actor_name: Optional[str] = None,
     post_id: int = None,
     comment_id: int = None,
     repost_id: int = None,
-):
+) -> None:
     """
-    Generic reusable notification creator.
-    Use this helper in any router to create notifications.
+    Queue a notification in the caller's transaction (caller commits).
+    `action` is the text after the actor's name, e.g. "liked your post".
+    The outbox worker turns it into a Notification, merging bursts.
     """
     # Don't notify yourself
     if sender_id == recipient_id:
         return
 
-    notif = Notification(
-        sender_id=sender_id,
-        recipient_id=recipient_id,
-        type=notif_type,
-        post_id=post_id,
-        comment_id=comment_id,
-        repost_id=repost_id,
-        message=message,
+    db.add(
+        NotificationOutbox(
+            sender_id=sender_id,
+            recipient_id=recipient_id,
+            type=notif_type,
+            post_id=post_id,
+            comment_id=comment_id,
+            repost_id=repost_id,
+            actor_name=actor_name,
+            action=action,
+        )
     )
-    db.add(notif)
-    db.commit()
-    db.refresh(notif)
-    return notif
+
+
+def _message(actor_name: Optional[str], action: str, actor_count: int) -> str:
+    name = actor_name or "Someone"
+    if actor_count <= 1:
+        return f"{name} {action}"
+    others = actor_count - 1
+    return f"{name} and {others} {'other' if others == 1 else 'others'} {action}"
+
+
+def notification_channel(user_id: int) -> str:
+    """Pub/sub channel that carries a user's new and updated notifications."""
+    return f"notifications:{user_id}"
+
+
+def _publish(notifications: list[Notification]) -> None:
+    for n in notifications:
+        payload = NotificationResponse.model_validate(n).model_dump(mode="json")
+        pubsub.publish(notification_channel(n.recipient_id), payload)
+
+
+def _group_key(row) -> tuple:
+    return (row.recipient_id, row.type, row.post_id, row.comment_id, row.repost_id, row.action)
+
+
+# -------------------------------------------------
+# Outbox worker
+# -------------------------------------------------
+def _apply(db: Session, events: list[NotificationOutbox]) -> list[Notification]:
+    """
+    Turn outbox events into notifications, merging each group into a recent unread one.
+    A sender already recorded in notification_actors is not counted again.
+    Returns the notifications created or updated (not yet committed).
+    """
+    groups: dict[tuple, list[NotificationOutbox]] = {}
+    for event in events:
+        groups.setdefault(_group_key(event), []).append(event)
+
+    # Use the database clock so the window matches the server-side created_at defaults
+    since = db.query(func.now()).scalar().replace(tzinfo=None) - COALESCE_WINDOW
+    recent = {}
+    for n in (
+        db.query(Notification)
+        .filter(
+            Notification.recipient_id.in_({key[0] for key in groups}),
+            Notification.is_read == False,
+            Notification.created_at >= since,
+        )
+        .order_by(Notification.created_at)
+        .with_for_update()  # another worker may be merging into the same notification
+        .all()
+    ):
+        recent[_group_key(n)] = n  # newest wins
+
+    # Senders already counted in the notifications being merged into
+    seen: dict[int, set[int]] = {}
+    merged_ids = [recent[key].id for key in groups if key in recent]
+    if merged_ids:
+        for notification_id, sender_id in db.query(
+            NotificationActor.notification_id, NotificationActor.sender_id
+        ).filter(NotificationActor.notification_id.in_(merged_ids)):
+            seen.setdefault(notification_id, set()).add(sender_id)
+
+    new, touched, actors = [], [], []
+    for key, group in groups.items():
+        latest = group[-1]
+        senders = {e.sender_id for e in group}
+        existing = recent.get(key)
+        if existing:
+            unseen = senders - seen.get(existing.id, set())
+            existing.actor_count += len(unseen)
+            existing.sender_id = latest.sender_id
+            existing.message = _message(latest.actor_name, latest.action, existing.actor_count)
+            existing.created_at = latest.created_at
+            touched.append(existing)
+            actors += [(existing, sender) for sender in unseen]
+        else:
+            notification = Notification(
+                recipient_id=latest.recipient_id,
+                sender_id=latest.sender_id,
+                type=latest.type,
+                post_id=latest.post_id,
+                comment_id=latest.comment_id,
+                repost_id=latest.repost_id,
+                action=latest.action,
+                actor_count=len(senders),
+                message=_message(latest.actor_name, latest.action, len(senders)),
+                created_at=latest.created_at,
+            )
+            new.append(notification)
+            actors += [(notification, sender) for sender in senders]
+    db.add_all(new)
+    db.flush()  # ids for the new notifications' actor rows
+    if actors:
+        db.execute(
+            insert(NotificationActor),
+            [{"notification_id": n.id, "sender_id": sender} for n, sender in actors],
+        )
+
+    db.query(NotificationOutbox).filter(
+        NotificationOutbox.id.in_([e.id for e in events])
+    ).delete(synchronize_session=False)
+    return touched + new
+
+
+def drain_notification_outbox(db: Session, batch_size: int = BATCH_SIZE) -> int:
+    """
+    Deliver queued notifications in batches until the outbox is empty; returns how many were processed.
+
+    Each batch's notifications are written and its outbox rows deleted in one
+    transaction, so a failed batch is simply retried on the next run and never
+    delivered twice. Rows are claimed with SKIP LOCKED so several workers can drain
+    concurrently. A batch that keeps failing is retried one row at a time, and a
+    row that fails on its own is logged and dropped. Committed notifications are
+    published on their recipient's notification_channel() for streaming clients.
+    """
+    processed = 0
+    while True:
+        events = (
+            db.query(NotificationOutbox)
+            .order_by(NotificationOutbox.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not events:
+            return processed
+
+        try:
+            delivered = _apply(db, events)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Notification batch failed; retrying row by row")
+            delivered = []
+            for event_id in [e.id for e in events]:
+                event = db.get(NotificationOutbox, event_id)
+                if event is None:
+                    continue
+                try:
+                    applied = _apply(db, [event])
+                    db.commit()
+                    delivered += applied
+                except Exception:
+                    db.rollback()
+                    logger.exception("Dropping undeliverable notification event %s", event_id)
+                    db.query(NotificationOutbox).filter(NotificationOutbox.id == event_id).delete()
+                    db.commit()
+        _publish(delivered)
+        processed += len(events)
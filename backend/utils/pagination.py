@@ -0,0 +1,91 @@
+# utils/pagination.py
+import base64
+import binascii
+from datetime import datetime
+from typing import Callable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Pack a (created_at, id) position into an opaque, URL-safe string."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Unpack a cursor produced by encode_cursor(). Raises 400 if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_cursor(query, created_col, id_col, cursor: Optional[str]):
+    """Order a query newest first and keep only rows strictly after the cursor position."""
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(
+            or_(
+                created_col < created_at,
+                and_(created_col == created_at, id_col < row_id),
+            )
+        )
+    return query.order_by(created_col.desc(), id_col.desc())
+
+
+def paginate(
+    query,
+    created_col,
+    id_col,
+    cursor: Optional[str],
+    limit: int,
+    key: Optional[Callable] = None,
+):
+    """
+    Apply keyset pagination to a query, newest first.
+
+    Rows are ordered by (created_col DESC, id_col DESC) and only rows strictly
+    after the cursor position are returned, so with a matching composite index
+    every page is an index range scan. `key` extracts (created_at, id) from a
+    result row and defaults to the row's own `created_at` / `id` attributes.
+
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    rows = apply_cursor(query, created_col, id_col, cursor).limit(limit + 1).all()
+    return _page(rows, limit, key)
+
+
+async def paginate_async(
+    db: AsyncSession,
+    stmt,
+    created_col,
+    id_col,
+    cursor: Optional[str],
+    limit: int,
+):
+    """
+    paginate() for a select() of a single ORM entity, run on an AsyncSession.
+    Returns (items, next_cursor).
+    """
+    result = await db.execute(apply_cursor(stmt, created_col, id_col, cursor).limit(limit + 1))
+    return _page(result.scalars().all(), limit)
+
+
+def _page(rows: list, limit: int, key: Optional[Callable] = None):
+    """Trim the extra lookahead row and build the cursor for the next page."""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        created_at, row_id = key(last) if key else (last.created_at, last.id)
+        next_cursor = encode_cursor(created_at, row_id)
+
+    return rows, next_cursor
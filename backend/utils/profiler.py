@@ -0,0 +1,282 @@
+# utils/profiler.py
+import asyncio
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from typing import Optional
+
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from utils.firebase_auth import get_token_payload, require_admin
+
+logger = logging.getLogger(__name__)
+
+# Admins get a profile of a single request by sending this header (or ?profile=1)
+PROFILE_HEADER = "x-profile"
+PROFILE_FLAG_VALUES = {"1", "true"}
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+# Also profile 1 in N ordinary requests (0 = only on request)
+PROFILE_SAMPLE_EVERY_N = int(os.getenv("PROFILE_SAMPLE_EVERY_N", "0"))
+# Most recent profiles kept in memory (on-demand and sampled share the buffer)
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "50"))
+
+_BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# -------------------------------------------------
+# Sampling
+# -------------------------------------------------
+class Profile:
+    """Wall-clock stack samples of one request's asyncio task, and of any worker thread it waits on."""
+
+    def __init__(self, task: asyncio.Task, loop_thread: int, meta: dict):
+        self.id = uuid.uuid4().hex[:12]
+        self.task = task
+        self.loop = task.get_loop()
+        self.loop_thread = loop_thread
+        self.meta = meta
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+
+    def take_sample(self, frames: dict) -> None:
+        # With an explicit loop, current_task() may be asked from another thread; a
+        # stale answer only misattributes this one sample
+        running = asyncio.current_task(self.loop) is self.task
+        if running:
+            stack = _thread_stack(frames.get(self.loop_thread))
+            if _MIDDLEWARE_CODE not in stack:
+                # Inside a greenlet (AsyncSession.run_sync): the thread only shows the greenlet's frames
+                stack = _await_stack(self.task) + stack
+        else:
+            # Suspended: where it is awaiting, plus the worker thread's stack if it is in the threadpool
+            stack = _await_stack(self.task)
+            worker = _worker_thread(self.task)
+            in_thread = _thread_stack(frames.get(worker)) if worker else []
+            # A worker still blocked on its queue hasn't picked the call up yet
+            busy = in_thread and not in_thread[0].co_filename.endswith("queue.py")
+            stack += in_thread if busy else [_WAITING]
+        if _MIDDLEWARE_CODE in stack:
+            stack = stack[stack.index(_MIDDLEWARE_CODE) + 1:]
+        if stack:
+            self.stacks[";".join(_label(code) for code in stack)] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed-stack format (flamegraph.pl, speedscope, inferno)."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+    def summary(self) -> dict:
+        return {"id": self.id, **self.meta, "duration_ms": self.duration_ms, "samples": self.samples}
+
+
+_WAITING = "[waiting]"  # suspended on I/O, a lock or a timer
+
+
+def _label(code) -> str:
+    if isinstance(code, str):
+        return code
+    path = os.path.relpath(code.co_filename, _BACKEND_ROOT)
+    if path.startswith(".."):
+        path = "/".join(code.co_filename.split(os.sep)[-2:])  # library: keep it short
+    name = getattr(code, "co_qualname", code.co_name)  # co_qualname is Python 3.11+
+    return f"{name} ({path}:{code.co_firstlineno})"
+
+
+# -------------------------------------------------
+# Library internals the attribution relies on
+# -------------------------------------------------
+# A suspended request is followed into the code it waits on through one local variable
+# of each of these library functions: (function name, local holding the greenlet / thread).
+# check_internals() verifies them against the installed versions; it runs in
+# tests/test_profiler.py and when the sampler starts. If one no longer holds, that part
+# of the stack is simply missing and the time shows as [waiting].
+GREENLET_SPAWN = ("greenlet_spawn", "context")  # sqlalchemy.util.greenlet_spawn, behind AsyncSession.run_sync()
+WORKER_THREAD = ("run_sync_in_worker_thread", "worker")  # anyio, behind run_in_threadpool() and sync routes
+
+
+def check_internals() -> list[str]:
+    """The assumptions above that the installed SQLAlchemy and anyio no longer meet."""
+    try:
+        from anyio._backends._asyncio import AsyncIOBackend
+        from sqlalchemy.util import greenlet_spawn
+        functions = [(GREENLET_SPAWN, greenlet_spawn), (WORKER_THREAD, AsyncIOBackend.run_sync_in_worker_thread)]
+    except (ImportError, AttributeError) as e:
+        return [f"cannot locate {e}"]
+    problems = []
+    for (name, local), function in functions:
+        code = function.__code__
+        if code.co_name != name or local not in code.co_varnames:
+            problems.append(f"{function.__module__}.{name} has no local {local!r}")
+    return problems
+
+
+def _thread_stack(frame) -> list:
+    """Root-first code objects of a thread's stack, below the event loop or worker-thread machinery."""
+    stack = []
+    while frame is not None:
+        stack.append(frame.f_code)
+        frame = frame.f_back
+    stack.reverse()
+    for i in range(len(stack) - 1, -1, -1):
+        if stack[i].co_name in ("_run", "run") and stack[i].co_filename.endswith(("events.py", "_asyncio.py")):
+            return stack[i + 1:]
+    return stack
+
+
+def _coroutine_chain(task: asyncio.Task):
+    coro = task.get_coro()
+    while coro is not None:
+        yield coro
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+
+
+def _await_stack(task: asyncio.Task) -> list:
+    """Root-first code objects of the task's suspended coroutines, including SQLAlchemy greenlets."""
+    stack = []
+    for coro in _coroutine_chain(task):
+        frame = getattr(coro, "cr_frame", None)
+        if frame is None:
+            continue
+        stack.append(frame.f_code)
+        if frame.f_code.co_name == GREENLET_SPAWN[0]:
+            # The sync ORM code it runs sits in a suspended greenlet while the driver awaits
+            greenlet = frame.f_locals.get(GREENLET_SPAWN[1])
+            stack += _thread_stack(getattr(greenlet, "gr_frame", None))
+    return stack
+
+
+def _worker_thread(task: asyncio.Task) -> Optional[int]:
+    """Ident of the anyio worker thread the task is waiting on (run_in_threadpool), if any."""
+    for coro in _coroutine_chain(task):
+        frame = getattr(coro, "cr_frame", None)
+        if frame is not None and frame.f_code.co_name == WORKER_THREAD[0]:
+            return getattr(frame.f_locals.get(WORKER_THREAD[1]), "ident", None)
+    return None
+
+
+class _Sampler:
+    """One daemon thread that samples every active profile, idle when there are none."""
+
+    def __init__(self):
+        self._active: set[Profile] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, profile: Profile) -> None:
+        with self._lock:
+            self._active.add(profile)
+            if self._thread is None:
+                for problem in check_internals():
+                    logger.warning("Profiles will miss some awaited stacks: %s", problem)
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def stop(self, profile: Profile) -> None:
+        with self._lock:
+            self._active.discard(profile)
+        profile.task = None  # don't keep the finished request alive in the buffer
+        profile.duration_ms = round((time.perf_counter() - profile.started) * 1000, 1)
+
+    def _run(self) -> None:
+        interval = PROFILE_INTERVAL_MS / 1000
+        while True:
+            with self._lock:
+                active = list(self._active)
+                if not active:
+                    self._wake.clear()
+            if not active:
+                self._wake.wait()
+                continue
+            frames = sys._current_frames()
+            for profile in active:
+                try:
+                    profile.take_sample(frames)
+                except Exception:
+                    # Frames change under us while the request runs; a bad sample is just skipped
+                    pass
+            del frames
+            time.sleep(interval)
+
+
+_sampler = _Sampler()
+profiles: deque = deque(maxlen=PROFILE_BUFFER_SIZE)
+_request_counter = itertools.count(1)
+
+
+def find_profile(profile_id: str) -> Optional[Profile]:
+    return next((p for p in list(profiles) if p.id == profile_id), None)
+
+
+# -------------------------------------------------
+# Middleware
+# -------------------------------------------------
+class ProfilerMiddleware:
+    """
+    ASGI middleware: profile a request when an admin asks for it (X-Profile: 1 header or
+    ?profile=1), or 1 in PROFILE_SAMPLE_EVERY_N requests. The flag is ignored for anyone
+    else, whose request is served as usual. The profile is kept in the ring buffer and its
+    id returned in X-Profile-Id; fetch it from /internal/profiles/{id}.
+    Add it innermost, so the request's handler runs in the task it samples.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request = Request(scope)
+        source = None
+        flag = request.headers.get(PROFILE_HEADER) or request.query_params.get("profile") or ""
+        if flag.strip().lower() in PROFILE_FLAG_VALUES:
+            admin_uid = await _admin_uid(request)
+            if admin_uid is not None:
+                source = f"admin:{admin_uid}"
+        if source is None and PROFILE_SAMPLE_EVERY_N and next(_request_counter) % PROFILE_SAMPLE_EVERY_N == 0:
+            source = "sampled"
+        if source is None:
+            return await self.app(scope, receive, send)
+
+        meta = {
+            "method": scope["method"], "path": scope["path"], "source": source,
+            "started_at": time.time(), "interval_ms": PROFILE_INTERVAL_MS,
+        }
+        profile = Profile(asyncio.current_task(), threading.get_ident(), meta)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                meta["status"] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile.id.encode())]
+            await send(message)
+
+        _sampler.start(profile)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _sampler.stop(profile)
+            meta["route"] = getattr(scope.get("route"), "path", None)
+            profiles.append(profile)
+
+
+async def _admin_uid(request: Request) -> Optional[str]:
+    """The caller's uid if they are an admin, else None (the route still does its own auth)."""
+    try:
+        payload = await get_token_payload(request.headers.get("authorization"))
+        require_admin(payload)
+    except HTTPException:
+        return None
+    return payload.get("uid")
+
+
+_MIDDLEWARE_CODE = ProfilerMiddleware.__call__.__code__
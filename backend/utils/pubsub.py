@@ -0,0 +1,94 @@
+# utils/pubsub.py
+import asyncio
+import importlib
+import os
+import threading
+from typing import Callable, Optional
+
+# Messages buffered per subscriber; a slow client that falls further behind loses the
+# oldest ones and catches up from the database when it reconnects.
+SUBSCRIBER_BUFFER = int(os.getenv("PUBSUB_SUBSCRIBER_BUFFER", "100"))
+
+
+class Subscription:
+    """One listener's queue, bound to the event loop it subscribed from."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_BUFFER)
+
+    def _put(self, message) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+        self._queue.put_nowait(message)
+
+    def deliver(self, message) -> None:
+        """Thread-safe: hand a message to the subscriber's loop."""
+        try:
+            self._loop.call_soon_threadsafe(self._put, message)
+        except RuntimeError:
+            pass  # loop already closed (shutting down)
+
+    async def get(self, timeout: float):
+        """Next message, or None if nothing arrives within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class PubSub:
+    """
+    In-process pub/sub. publish() fans out to this process's subscribers only.
+
+    For several workers, subclass it: override publish() to send to a shared broker,
+    and have a listener thread call deliver() for every message received from it.
+    Select the subclass with PUBSUB_BACKEND="package.module:ClassName".
+    """
+
+    def __init__(self):
+        self._channels: dict[str, set[Subscription]] = {}
+        self._listeners: dict[str, list[Callable]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel: str, message) -> None:
+        self.deliver(channel, message)
+
+    def deliver(self, channel: str, message) -> None:
+        with self._lock:
+            subscribers = list(self._channels.get(channel, ()))
+            listeners = list(self._listeners.get(channel, ()))
+        for callback in listeners:
+            callback(message)
+        for subscription in subscribers:
+            subscription.deliver(message)
+
+    def subscribe(self, channel: str) -> Subscription:
+        """Start listening on a channel; call from async code."""
+        subscription = Subscription(asyncio.get_running_loop())
+        with self._lock:
+            self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def listen(self, channel: str, callback: Callable) -> None:
+        """Call `callback(message)` for every message on a channel, on the delivering thread; keep it quick."""
+        with self._lock:
+            self._listeners.setdefault(channel, []).append(callback)
+
+    def unsubscribe(self, channel: str, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._channels.get(channel)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._channels[channel]
+
+
+def _load_backend(path: Optional[str]) -> PubSub:
+    if not path:
+        return PubSub()
+    module_name, _, class_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+pubsub = _load_backend(os.getenv("PUBSUB_BACKEND"))
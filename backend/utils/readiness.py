@@ -0,0 +1,79 @@
+# utils/readiness.py
+import asyncio
+import inspect
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Optional, Union
+
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# Failed required warm-ups are retried this often until they succeed
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "5"))
+
+
+class Dependency:
+    """Something the API needs warmed up (a connection made, a client created) before it is ready."""
+
+    def __init__(self, name: str, warm: Callable[[], Union[None, Awaitable[None]]], required: bool):
+        self.name = name
+        self.warm = warm
+        self.required = required
+        self.ready = False
+        self.error: Optional[str] = None
+        self.warm_ms: Optional[float] = None
+        self.attempts = 0
+
+    async def try_warm(self) -> bool:
+        self.attempts += 1
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(self.warm):
+                await self.warm()
+            else:
+                await run_in_threadpool(self.warm)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            logger.warning("Warm-up of %s failed (attempt %d): %s", self.name, self.attempts, self.error)
+            return False
+        self.ready, self.error = True, None
+        self.warm_ms = round((time.perf_counter() - started) * 1000, 1)
+        return True
+
+    def report(self) -> dict:
+        return {
+            "ready": self.ready,
+            "required": self.required,
+            "warm_ms": self.warm_ms,
+            "attempts": self.attempts,
+            "error": self.error,
+        }
+
+
+dependencies: list[Dependency] = []
+
+
+def register(name: str, warm, required: bool = True) -> None:
+    """Add a dependency to warm at startup. Optional ones show in the report but don't gate readiness."""
+    dependencies.append(Dependency(name, warm, required))
+
+
+async def warm_up() -> None:
+    """
+    Warm every dependency concurrently, then keep retrying the required ones that failed.
+    Optional failures are reported once and left alone. Run as a background task.
+    """
+    waiting = list(dependencies)
+    while waiting:
+        results = await asyncio.gather(*(d.try_warm() for d in waiting))
+        waiting = [d for d, ok in zip(waiting, results) if not ok and d.required]
+        if waiting:
+            await asyncio.sleep(WARMUP_RETRY_SECONDS)
+
+
+def readiness() -> tuple[bool, dict]:
+    """(ready, per-dependency report); ready once every required dependency is warm."""
+    ready = all(d.ready for d in dependencies if d.required)
+    return ready, {d.name: d.report() for d in dependencies}
@@ -0,0 +1,229 @@
+# utils/recommendations.py
+import os
+import random
+import time
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session, aliased
+
+from db.database import SessionLocal
+from models.model_follow import Follow
+from models.model_like import Like
+from models.model_user_recommendation import UserRecommendation
+from models.model_users import User
+from utils.cache import TTLCache
+
+# Candidates stored per user, and how many GET /home/recommended returns
+MAX_RECOMMENDATIONS = int(os.getenv("RECOMMENDATIONS_PER_USER", "50"))
+RECOMMENDATIONS_SHOWN = 10
+# A user's list is recomputed from scratch at most once per this many seconds (per process)
+REFRESH_COOLDOWN_SECONDS = int(os.getenv("RECOMMENDATIONS_REFRESH_COOLDOWN_SECONDS", "300"))
+
+# Bound the graph walk: only the user's most recent follows / likes seed candidates
+SEED_FOLLOWS = 200
+SEED_LIKES = 100
+
+FOF_WEIGHT = 1.0
+COLIKE_WEIGHT = 0.5
+
+
+def _friends_of_friends(db: Session, user_id: int) -> dict[int, int]:
+    """Accounts followed by the people user_id follows, with how many of them follow each."""
+    seeds = (
+        db.query(Follow.following_id)
+        .filter(Follow.follower_id == user_id)
+        .order_by(Follow.created_at.desc())
+        .limit(SEED_FOLLOWS)
+        .subquery()
+    )
+    second = aliased(Follow)
+    return dict(
+        db.query(second.following_id, func.count())
+        .join(seeds, second.follower_id == seeds.c.following_id)
+        .group_by(second.following_id)
+        .all()
+    )
+
+
+def _co_likers(db: Session, user_id: int) -> dict[int, int]:
+    """Other users who liked the same posts as user_id, with how many likes overlap."""
+    seeds = (
+        db.query(Like.post_id)
+        .filter(Like.user_id == user_id, Like.post_id.isnot(None))
+        .order_by(Like.created_at.desc())
+        .limit(SEED_LIKES)
+        .subquery()
+    )
+    return dict(
+        db.query(Like.user_id, func.count())
+        .join(seeds, Like.post_id == seeds.c.post_id)
+        .group_by(Like.user_id)
+        .all()
+    )
+
+
+def compute_recommendations(db: Session, user_id: int) -> None:
+    """Rebuild the stored candidate list for one user (caller commits)."""
+    fof = _friends_of_friends(db, user_id)
+    colike = _co_likers(db, user_id)
+
+    already_following = {
+        row.following_id
+        for row in db.query(Follow.following_id).filter(Follow.follower_id == user_id).all()
+    }
+    excluded = already_following | {user_id}
+
+    scored = []
+    for candidate_id in (set(fof) | set(colike)) - excluded:
+        f, c = fof.get(candidate_id, 0), colike.get(candidate_id, 0)
+        reason = "fof" if FOF_WEIGHT * f >= COLIKE_WEIGHT * c else "colike"
+        scored.append((FOF_WEIGHT * f + COLIKE_WEIGHT * c, candidate_id, reason))
+    scored.sort(reverse=True)
+    scored = scored[:MAX_RECOMMENDATIONS]
+
+    # Too few (new account, empty graph): store random users as well, so the read
+    # path finds a full list instead of sampling and re-queueing on every request
+    if len(scored) < RECOMMENDATIONS_SHOWN:
+        exclude = {candidate_id for _, candidate_id, _ in scored}
+        scored += [(0.0, u.id, "random") for u in random_users(db, user_id, RECOMMENDATIONS_SHOWN - len(scored), exclude)]
+
+    db.query(UserRecommendation).filter(UserRecommendation.user_id == user_id).delete(
+        synchronize_session=False
+    )
+    db.add_all(
+        UserRecommendation(user_id=user_id, candidate_id=candidate_id, score=score, reason=reason)
+        for score, candidate_id, reason in scored
+    )
+
+
+_recent_refreshes = TTLCache(max_entries=100_000)
+
+
+def refresh_recommendations(user_id: int) -> None:
+    """
+    Background-task wrapper around compute_recommendations() with its own session.
+    Skipped if this user's list was recomputed within REFRESH_COOLDOWN_SECONDS.
+    """
+    key = str(user_id)
+    if _recent_refreshes.get(key):
+        return
+    _recent_refreshes.put(key, True, time.time() + REFRESH_COOLDOWN_SECONDS)
+    db = SessionLocal()
+    try:
+        compute_recommendations(db, user_id)
+        db.commit()
+    finally:
+        db.close()
+
+
+def add_followed_candidates(db: Session, user_id: int, followed_id: int) -> None:
+    """
+    Incremental update after user_id follows followed_id (caller commits): the accounts
+    followed_id follows each gain one friends-of-friends vote, instead of recomputing
+    the whole list. Co-liker scores are left as they are.
+    """
+    already_following = db.query(Follow.following_id).filter(Follow.follower_id == user_id)
+    candidate_ids = [
+        row.following_id
+        for row in db.query(Follow.following_id)
+        .filter(
+            Follow.follower_id == followed_id,
+            Follow.following_id != user_id,
+            Follow.following_id.notin_(already_following),
+        )
+        .order_by(Follow.created_at.desc())
+        .limit(SEED_FOLLOWS)
+    ]
+    if not candidate_ids:
+        return
+
+    stored = {
+        r.candidate_id: r
+        for r in db.query(UserRecommendation).filter(
+            UserRecommendation.user_id == user_id, UserRecommendation.candidate_id.in_(candidate_ids)
+        )
+    }
+    for candidate_id in candidate_ids:
+        row = stored.get(candidate_id)
+        if row is None:
+            db.add(UserRecommendation(user_id=user_id, candidate_id=candidate_id, score=FOF_WEIGHT, reason="fof"))
+        else:
+            row.score += FOF_WEIGHT
+            if row.reason == "random":
+                row.reason = "fof"
+    db.flush()
+
+    # Keep the best MAX_RECOMMENDATIONS
+    overflow = [
+        row.candidate_id
+        for row in db.query(UserRecommendation.candidate_id)
+        .filter(UserRecommendation.user_id == user_id)
+        .order_by(UserRecommendation.score.desc(), UserRecommendation.candidate_id)
+        .offset(MAX_RECOMMENDATIONS)
+    ]
+    if overflow:
+        db.query(UserRecommendation).filter(
+            UserRecommendation.user_id == user_id, UserRecommendation.candidate_id.in_(overflow)
+        ).delete(synchronize_session=False)
+
+
+def refresh_after_follow(user_id: int, followed_id: int) -> None:
+    """Background-task wrapper around add_followed_candidates() with its own session."""
+    db = SessionLocal()
+    try:
+        add_followed_candidates(db, user_id, followed_id)
+        db.commit()
+    finally:
+        db.close()
+
+
+def drop_recommendation(db: Session, user_id: int, candidate_id: int) -> None:
+    """Remove one candidate, e.g. right after the user follows them (caller commits)."""
+    db.query(UserRecommendation).filter(
+        UserRecommendation.user_id == user_id, UserRecommendation.candidate_id == candidate_id
+    ).delete(synchronize_session=False)
+
+
+def random_users(db: Session, user_id: int, count: int, exclude: set[int]) -> list[User]:
+    """
+    Sample users the viewer does not follow by probing random primary-key ranges,
+    so no full-table sort is needed.
+    """
+    max_id = db.query(func.max(User.id)).scalar() or 0
+    if not max_id:
+        return []
+
+    not_followed = ~(
+        db.query(Follow.id)
+        .filter(and_(Follow.follower_id == user_id, Follow.following_id == User.id))
+        .exists()
+    )
+
+    picked: dict[int, User] = {}
+    for _ in range(3):
+        start = random.randint(1, max_id)
+        rows = (
+            db.query(User)
+            .filter(User.id >= start, User.id != user_id, not_followed)
+            .order_by(User.id)
+            .limit(count)
+            .all()
+        )
+        # Wrap around when the probe lands near the end of the id range
+        if len(rows) < count:
+            rows += (
+                db.query(User)
+                .filter(User.id < start, User.id != user_id, not_followed)
+                .order_by(User.id)
+                .limit(count - len(rows))
+                .all()
+            )
+        for u in rows:
+            if u.id not in exclude:
+                picked.setdefault(u.id, u)
+        if len(picked) >= count:
+            break
+
+    users = list(picked.values())
+    random.shuffle(users)
+    return users[:count]
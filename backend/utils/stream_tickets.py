@@ -0,0 +1,52 @@
+# utils/stream_tickets.py
+import hashlib
+import os
+import secrets
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.model_stream_ticket import StreamTicket
+
+# How long a ticket from POST /notifications/stream-ticket can be redeemed
+STREAM_TICKET_TTL_SECONDS = int(os.getenv("STREAM_TICKET_TTL_SECONDS", "30"))
+
+
+def _ticket_hash(ticket: str) -> str:
+    return hashlib.sha256(ticket.encode()).hexdigest()
+
+
+async def issue_stream_ticket(db: AsyncSession, firebase_uid: str) -> str:
+    """Store a new ticket for this user (and drop expired ones); returns the ticket itself."""
+    # Database clock, like redeem_stream_ticket(), so workers agree on expiry
+    now = await db.scalar(select(func.now()))
+    ticket = secrets.token_urlsafe(32)
+    await db.execute(delete(StreamTicket).where(StreamTicket.expires_at <= now))
+    await db.execute(insert(StreamTicket).values(
+        ticket_hash=_ticket_hash(ticket),
+        firebase_uid=firebase_uid,
+        expires_at=now + timedelta(seconds=STREAM_TICKET_TTL_SECONDS),
+    ))
+    await db.commit()
+    return ticket
+
+
+async def redeem_stream_ticket(db: AsyncSession, ticket: str) -> Optional[str]:
+    """
+    The firebase_uid a ticket was issued to, or None if it is unknown, expired or
+    already used. The ticket is deleted, so only the first of concurrent redeems wins.
+    """
+    now = await db.scalar(select(func.now()))
+    key = _ticket_hash(ticket)
+    firebase_uid = await db.scalar(
+        select(StreamTicket.firebase_uid).where(StreamTicket.ticket_hash == key, StreamTicket.expires_at > now)
+    )
+    if firebase_uid is None:
+        return None
+    result = await db.execute(
+        delete(StreamTicket).where(StreamTicket.ticket_hash == key, StreamTicket.expires_at > now)
+    )
+    await db.commit()
+    return firebase_uid if result.rowcount == 1 else None
@@ -0,0 +1,218 @@
+# utils/timeline.py
+import os
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from db.database import SessionLocal
+from models.model_follow import Follow
+from models.model_home_timeline import HomeTimeline
+from models.model_post import Post
+from models.model_user_stats import UserStats
+from models.model_users import User
+from utils.pagination import apply_cursor, encode_cursor
+
+# Authors with more followers than this are not fanned out on write;
+# their followers pick up their posts at read time instead.
+FANOUT_MAX_FOLLOWERS = int(os.getenv("TIMELINE_FANOUT_MAX_FOLLOWERS", "10000"))
+
+# How many of a user's recent posts are copied into a new follower's timeline
+BACKFILL_LIMIT = int(os.getenv("TIMELINE_BACKFILL_LIMIT", "100"))
+
+_TIMELINE_COLUMNS = ["user_id", "created_at", "post_id", "author_id", "repost_id"]
+
+
+def _insert_ignore():
+    """INSERT into home_timeline that skips entries the user already has."""
+    return (
+        insert(HomeTimeline)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite")
+    )
+
+
+# -------------------------------------------------
+# Write path
+# -------------------------------------------------
+def add_timeline_entry(
+    db: Session,
+    user_id: int,
+    post_id: int,
+    author_id: int,
+    created_at: datetime,
+    repost_id: Optional[int] = None,
+) -> None:
+    """Add a single entry to one user's timeline (caller commits)."""
+    db.execute(
+        _insert_ignore().values(
+            user_id=user_id,
+            created_at=created_at,
+            post_id=post_id,
+            author_id=author_id,
+            repost_id=repost_id,
+        )
+    )
+
+
+def fan_out(post_id: int, author_id: int, created_at: datetime, repost_id: Optional[int] = None) -> None:
+    """
+    Deliver a post (or repost) to every follower of author_id with one INSERT ... SELECT.
+    Runs as a background task with its own session.
+    """
+    db = SessionLocal()
+    try:
+        follower_count = (
+            db.query(UserStats.followers_count).filter(UserStats.user_id == author_id).scalar()
+        )
+        large = (follower_count or 0) > FANOUT_MAX_FOLLOWERS
+        db.query(User).filter(User.id == author_id, User.fanout_on_read != large).update(
+            {User.fanout_on_read: large}, synchronize_session=False
+        )
+
+        if not large:
+            followers = select(
+                Follow.follower_id,
+                literal(created_at, DateTime(timezone=True)),
+                literal(post_id, Integer),
+                literal(author_id, Integer),
+                literal(repost_id, Integer),
+            ).where(Follow.following_id == author_id)
+            db.execute(_insert_ignore().from_select(_TIMELINE_COLUMNS, followers))
+
+        db.commit()
+    finally:
+        db.close()
+
+
+def backfill_follow(follower_id: int, following_id: int) -> None:
+    """
+    Copy the followed user's recent posts into the follower's timeline.
+    Runs as a background task with its own session.
+    """
+    db = SessionLocal()
+    try:
+        followed = db.query(User.fanout_on_read).filter(User.id == following_id).first()
+        if not followed or followed.fanout_on_read:
+            return
+
+        recent = (
+            select(
+                literal(follower_id, Integer),
+                Post.created_at,
+                Post.id,
+                Post.user_id,
+                literal(None, Integer),
+            )
+            .where(Post.user_id == following_id)
+            .order_by(Post.created_at.desc())
+            .limit(BACKFILL_LIMIT)
+        )
+        db.execute(_insert_ignore().from_select(_TIMELINE_COLUMNS, recent))
+        db.commit()
+    finally:
+        db.close()
+
+
+def remove_author_from_timeline(db: Session, user_id: int, author_id: int) -> None:
+    """Drop everything author_id delivered to user_id's timeline (caller commits)."""
+    db.query(HomeTimeline).filter(
+        HomeTimeline.user_id == user_id, HomeTimeline.author_id == author_id
+    ).delete(synchronize_session=False)
+
+
+def remove_post_from_timelines(db: Session, post_id: int) -> None:
+    """Drop a post from every timeline it was delivered to (caller commits)."""
+    db.query(HomeTimeline).filter(HomeTimeline.post_id == post_id).delete(synchronize_session=False)
+
+
+# -------------------------------------------------
+# Read path
+# -------------------------------------------------
+def read_home_timeline(db: Session, user_id: int, cursor: Optional[str], limit: int):
+    """
+    Return (posts, next_cursor) for a user's home feed, newest first.
+
+    Merges three index range scans: the user's materialized timeline, recent
+    public posts, and non-public posts of followed accounts that are served
+    fan-out-on-read. Each source reads at most limit + 1 rows past the cursor.
+    """
+    sources = [
+        apply_cursor(
+            db.query(HomeTimeline.created_at, HomeTimeline.post_id).filter(HomeTimeline.user_id == user_id),
+            HomeTimeline.created_at,
+            HomeTimeline.post_id,
+            cursor,
+        ),
+        apply_cursor(
+            db.query(Post.created_at, Post.id.label("post_id")).filter(Post.visibility == "public"),
+            Post.created_at,
+            Post.id,
+            cursor,
+        ),
+    ]
+
+    large_followed = [
+        row.following_id
+        for row in db.query(Follow.following_id)
+        .join(User, User.id == Follow.following_id)
+        .filter(Follow.follower_id == user_id, User.fanout_on_read == True)
+        .all()
+    ]
+    if large_followed:
+        sources.append(
+            apply_cursor(
+                db.query(Post.created_at, Post.id.label("post_id")).filter(
+                    Post.user_id.in_(large_followed), Post.visibility != "public"
+                ),
+                Post.created_at,
+                Post.id,
+                cursor,
+            )
+        )
+
+    candidates = set()
+    horizon = None  # past the oldest row of a source that had more, rows may be missing
+    for source in sources:
+        rows = [(row.created_at, row.post_id) for row in source.limit(limit + 1).all()]
+        candidates.update(rows)
+        if len(rows) > limit:
+            horizon = max(horizon, rows[-1]) if horizon else rows[-1]
+
+    posts_by_id = {
+        p.id: p for p in db.query(Post).filter(Post.id.in_({post_id for _, post_id in candidates})).all()
+    } if candidates else {}
+    newest = _newest_appearances(db, user_id, posts_by_id, large_followed)
+
+    # A post can appear more than once: from two sources (public and reposted) or as two
+    # timeline entries (posted, then reposted). It is only shown at its newest appearance,
+    # so it is never repeated, on this page or a later one
+    page, last, has_more = [], None, horizon is not None
+    for created_at, post_id in sorted(candidates, reverse=True):
+        if len(page) == limit or (horizon and (created_at, post_id) < horizon):
+            has_more = True
+            break
+        if newest.get(post_id) == created_at:
+            page.append((created_at, post_id))
+        last = (created_at, post_id)  # the next page starts after it, even if it was skipped
+    posts = [posts_by_id[post_id] for _, post_id in page]
+
+    next_cursor = encode_cursor(*last) if last and has_more else None
+    return posts, next_cursor
+
+
+def _newest_appearances(db: Session, user_id: int, posts_by_id: dict, large_followed: list[int]) -> dict:
+    """post_id -> created_at of the newest position the post has in user_id's feed."""
+    newest = dict(
+        db.query(HomeTimeline.post_id, func.max(HomeTimeline.created_at))
+        .filter(HomeTimeline.user_id == user_id, HomeTimeline.post_id.in_(posts_by_id))
+        .group_by(HomeTimeline.post_id)
+        .all()
+    ) if posts_by_id else {}
+    for post in posts_by_id.values():
+        # The same conditions as the public and fan-out-on-read sources
+        direct = post.visibility == "public" or post.user_id in large_followed
+        if direct and (post.id not in newest or post.created_at > newest[post.id]):
+            newest[post.id] = post.created_at
+    return newest
@@ -0,0 +1,91 @@
+# utils/trending.py
+import os
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models.model_comment import Comment
+from models.model_like import Like
+from models.model_post import Post
+from models.model_repost import Repost
+from models.model_trending_snapshot import TrendingSnapshot
+
+WINDOWS = {
+    "1h": timedelta(hours=1),
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+}
+DEFAULT_WINDOW = "24h"
+
+# How many posts are stored per window
+TRENDING_TOP_N = int(os.getenv("TRENDING_TOP_N", "100"))
+
+# Engagement weights and age decay: score = weighted / (age_hours + 2) ** GRAVITY
+LIKE_WEIGHT = 1.0
+COMMENT_WEIGHT = 2.0
+REPOST_WEIGHT = 3.0
+GRAVITY = float(os.getenv("TRENDING_GRAVITY", "1.5"))
+
+
+def _counts_since(db: Session, post_col, created_col, since: datetime) -> dict[int, int]:
+    return dict(
+        db.query(post_col, func.count())
+        .filter(created_col >= since, post_col.isnot(None))
+        .group_by(post_col)
+        .all()
+    )
+
+
+def compute_window(db: Session, window: str, now: datetime) -> list[TrendingSnapshot]:
+    """Score every post with engagement inside the window and return the top N as snapshot rows."""
+    since = now - WINDOWS[window]
+    likes = _counts_since(db, Like.post_id, Like.created_at, since)
+    comments = _counts_since(db, Comment.post_id, Comment.created_at, since)
+    reposts = _counts_since(db, Repost.original_post_id, Repost.created_at, since)
+
+    post_ids = set(likes) | set(comments) | set(reposts)
+    if not post_ids:
+        return []
+
+    # Trending is public, so only public posts are ranked
+    created = dict(
+        db.query(Post.id, Post.created_at)
+        .filter(Post.id.in_(post_ids), Post.visibility == "public")
+        .all()
+    )
+
+    scored = []
+    for post_id, created_at in created.items():
+        age_hours = max((now - created_at.replace(tzinfo=None)).total_seconds() / 3600, 0)
+        weighted = (
+            LIKE_WEIGHT * likes.get(post_id, 0)
+            + COMMENT_WEIGHT * comments.get(post_id, 0)
+            + REPOST_WEIGHT * reposts.get(post_id, 0)
+        )
+        scored.append((weighted / (age_hours + 2) ** GRAVITY, post_id))
+    scored.sort(reverse=True)
+
+    return [
+        TrendingSnapshot(
+            window=window,
+            rank=rank,
+            post_id=post_id,
+            score=score,
+            likes=likes.get(post_id, 0),
+            comments=comments.get(post_id, 0),
+            reposts=reposts.get(post_id, 0),
+            generated_at=now,
+        )
+        for rank, (score, post_id) in enumerate(scored[:TRENDING_TOP_N], start=1)
+    ]
+
+
+def refresh_trending(db: Session) -> None:
+    """Recompute every window, then swap all the snapshots in a single transaction."""
+    # Use the database clock so "now" matches the server-side created_at defaults
+    now = db.query(func.now()).scalar().replace(tzinfo=None)
+    rows = {window: compute_window(db, window, now) for window in WINDOWS}
+    db.query(TrendingSnapshot).filter(TrendingSnapshot.window.in_(rows)).delete(synchronize_session=False)
+    db.add_all(row for window_rows in rows.values() for row in window_rows)
+    db.commit()
@@ -0,0 +1,119 @@
+# utils/user_stats.py
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+
+from models.model_follow import Follow
+from models.model_like import Like
+from models.model_post import Post
+from models.model_repost import Repost
+from models.model_user_stats import UserStats
+from models.model_users import User
+
+
+def adjust_user_stat(db: Session, user_id: int, field: str, delta: int = 1) -> None:
+    """
+    Atomically add `delta` to one of a user's stats in the caller's transaction.
+    Creates the user's stats row on first use.
+    """
+    column = getattr(UserStats, field)
+    updated = db.query(UserStats).filter(UserStats.user_id == user_id).update(
+        {column: column + delta}, synchronize_session=False
+    )
+    if not updated:
+        db.execute(
+            insert(UserStats)
+            .prefix_with("IGNORE", dialect="mysql")
+            .prefix_with("OR IGNORE", dialect="sqlite")
+            .values(user_id=user_id)
+        )
+        db.query(UserStats).filter(UserStats.user_id == user_id).update(
+            {column: column + delta}, synchronize_session=False
+        )
+
+
+def release_post_stats(db: Session, post: Post) -> None:
+    """
+    Undo a post's contribution to user stats before it is deleted: the author's
+    post count and likes, and the likes its reposts earned for their reposters.
+    """
+    adjust_user_stat(db, post.user_id, "posts_count", -1)
+    if post.likes_count:
+        adjust_user_stat(db, post.user_id, "likes_received", -post.likes_count)
+
+    repost_likes = (
+        db.query(Repost.user_id, func.sum(Repost.likes_count))
+        .filter(Repost.original_post_id == post.id)
+        .group_by(Repost.user_id)
+        .all()
+    )
+    for reposter_id, likes in repost_likes:
+        if likes:
+            adjust_user_stat(db, reposter_id, "likes_received", -int(likes))
+
+
+def compute_user_stats(db: Session, user_ids: list[int]) -> dict[int, dict]:
+    """Recount stats for a batch of users straight from the source tables."""
+    def grouped(query):
+        return dict(query.all())
+
+    posts = grouped(
+        db.query(Post.user_id, func.count(Post.id)).filter(Post.user_id.in_(user_ids)).group_by(Post.user_id)
+    )
+    followers = grouped(
+        db.query(Follow.following_id, func.count(Follow.id))
+        .filter(Follow.following_id.in_(user_ids)).group_by(Follow.following_id)
+    )
+    following = grouped(
+        db.query(Follow.follower_id, func.count(Follow.id))
+        .filter(Follow.follower_id.in_(user_ids)).group_by(Follow.follower_id)
+    )
+    post_likes = grouped(
+        db.query(Post.user_id, func.count(Like.id))
+        .join(Like, Like.post_id == Post.id)
+        .filter(Post.user_id.in_(user_ids)).group_by(Post.user_id)
+    )
+    repost_likes = grouped(
+        db.query(Repost.user_id, func.count(Like.id))
+        .join(Like, Like.repost_id == Repost.id)
+        .filter(Repost.user_id.in_(user_ids)).group_by(Repost.user_id)
+    )
+
+    return {
+        user_id: {
+            "posts_count": posts.get(user_id, 0),
+            "followers_count": followers.get(user_id, 0),
+            "following_count": following.get(user_id, 0),
+            "likes_received": post_likes.get(user_id, 0) + repost_likes.get(user_id, 0),
+        }
+        for user_id in user_ids
+    }
+
+
+def rebuild_user_stats(db: Session, chunk_size: int = 500) -> int:
+    """Recompute user_stats for every user in primary-key chunks. Returns users processed."""
+    last_id, done = 0, 0
+    while True:
+        user_ids = [
+            row.id
+            for row in db.query(User.id).filter(User.id > last_id).order_by(User.id).limit(chunk_size).all()
+        ]
+        if not user_ids:
+            break
+
+        stats = compute_user_stats(db, user_ids)
+        existing = {
+            row.user_id
+            for row in db.query(UserStats.user_id).filter(UserStats.user_id.in_(user_ids)).all()
+        }
+        for user_id, values in stats.items():
+            if user_id in existing:
+                db.query(UserStats).filter(UserStats.user_id == user_id).update(
+                    values, synchronize_session=False
+                )
+            else:
+                db.add(UserStats(user_id=user_id, **values))
+        db.commit()
+
+        last_id = user_ids[-1]
+        done += len(user_ids)
+    return done
@@ -0,0 +1,113 @@
+# utils/viewer_state.py
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from models.model_comment import Comment
+from models.model_comment_like import CommentLike
+from models.model_follow import Follow
+from models.model_like import Like
+from models.model_post import Post
+from models.model_repost import Repost
+
+
+def build_viewer_state(
+    db: Session,
+    viewer_id: int,
+    post_ids: list[int],
+    repost_ids: list[int],
+    comment_ids: list[int],
+) -> dict:
+    """
+    Like/repost/follow flags and counts for a batch of posts, reposts and comments.
+
+    One IN query per table touched (at most seven), whatever the number of ids.
+    Counts come from the counter columns. Returns a dict shaped like ViewerStateResponse.
+    """
+    post_ids, repost_ids, comment_ids = set(post_ids), set(repost_ids), set(comment_ids)
+
+    posts = (
+        db.query(Post.id, Post.user_id, Post.likes_count, Post.comments_count, Post.reposts_count)
+        .filter(Post.id.in_(post_ids))
+        .all()
+        if post_ids else []
+    )
+    reposts = (
+        db.query(Repost.id, Repost.user_id, Repost.likes_count, Repost.comments_count)
+        .filter(Repost.id.in_(repost_ids))
+        .all()
+        if repost_ids else []
+    )
+    comments = (
+        db.query(Comment.id, Comment.user_id, Comment.likes_count)
+        .filter(Comment.id.in_(comment_ids))
+        .all()
+        if comment_ids else []
+    )
+
+    # Viewer's likes on the posts and reposts (both live in `likes`)
+    liked_posts, liked_reposts = set(), set()
+    if post_ids or repost_ids:
+        for post_id, repost_id in db.query(Like.post_id, Like.repost_id).filter(
+            Like.user_id == viewer_id,
+            or_(Like.post_id.in_(post_ids), Like.repost_id.in_(repost_ids)),
+        ):
+            if post_id is not None:
+                liked_posts.add(post_id)
+            if repost_id is not None:
+                liked_reposts.add(repost_id)
+
+    liked_comments = {
+        row.comment_id
+        for row in db.query(CommentLike.comment_id).filter(
+            CommentLike.user_id == viewer_id, CommentLike.comment_id.in_(comment_ids)
+        )
+    } if comment_ids else set()
+
+    # Plain reposts only; quoting a post doesn't count as having reposted it
+    reposted = {
+        row.original_post_id
+        for row in db.query(Repost.original_post_id).filter(
+            Repost.user_id == viewer_id,
+            Repost.is_quote == False,
+            Repost.original_post_id.in_(post_ids),
+        )
+    } if post_ids else set()
+
+    author_ids = {row.user_id for row in [*posts, *reposts, *comments]}
+    following = {
+        row.following_id
+        for row in db.query(Follow.following_id).filter(
+            Follow.follower_id == viewer_id, Follow.following_id.in_(author_ids)
+        )
+    } if author_ids else set()
+
+    return {
+        "posts": {
+            p.id: {
+                "liked": p.id in liked_posts,
+                "reposted": p.id in reposted,
+                "following_author": p.user_id in following,
+                "likes_count": p.likes_count,
+                "comments_count": p.comments_count,
+                "reposts_count": p.reposts_count,
+            }
+            for p in posts
+        },
+        "reposts": {
+            r.id: {
+                "liked": r.id in liked_reposts,
+                "following_author": r.user_id in following,
+                "likes_count": r.likes_count,
+                "comments_count": r.comments_count,
+            }
+            for r in reposts
+        },
+        "comments": {
+            c.id: {
+                "liked": c.id in liked_comments,
+                "following_author": c.user_id in following,
+                "likes_count": c.likes_count,
+            }
+            for c in comments
+        },
+    }